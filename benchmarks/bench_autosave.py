@@ -0,0 +1,65 @@
+"""UI-thread cost per edit: flush-per-change vs. debounced background autosave.
+
+Simulates a user making edits in bursts and times only what the calling
+(UI) thread spends per edit, plus how many disk writes each approach made.
+
+Usage: python -m benchmarks.bench_autosave [edits]   (default 2000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from dailyflow.autosave import AutoSaver
+from dailyflow.journal import JournalStorage
+from dailyflow.sqlite_store import SqliteStorage
+
+from .common import make_tasks
+
+
+def edit_loop(storage, tasks, after_edit, burst=100, pause=0.08):
+    """Add ``tasks`` one by one; return per-edit caller-side times in seconds."""
+    times = []
+    for i, t in enumerate(tasks):
+        t0 = time.perf_counter()
+        storage.tasks.add(t)
+        storage.add(t)
+        after_edit()
+        times.append(time.perf_counter() - t0)
+        if i % burst == burst - 1:
+            time.sleep(pause)  # the user pauses between bursts
+    return times
+
+
+def summary(times):
+    times = sorted(times)
+    mean = sum(times) / len(times)
+    p99 = times[int(len(times) * 0.99)]
+    return f"{mean * 1e6:>8.0f}µs {p99 * 1e6:>8.0f}µs"
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 2000
+    print(f"{n} edits          {'mean':>10} {'p99':>10} {'writes':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (
+            ("json", lambda p: JournalStorage(p + ".json", compact_every=10**9)),
+            ("sqlite", lambda p: SqliteStorage(p + ".db")),
+        ):
+            s = make(os.path.join(tmp, name + "-sync"))
+            times = edit_loop(s, make_tasks(n, seed=15), s.flush)
+            s.close()
+            print(f"{name:<6} flush each   {summary(times)} {n:>7}")
+
+            s = make(os.path.join(tmp, name + "-auto"))
+            saver = AutoSaver(s, delay=0.05, max_delay=0.5)
+            times = edit_loop(s, make_tasks(n, seed=15), saver.touch)
+            saver.close()
+            s.close()
+            print(f"{name:<6} autosave     {summary(times)} {saver.writes:>7}")
+
+
+if __name__ == "__main__":
+    main()
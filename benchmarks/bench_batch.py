@@ -0,0 +1,30 @@
+"""Throughput of plan_many: user-days planned per minute.
+
+Usage: python -m benchmarks.bench_batch [users] [tasks_per_user]
+"""
+
+import os
+import sys
+from datetime import time
+
+from dailyflow import plan_many
+
+from .common import make_tasks, timed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    users = int(argv[0]) if argv else 20000
+    per_user = int(argv[1]) if len(argv) > 1 else 20
+    jobs = [make_tasks(per_user, seed=u) for u in range(users)]
+    start, end = time(8, 0), time(22, 0)
+
+    for workers in (1, os.cpu_count() or 1):
+        secs, plans = timed(plan_many, jobs, start, end, workers=workers, repeat=1)
+        assert len(plans) == users
+        rate = users / secs * 60
+        print(f"workers={workers:<3} {users} user-days in {secs:.2f}s -> {rate:,.0f} user-days/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Completing a multi-selection: one task at a time vs. one batch.
+
+For each backend, marks ``k`` of ``n`` planned tasks done the way a click
+per task would (a storage record, a plan update and a save each) and as
+one bulk operation (one record, one re-layout, one save).
+
+Usage: python -m benchmarks.bench_bulk [n] [k]   (default 20k tasks, 500 selected)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, time as clock
+
+from dailyflow import apply_plan
+from dailyflow.incremental import IncrementalPlanner, apply_diff
+from dailyflow.journal import JournalStorage
+from dailyflow.models import TaskStore
+from dailyflow.sqlite_store import SqliteStorage
+
+from .common import make_tasks
+
+
+def setup(make, n):
+    today = date.today()
+    store = TaskStore(make_tasks(n, seed=20, today=today))
+    storage = make()
+    storage.tasks = store
+    storage.put_many(store)
+    storage.compact()
+    planner = IncrementalPlanner(store, clock(8), clock(22), today)
+    apply_plan(store, planner.plan())
+    return store, storage, planner
+
+
+def one_by_one(store, storage, planner, tasks):
+    for t in tasks:
+        t.completed = True
+        t.start_min = t.end_min = None
+        storage.complete(t)
+        moved = apply_diff(store, planner.remove(t.id))
+        if moved:
+            storage.schedule(moved)
+        storage.flush()
+
+
+def batched(store, storage, planner, tasks):
+    for t in tasks:
+        t.completed = True
+        t.start_min = t.end_min = None
+    storage.complete_many(tasks)
+    moved = apply_diff(store, planner.remove_many([t.id for t in tasks]))
+    if moved:
+        storage.schedule(moved)
+    storage.flush()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if len(argv) > 0 else 20_000
+    k = int(argv[1]) if len(argv) > 1 else 500
+    print(f"complete {k} of {n} tasks   {'one by one':>12} {'batch':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (
+            ("json", lambda p: JournalStorage(p + ".json", compact_every=10**9)),
+            ("sqlite", lambda p: SqliteStorage(p + ".db")),
+        ):
+            row = []
+            for mode, fn in (("single", one_by_one), ("batch", batched)):
+                store, storage, planner = setup(lambda: make(os.path.join(tmp, name + mode)), n)
+                # Today's planned tasks plus a spread of the backlog.
+                planned = [store.get(s.task_id) for s in planner.plan().slots]
+                tasks = planned + [t for t in list(store)[:: n // k] if t not in planned]
+                tasks = tasks[:k]
+                t0 = time.perf_counter()
+                fn(store, storage, planner, tasks)
+                row.append(time.perf_counter() - t0)
+                storage.close()
+            print(f"{name:<26} {row[0] * 1000:>10.1f}ms {row[1] * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
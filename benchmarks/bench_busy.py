@@ -0,0 +1,48 @@
+"""Planning around busy blocks: first-fit gap lookup at horizon scale.
+
+Usage: python -m benchmarks.bench_busy [tasks] [blocks] [days]
+       (default 10k tasks, 500 blocks, 28 days)
+"""
+
+import random
+import sys
+from datetime import date, datetime, time
+
+from dailyflow.busy import BusyCalendar
+from dailyflow.horizon import plan_horizon
+from dailyflow.models import to_minutes
+
+from .common import make_tasks, timed
+
+START, END = time(8, 0), time(22, 0)
+
+
+def random_blocks(n, first_day, days, seed=0):
+    rng = random.Random(seed)
+    base = to_minutes(datetime.combine(first_day, START))
+    blocks = []
+    for _ in range(n):
+        s = base + rng.randrange(days) * 1440 + rng.randrange(14 * 60)
+        blocks.append((s, s + rng.choice((15, 30, 45, 60))))
+    return blocks
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 10_000
+    blocks = int(argv[1]) if len(argv) > 1 else 500
+    days = int(argv[2]) if len(argv) > 2 else 28
+    today = date.today()
+    tasks = make_tasks(n, seed=n, today=today)
+
+    t_cal, busy = timed(BusyCalendar, random_blocks(blocks, today, days))
+    t_free, free_plan = timed(plan_horizon, tasks, days, START, END, today)
+    t_busy, busy_plan = timed(plan_horizon, tasks, days, START, END, today, busy=busy)
+    print(f"{n} tasks, {blocks} busy blocks ({len(busy)} after merging), {days} days")
+    print(f"build calendar     {t_cal * 1000:8.1f}ms")
+    print(f"plan, no busy      {t_free * 1000:8.1f}ms  {len(free_plan.slots)} slots")
+    print(f"plan, with busy    {t_busy * 1000:8.1f}ms  {len(busy_plan.slots)} slots")
+
+
+if __name__ == "__main__":
+    main()
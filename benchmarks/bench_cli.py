@@ -0,0 +1,87 @@
+"""Cold-start cost of the CLI, with an ``-X importtime`` breakdown.
+
+Runs each command in a fresh interpreter (best of several runs), against a
+bare ``python -c pass`` baseline, then lists the slowest imports of
+``dailyflow list`` and checks that no GUI module was imported.
+
+Usage: python -m benchmarks.bench_cli [n]   (tasks in the data file, default 1000)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from dailyflow.journal import JournalStorage
+
+from .common import make_tasks
+
+GUI_MODULES = ("tkinter", "_tkinter", "customtkinter")
+
+
+def run(args, env, repeat=7):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def import_times(args, env):
+    """(self_us, cumulative_us, module) per import, from ``-X importtime``."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    ).stderr
+    rows = []
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        if self_us.strip().isdigit():
+            rows.append((int(self_us), int(cumulative), name.strip()))
+    return rows
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1000
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, "data.json")
+        js = JournalStorage(data)
+        for t in make_tasks(n, seed=14):
+            js.tasks.add(t)
+        js.compact()
+        js.close()
+        env = dict(os.environ, PYTHONPATH=root, DAILYFLOW_DATA=data)
+
+        py = [sys.executable]
+        commands = [
+            ("python -c pass", py + ["-c", "pass"]),
+            ("import dailyflow", py + ["-c", "import dailyflow"]),
+            ("dailyflow --help", py + ["-m", "dailyflow", "--help"]),
+            ("dailyflow list", py + ["-m", "dailyflow", "list"]),
+            ("dailyflow plan", py + ["-m", "dailyflow", "plan"]),
+        ]
+        print(f"{n} tasks in the data file; wall time, best of 7")
+        for name, args in commands:
+            print(f"  {name:<18} {run(args, env) * 1000:>6.1f}ms")
+
+        rows = import_times(["-m", "dailyflow", "list"], env)
+        print("slowest imports of `dailyflow list` (cumulative):")
+        for _self_us, cumulative, name in sorted(rows, key=lambda r: -r[1])[:10]:
+            print(f"  {cumulative / 1000:>6.1f}ms  {name}")
+        gui = sorted({name for _, _, name in rows if name.split(".")[0] in GUI_MODULES})
+        print("GUI modules imported:", ", ".join(gui) if gui else "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Dependency-aware ordering: cost against the number of tasks and links.
+
+Builds backlogs of ``n`` tasks with ``edges_per_task`` random prerequisite
+links each (always to lower ids, so the graph is a DAG) and times
+``order_pending`` next to plain ``rank_pending``, full ``plan_day`` and
+``plan_horizon`` runs with the links, and cycle detection after one link
+is turned around. The last column is the ordering's cost per task plus
+link: it staying flat as the sizes grow is the linear-time check.
+
+Usage: python -m benchmarks.bench_dependencies [n] [edges_per_task]
+    (default 100k tasks, 5 links each = 500k links; also runs n/10 and n/4)
+"""
+
+import random
+import sys
+from datetime import date, time as clock
+
+from dailyflow import plan_day
+from dailyflow.dependencies import CycleError, order_pending
+from dailyflow.horizon import plan_horizon
+from dailyflow.planner import rank_pending
+
+from .common import make_tasks, timed
+
+
+def make_links(n, per_task, seed=23):
+    rng = random.Random(seed)
+    links = {}
+    for i in range(2, n + 1):
+        k = min(i - 1, per_task)
+        # Mostly recent tasks, so chains get long.
+        links[i] = tuple({max(1, i - 1 - int(rng.expovariate(1 / 50))) for _ in range(k)})
+    return links
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if len(argv) > 0 else 100_000
+    per_task = int(argv[1]) if len(argv) > 1 else 5
+    today = date.today()
+    print(
+        f"{'tasks':>8} {'links':>8} {'rank':>9} {'order':>9} {'plan_day':>9} "
+        f"{'horizon':>9} {'cycle':>9} {'ns/(V+E)':>9}"
+    )
+    for size in (n // 10, n // 4, n):
+        tasks = make_tasks(size, seed=23, today=today)
+        links = make_links(size, per_task)
+        edges = sum(map(len, links.values()))
+
+        rank, _ = timed(rank_pending, tasks, today)
+        order, ordered = timed(order_pending, tasks, today, links)
+        day, _ = timed(plan_day, tasks, clock(8), clock(22), dependencies=links, repeat=1)
+        horizon, _ = timed(
+            plan_horizon, tasks, 14, clock(8), clock(22), dependencies=links, repeat=1
+        )
+        position = {t.id: i for i, t in enumerate(ordered.tasks)}
+        assert all(position[p] < position[i] for i, ps in links.items() for p in ps)
+
+        # Close a loop deep in the graph: the last task before the first.
+        cyclic = dict(links)
+        cyclic[1] = (size,)
+
+        def detect():
+            try:
+                order_pending(tasks, today, cyclic)
+            except CycleError as e:
+                return e.chain
+
+        cycle, chain = timed(detect, repeat=1)
+        assert chain and chain[0] == chain[-1]
+        print(
+            f"{size:>8} {edges:>8} {rank * 1000:>7.0f}ms {order * 1000:>7.0f}ms "
+            f"{day * 1000:>7.0f}ms {horizon * 1000:>7.0f}ms {cycle * 1000:>7.0f}ms "
+            f"{(order - rank) / (size + edges) * 1e9:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
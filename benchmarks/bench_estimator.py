@@ -0,0 +1,88 @@
+"""Learned durations: how much do plans overrun with and without them?
+
+Simulates ``days`` days of a user whose real durations are off from their
+estimates by a fixed factor per category and per kind of task (the first
+word of the title), plus noise. Each day the backlog is planned into an
+8-hour window, the planned tasks are "worked" in order with their real
+durations and completed, and each completion updates the estimator. Prints
+the average overrun past the window's end per week, planned with the
+user's estimates and with the learned ones, and the estimator's update
+cost and size.
+
+Usage: python -m benchmarks.bench_estimator [days]   (default 60)
+"""
+
+import random
+import sys
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+from dailyflow import TaskStore, plan_day
+from dailyflow.estimator import DurationEstimator
+from dailyflow.history import Completion
+from dailyflow.models import to_minutes
+
+from .common import CATEGORIES, PRIORITIES
+
+KINDS = {"write": 1.6, "review": 1.2, "call": 0.8, "read": 1.0, "fix": 2.0, "plan": 0.7}
+CATEGORY_BIAS = {"Work": 1.2, "Study": 1.1, "Personal": 0.9, "Health": 1.0, "General": 1.0}
+WINDOW = (clock(9), clock(17))
+
+
+def simulate(days, learn, seed=25):
+    rng = random.Random(seed)
+    estimator = DurationEstimator()
+    tasks = TaskStore()
+    overruns = []
+    updates = 0.0
+    first = date.today() - timedelta(days=days)
+    for d in range(days):
+        day = first + timedelta(days=d)
+        for _ in range(8):  # new work keeps arriving
+            kind = rng.choice(list(KINDS))
+            tasks.create(
+                f"{kind.title()} {rng.randrange(1000)}",
+                rng.choice(CATEGORIES),
+                None,
+                rng.choice((15, 30, 45, 60, 90)),
+                rng.choice(PRIORITIES),
+            )
+        plan = plan_day(tasks, *WINDOW, day=day, estimator=estimator if learn else None)
+        cursor = to_minutes(plan.slots[0].start) if plan.slots else 0
+        window_end = to_minutes(datetime.combine(day, WINDOW[1]))
+        for slot in plan.slots:
+            t = tasks.get(slot.task_id)
+            kind = t.title.split()[0].lower()
+            real = t.duration_minutes * KINDS[kind] * CATEGORY_BIAS[t.category]
+            real = max(5, int(real * rng.uniform(0.85, 1.15)))
+            start, cursor = cursor, cursor + real
+            c = Completion(
+                t.id, t.title, t.category, t.priority, None, None, start, cursor, t.duration_minutes
+            )
+            t0 = time.perf_counter()
+            estimator.add(c)
+            updates += time.perf_counter() - t0
+            tasks.remove(t.id)
+            cursor += 5
+        overruns.append(max(0, cursor - window_end))
+    return overruns, estimator, updates
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    days = int(argv[0]) if argv else 60
+    plain, _, _ = simulate(days, learn=False)
+    learned, estimator, updates = simulate(days, learn=True)
+    print(f"{'week':<6} {'overrun (estimates)':>20} {'overrun (learned)':>18}")
+    for w in range(0, days, 7):
+        a = plain[w : w + 7]
+        b = learned[w : w + 7]
+        print(f"{w // 7 + 1:<6} {sum(a) / len(a):>17.0f}min {sum(b) / len(b):>15.0f}min")
+    print(
+        f"{estimator.observations} updates, {updates / max(1, estimator.observations) * 1e6:.1f}µs "
+        f"each; {len(estimator)} keys kept"
+    )
+
+
+if __name__ == "__main__":
+    main()
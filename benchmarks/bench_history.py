@@ -0,0 +1,104 @@
+"""Completion analytics: rollups vs. rescanning the log.
+
+Writes ``n`` completions spread over the past year to a temporary
+completion log, then times recording them, loading with and without the
+rollup snapshot, and dashboard queries (a year's total, a week-by-week
+series, the full Analytics report) against a scan of every event doing
+the same sums.
+
+Usage: python -m benchmarks.bench_history [n]   (default 200k)
+"""
+
+import os
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+
+from dailyflow.history import Bucket, Completion, CompletionLog, day_of, now_minutes, report
+
+from .common import CATEGORIES, PRIORITIES, timed
+
+
+def make_completions(n, seed=24):
+    rng = random.Random(seed)
+    now = now_minutes()
+    out = []
+    for i in range(n):
+        end = now - rng.randrange(365 * 24 * 60)
+        planned = end - rng.randint(-60, 180) if rng.random() < 0.7 else None
+        started = end - rng.randint(10, 150) if rng.random() < 0.4 else None
+        out.append(
+            Completion(
+                i + 1,
+                f"Task {i + 1}",
+                rng.choice(CATEGORIES),
+                rng.choice(PRIORITIES),
+                planned,
+                None if planned is None else planned + 60,
+                started,
+                end,
+            )
+        )
+    out.sort(key=lambda c: c.actual_end)
+    return out
+
+
+def scan_total(log, first, last):
+    """A year's total the slow way: read and filter every event."""
+    lo, hi = first.toordinal(), last.toordinal()
+    out = Bucket()
+    for c in log:
+        if lo <= day_of(c.actual_end) <= hi:
+            out.add(c)
+    return out
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    today = date.today()
+    year_ago = today - timedelta(days=364)
+    completions = make_completions(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.json.history")
+        log = CompletionLog(path)
+        log.load()
+
+        def record():
+            for i in range(0, n, 100):  # a burst of completions per save
+                log.record(completions[i : i + 100])
+                log.flush()
+
+        secs, _ = timed(record, repeat=1)
+        log.snapshot()
+        print(f"{n} completions over a year ({os.path.getsize(path) / 1e6:.1f}MB log)")
+        print(f"record + flush          {secs / n * 1e6:>9.1f}µs per completion")
+
+        def load():
+            fresh = CompletionLog(path)
+            fresh.load()
+            return fresh
+
+        secs, loaded = timed(load)
+        print(f"load (snapshot)         {secs * 1000:>9.1f}ms")
+        os.rename(log.rollup_path, log.rollup_path + ".off")
+        secs, rebuilt = timed(load, repeat=1)
+        os.rename(log.rollup_path + ".off", log.rollup_path)
+        print(f"load (rebuild from log) {secs * 1000:>9.1f}ms")
+        assert rebuilt.rollups.to_dict() == loaded.rollups.to_dict()
+
+        rollups = loaded.rollups
+        fast, total = timed(rollups.total, year_ago, today)
+        slow, expected = timed(scan_total, loaded, year_ago, today, repeat=1)
+        assert total.to_list() == expected.to_list()
+        print(f"year total (rollups)    {fast * 1000:>9.2f}ms   scan: {slow * 1000:.0f}ms")
+        secs, _ = timed(rollups.weekly, year_ago, today)
+        print(f"52-week series          {secs * 1000:>9.2f}ms")
+        secs, _ = timed(report, rollups, today, 52)
+        print(f"Analytics report        {secs * 1000:>9.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Horizon planning: one pass over the backlog vs. re-planning day by day.
+
+Usage: python -m benchmarks.bench_horizon [tasks] [days]   (default 10k, 90)
+"""
+
+import sys
+from datetime import date, time, timedelta
+
+from dailyflow import plan_day
+from dailyflow.horizon import plan_horizon
+
+from .common import make_tasks, timed
+
+START, END = time(8, 0), time(22, 0)
+
+
+def day_by_day(tasks, days, first_day):
+    """The naive alternative: plan_day per day on whatever is still left."""
+    left = list(tasks)
+    for i in range(days):
+        plan = plan_day(left, START, END, first_day + timedelta(days=i))
+        done = {s.task_id for s in plan.slots}
+        left = [t for t in left if t.id not in done]
+    return left
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 10_000
+    days = int(argv[1]) if len(argv) > 1 else 90
+    today = date.today()
+    tasks = make_tasks(n, seed=n, today=today)
+
+    t_once, plan = timed(plan_horizon, tasks, days, START, END, today)
+    t_naive, _ = timed(day_by_day, tasks, days, today, repeat=1)
+    print(f"{n} tasks over {days} days: {len(plan.slots)} slots, "
+          f"{len(plan.unscheduled)} unscheduled")
+    print(f"plan_horizon  {t_once * 1000:8.1f}ms")
+    print(f"day-by-day    {t_naive * 1000:8.1f}ms  (ignores due dates)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Single-task changes: full plan_day re-plan vs. IncrementalPlanner.
+
+"incremental" mixes adds and deletes anywhere in the queue; "front" adds
+and removes a task that outranks everything, the worst case for the
+sorted queue: each insert/delete shifts the whole list (a memmove of n
+pointers) and every scheduled slot moves.
+
+Usage: python -m benchmarks.bench_incremental [n ...]   (default 1k 10k 100k)
+"""
+
+import sys
+import time
+from datetime import date, time as clock, timedelta
+
+from dailyflow import plan_day
+from dailyflow.incremental import IncrementalPlanner
+from dailyflow.models import TaskStore
+
+from .common import make_tasks
+
+START, END = clock(8, 0), clock(22, 0)
+OPS = 200
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [1_000, 10_000, 100_000]
+    today = date.today()
+    print(f"{'tasks':>8} {'full re-plan':>13} {'incremental':>12} {'moved/op':>9} {'front':>9}")
+    for n in sizes:
+        store = TaskStore(make_tasks(n, seed=n, today=today))
+        planner = IncrementalPlanner(store, START, END, today)
+
+        t0 = time.perf_counter()
+        for _ in range(5):
+            plan_day(store, START, END, today)
+        full = (time.perf_counter() - t0) / 5
+
+        moved = 0
+        t0 = time.perf_counter()
+        for i in range(OPS):
+            if i % 2:
+                task = store.create(f"New {i}", "Work", None, 30, "Low")
+                diff = planner.add(task)
+            else:
+                task_id = next(iter(store)).id
+                store.remove(task_id)
+                diff = planner.remove(task_id)
+            moved += len(diff.added) + len(diff.moved) + len(diff.removed)
+        incr = (time.perf_counter() - t0) / OPS
+
+        overdue = (today - timedelta(days=7)).isoformat()
+        t0 = time.perf_counter()
+        for i in range(OPS // 2):
+            task = store.create(f"Urgent {i}", "Work", overdue, 15, "Critical")
+            planner.add(task)
+            store.remove(task.id)
+            planner.remove(task.id)
+        front = (time.perf_counter() - t0) / OPS
+
+        print(
+            f"{n:>8} {full * 1000:>11.2f}ms {incr * 1000:>10.3f}ms {moved / OPS:>9.1f}"
+            f" {front * 1000:>7.3f}ms"
+        )
+    print("ops alternate: add a low-priority task / delete the oldest task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time to the first batch of tasks vs. a full load, per backend.
+
+The GUI can draw the task list as soon as the first batch arrives from the
+background loader; this shows how long that takes compared with waiting
+for the whole file.
+
+Usage: python -m benchmarks.bench_load [n]   (default 200k)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from dailyflow.journal import JournalStorage
+from dailyflow.sqlite_store import SqliteStorage
+
+from .common import make_tasks
+
+
+def first_and_full(storage):
+    t0 = time.perf_counter()
+    first = None
+    for _ in storage.load_batches():
+        if first is None:
+            first = time.perf_counter() - t0
+    full = time.perf_counter() - t0
+    storage.close()
+    return first, full
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 200_000
+    tasks = make_tasks(n, seed=13)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "data.json")
+        db_path = os.path.join(tmp, "tasks.db")
+        js = JournalStorage(json_path)
+        for t in tasks:
+            js.tasks.add(t)
+        js.compact()
+        js.close()
+        db = SqliteStorage(db_path)
+        db.add_many(tasks)
+        db.close()
+
+        print(f"{n} tasks   {'first batch':>12} {'full load':>10}")
+        for name, storage_cls, path in (
+            ("json", JournalStorage, json_path),
+            ("sqlite", SqliteStorage, db_path),
+        ):
+            first, full = first_and_full(storage_cls(path))
+            print(f"{name:<11} {first * 1000:>10.1f}ms {full * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
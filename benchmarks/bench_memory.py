@@ -0,0 +1,83 @@
+"""Memory per task: the original dict-backed Task list vs. TaskStore.
+
+Usage: python -m benchmarks.bench_memory [n]   (default 1M)
+
+The saving is modest: about 1.6x (358 vs 556 B/task at 200k). Each task
+is still one slotted object (~120 B) holding a title and several ints of
+its own, plus an index entry; a larger cut needs column storage.
+"""
+
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from dailyflow import Task, TaskStore
+
+from .common import CATEGORIES, PRIORITIES
+
+
+class DictTask:
+    """The pre-TaskStore Task layout: plain attributes, ISO-string times."""
+
+    def __init__(self, task_id, title, category, due_date, duration_minutes,
+                 priority, completed=False, start_time=None, end_time=None):
+        self.id = task_id
+        self.title = title
+        self.category = category
+        self.due_date = due_date
+        self.duration_minutes = duration_minutes
+        self.priority = priority
+        self.completed = completed
+        self.start_time = start_time
+        self.end_time = end_time
+
+
+def rows(n):
+    # Strings are rebuilt per row, as they would be coming out of json.load.
+    base = datetime(2025, 1, 1, 8, 0)
+    for i in range(1, n + 1):
+        st = base + timedelta(minutes=i % 50_000)
+        yield (
+            i,
+            f"Task {i}",
+            "".join(CATEGORIES[i % len(CATEGORIES)]),
+            f"2025-02-{1 + i % 28:02d}",
+            60,
+            "".join(PRIORITIES[i % len(PRIORITIES)]),
+            False,
+            st.isoformat(),
+            (st + timedelta(minutes=60)).isoformat(),
+        )
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    obj = build(n)
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    gc.collect()
+    return size
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1_000_000
+    results = {
+        "list[DictTask]": measure(lambda n: [DictTask(*r) for r in rows(n)], n),
+        "TaskStore": measure(lambda n: TaskStore(Task(*r) for r in rows(n)), n),
+    }
+    baseline = results["list[DictTask]"]
+    for name, size in results.items():
+        print(
+            f"{name:<16} {size / 2**20:8.1f} MiB  {size / n:6.0f} B/task  "
+            f"{baseline / size:4.1f}x smaller"
+        )
+    print("(titles are unique per task and make up ~60 B/task of both)")
+    print("(one object per task remains; a larger cut needs column storage)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Cost of the profiling instrumentation, disabled and enabled.
+
+Times a trivial function called directly, through a ``profiled`` wrapper
+with profiling off and on, and inside a ``span`` block with profiling off,
+then plans a real backlog with profiling off and on.
+
+Usage: python -m benchmarks.bench_profiling [calls]   (default 1M)
+"""
+
+import sys
+import time
+from datetime import date, time as clock
+
+from dailyflow import plan_day, profiling
+
+from .common import make_tasks, timed
+
+
+def per_call(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 1_000_000
+
+    def work():
+        return None
+
+    wrapped = profiling.profiled("work")(work)
+
+    def in_span():
+        with profiling.span("work"):
+            return None
+
+    profiling.disable()
+    plain = per_call(work, n)
+    print(f"{n} calls                {'ns/call':>8} {'overhead':>9}")
+    rows = [("plain call", work), ("profiled, disabled", wrapped), ("span, disabled", in_span)]
+    for name, fn in rows:
+        secs = per_call(fn, n)
+        print(f"{name:<22} {secs * 1e9:>8.0f} {(secs - plain) * 1e9:>7.0f}ns")
+    profiling.enable()
+    secs = per_call(wrapped, n)
+    print(f"{'profiled, enabled':<22} {secs * 1e9:>8.0f} {(secs - plain) * 1e9:>7.0f}ns")
+    profiling.disable()
+
+    today = date.today()
+    tasks = make_tasks(100_000, seed=18, today=today)
+    plan = profiling.profiled("plan_today")(plan_day)
+    off, _ = timed(plan, tasks, clock(8), clock(22), today)
+    profiling.enable()
+    on, _ = timed(plan, tasks, clock(8), clock(22), today)
+    profiling.disable()
+    print(f"plan_day, 100k tasks   off {off * 1000:.1f}ms  on {on * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Recurring tasks: templates expanded per window vs. one stored task per day.
+
+Builds ``t`` recurring tasks (a mix of daily, weekday, weekly and every-N
+rules) that have been running for ``years`` years, with every past
+occurrence completed. The cloned layout stores each occurrence as a task;
+the template layout stores the rules and expands only the planned window.
+Prints the stored size and the time to load and plan one day and a week.
+
+Usage: python -m benchmarks.bench_recurrence [t] [years]   (default 200, 3)
+"""
+
+import json
+import random
+import sys
+from datetime import date, time as clock, timedelta
+
+from dailyflow import Task, plan_day
+from dailyflow.horizon import plan_horizon
+from dailyflow.models import TaskStore
+from dailyflow.recurrence import RULES, PlanningView, RecurringTask, expand
+
+from .common import CATEGORIES, DURATIONS, PRIORITIES, make_tasks, timed
+
+
+def make_templates(t, first_day, seed=22):
+    rng = random.Random(seed)
+    templates = []
+    for i in range(1, t + 1):
+        rule = rng.choice(RULES)
+        templates.append(
+            RecurringTask(
+                i,
+                f"Habit {i}",
+                rule,
+                first_day + timedelta(days=rng.randrange(7)),
+                rng.choice(CATEGORIES),
+                rng.choice(DURATIONS[:4]),
+                rng.choice(PRIORITIES),
+                interval=rng.randint(2, 5) if rule == "every" else 1,
+                weekdays=rng.sample(range(7), rng.randint(1, 3)) if rule == "weekly" else None,
+            )
+        )
+    return templates
+
+
+def clone(templates, first_day, last_day, start_id):
+    """What storing every occurrence as its own task looks like."""
+    today = date.today().toordinal()
+    tasks = []
+    for o in expand(templates, first_day, last_day, include_done=True):
+        t = Task(start_id + len(tasks), o.title, o.category, o.due_date, o.duration_minutes, o.priority)
+        t.completed = o.not_before < today
+        tasks.append(t)
+    return tasks
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    t = int(argv[0]) if len(argv) > 0 else 200
+    years = int(argv[1]) if len(argv) > 1 else 3
+    today = date.today()
+    first = today - timedelta(days=365 * years)
+    week = today + timedelta(days=6)
+    backlog = make_tasks(2000, seed=22, today=today)
+    templates = make_templates(t, first)
+
+    # Cloned: occurrences from the first day to a week ahead, all stored.
+    cloned = backlog + clone(templates, first, week, len(backlog) + 1)
+    cloned_text = json.dumps({"tasks": [x.to_dict() for x in cloned]})
+    # Templates: past days were pruned, so only the rules are stored.
+    template_text = json.dumps(
+        {
+            "tasks": [x.to_dict() for x in backlog],
+            "templates": [x.to_dict() for x in templates],
+        }
+    )
+    print(f"{t} recurring tasks over {years} years, plus {len(backlog)} one-off tasks")
+    print(f"{'':<12} {'stored':>10} {'tasks':>9} {'load':>9} {'day':>9} {'week':>9}")
+
+    def load_cloned():
+        return TaskStore(Task.from_dict(d) for d in json.loads(cloned_text)["tasks"])
+
+    def load_templates():
+        data = json.loads(template_text)
+        tasks = TaskStore(Task.from_dict(d) for d in data["tasks"])
+        return tasks, [RecurringTask.from_dict(d) for d in data["templates"]]
+
+    def window(tasks, templates, last_day):
+        return PlanningView(tasks, TaskStore(expand(templates, today, last_day)))
+
+    load, store = timed(load_cloned)
+    day, _ = timed(plan_day, store, clock(8), clock(22))
+    horizon, _ = timed(plan_horizon, store, 7, clock(8), clock(22), today)
+    print(
+        f"{'cloned':<12} {len(cloned_text) / 1e6:>8.2f}MB {len(store):>9,} "
+        f"{load * 1000:>7.1f}ms {day * 1000:>7.1f}ms {horizon * 1000:>7.1f}ms"
+    )
+
+    load, (store, loaded) = timed(load_templates)
+    day, _ = timed(lambda: plan_day(window(store, loaded, None), clock(8), clock(22)))
+    horizon, _ = timed(
+        lambda: plan_horizon(window(store, loaded, week), 7, clock(8), clock(22), today)
+    )
+    print(
+        f"{'templates':<12} {len(template_text) / 1e6:>8.2f}MB {len(store) + len(loaded):>9,} "
+        f"{load * 1000:>7.1f}ms {day * 1000:>7.1f}ms {horizon * 1000:>7.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
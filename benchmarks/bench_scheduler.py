@@ -0,0 +1,49 @@
+"""Schedule quality and runtime: greedy vs. the "optimal" knapsack strategy.
+
+Usage: python -m benchmarks.bench_scheduler [n ...]   (default 10 100 1000)
+"""
+
+import random
+import sys
+from datetime import date, time
+
+from dailyflow import plan_day
+
+from .common import make_tasks, timed
+
+START, END = time(8, 0), time(22, 0)
+
+
+def summarize(plan, scores):
+    value = sum(scores[s.task_id] for s in plan.slots)
+    busy = sum(int((s.end - s.start).total_seconds() // 60) for s in plan.slots)
+    return value, busy
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [10, 100, 1000]
+    today = date.today()
+    print(f"{'durations':<10} {'tasks':>6} {'strategy':<8} {'score':>8} {'busy':>7} "
+          f"{'slots':>6} {'time':>9}")
+    for label in ("round", "odd"):
+        for n in sizes:
+            tasks = make_tasks(n, seed=n, today=today)
+            if label == "odd":
+                # Arbitrary minute durations defeat the gcd table shrinking.
+                rng = random.Random(n)
+                for t in tasks:
+                    t.duration_minutes = rng.randint(7, 200)
+            scores = {t.id: t.score_for_today(today) for t in tasks}
+            for strategy in ("greedy", "optimal"):
+                secs, plan = timed(
+                    plan_day, tasks, START, END, today, strategy=strategy, time_budget=10
+                )
+                value, busy = summarize(plan, scores)
+                print(f"{label:<10} {n:>6} {strategy:<8} {value:>8.2f} {busy:>5}m "
+                      f"{len(plan.slots):>6} {secs * 1000:>7.1f}ms")
+    print(f"window {START:%H:%M}-{END:%H:%M}; busy = scheduled minutes excluding breaks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Repeated planning with and without a ScoreCache.
+
+Plans the same backlog several times (as the GUI does on every re-plan),
+then again after editing 1% of the tasks, and prints the cache counters.
+
+Usage: python -m benchmarks.bench_scorecache [n]   (default 100k)
+"""
+
+import random
+import sys
+from datetime import date, time
+
+from dailyflow import plan_day
+from dailyflow.models import ScoreCache
+from dailyflow.planner import rank_pending
+
+from .common import PRIORITIES, make_tasks, timed
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 100_000
+    today = date.today()
+    tasks = make_tasks(n, seed=16, today=today)
+    cache = ScoreCache()
+    rank_pending(tasks, today, cache=cache)  # warm
+
+    print(f"{n} tasks              {'no cache':>10} {'cache':>10}")
+    rows = [
+        ("rank_pending", lambda c: rank_pending(tasks, today, cache=c)),
+        ("plan_day", lambda c: plan_day(tasks, time(8), time(22), today, cache=c)),
+    ]
+    for name, fn in rows:
+        cold, expected = timed(fn, None)
+        warm, got = timed(fn, cache)
+        assert got == expected, name
+        print(f"{name:<22} {cold * 1000:>8.1f}ms {warm * 1000:>8.1f}ms")
+
+    rng = random.Random(16)
+    for t in rng.sample(tasks, n // 100):
+        t.priority = rng.choice(PRIORITIES)
+    before = cache.misses
+    secs, _ = timed(rank_pending, tasks, today, cache=cache, repeat=1)
+    print(f"{'after editing 1%':<22} {'':>10} {secs * 1000:>8.1f}ms  "
+          f"({cache.misses - before} rescored)")
+    stats = cache.stats()
+    print(f"hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses); "
+          f"due-date parses: {stats['date_parse_misses']} of "
+          f"{stats['date_parse_hits'] + stats['date_parse_misses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Scalar Task.score_for_today vs. the NumPy ScoreColumns path.
+
+Usage: python -m benchmarks.bench_scoring [size ...]   (default 1k 100k 1M)
+"""
+
+import sys
+from datetime import date
+
+from dailyflow.scoring import ScoreColumns
+
+from .common import make_tasks, timed
+
+
+def scalar_scores(tasks, today):
+    return [t.score_for_today(today) for t in tasks]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [1_000, 100_000, 1_000_000]
+    today = date.today()
+    print(f"{'tasks':>10} {'scalar':>10} {'columns':>10} {'score':>10} {'speedup':>8}")
+    for n in sizes:
+        tasks = make_tasks(n, seed=n, today=today)
+        repeat = 3 if n <= 100_000 else 1
+        t_scalar, expected = timed(scalar_scores, tasks, today, repeat=repeat)
+        t_build, cols = timed(ScoreColumns.from_tasks, tasks, repeat=repeat)
+        t_score, got = timed(cols.scores, today, repeat=repeat)
+        assert got.tolist() == expected, "vectorized scores diverged from scalar"
+        print(
+            f"{n:>10} {t_scalar:>9.3f}s {t_build:>9.3f}s {t_score:>9.4f}s "
+            f"{t_scalar / (t_build + t_score):>7.1f}x"
+        )
+    print("columns = one-off ScoreColumns.from_tasks, score = scores(today) per plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""All Tasks search: inverted indexes vs. scanning every task.
+
+Builds a TaskIndex over a backlog with word-like titles, then times each
+keystroke of a typed query (with and without filters) against a linear
+scan doing the same matching, and the cost of keeping the index current.
+
+Usage: python -m benchmarks.bench_search [n]   (default 100k)
+"""
+
+import random
+import sys
+from datetime import date
+
+from dailyflow.search import TaskIndex, tokens
+
+from .common import make_tasks, timed
+
+WORDS = (
+    "review report study chapter email plan call meeting draft budget "
+    "invoice gym run groceries read write fix deploy design notes exam "
+    "project client slides update backup clean laundry dentist book"
+).split()
+
+
+def scan(tasks, text="", category=None, completed=None):
+    """What filtering looks like without an index."""
+    words = tokens(text)
+    out = set()
+    for t in tasks:
+        if category is not None and t.category != category:
+            continue
+        if completed is not None and t.completed != completed:
+            continue
+        title = tokens(t.title)
+        if all(any(w.startswith(q) for w in title) for q in words):
+            out.add(t.id)
+    return out
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 100_000
+    rng = random.Random(19)
+    tasks = make_tasks(n, seed=19, today=date.today())
+    for t in tasks:
+        t.title = " ".join(rng.sample(WORDS, 3)) + f" #{t.id % 500}"
+
+    secs, index = timed(TaskIndex, tasks, repeat=1)
+    print(f"{n} tasks: index built in {secs * 1000:.0f}ms "
+          f"({len(index.words.index)} distinct words)")
+
+    print(f"{'query':<26} {'matches':>8} {'index':>9} {'scan':>9}")
+    query = "review chapter"
+    for filters in ({}, {"category": "Work", "completed": False}):
+        for i in range(1, len(query) + 1):
+            text = query[:i]
+            if text.endswith(" "):
+                continue
+            fast, got = timed(index.search, text, **filters)
+            slow, expected = timed(scan, tasks, text, **filters, repeat=1)
+            assert (got if got is not None else {t.id for t in tasks}) == expected, text
+            label = text + (" +filters" if filters else "")
+            print(f"{label:<26} {len(expected):>8} {fast * 1000:>7.2f}ms {slow * 1000:>7.1f}ms")
+
+    sample = rng.sample(tasks, 1000)
+
+    def edit():
+        for t in sample:
+            t.completed = not t.completed
+            index.update(t)
+
+    secs, _ = timed(edit)
+    print(f"re-index after an edit     {secs / len(sample) * 1e6:>8.1f}µs per task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Load test for the multi-user task server (local client only).
+
+Simulates ``--users`` concurrent users, each on its own keep-alive
+connection, doing ``--rounds`` rounds of: add ``--adds`` tasks, list the
+pending tasks, plan the day. Prints requests/sec and per-operation
+latency percentiles plus the storage pool counters. Starts a server in
+this process on a free port with a temporary root unless ``--port`` points
+at one already running.
+
+Usage:
+    python -m benchmarks.bench_server [--users 1000] [--rounds 3] [--adds 5]
+        [--pool N] [--sqlite] [--port N]
+
+A ``--pool`` smaller than ``--users`` shows the cost of eviction: every
+user is active in turn, so an LRU pool that cannot hold them all misses.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import tempfile
+import time
+
+from dailyflow.server import start_server
+
+from .common import CATEGORIES, DURATIONS, PRIORITIES
+
+
+async def request(reader, writer, method, path, body=None):
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1")
+        + data
+    )
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    payload = json.loads(await reader.readexactly(length))
+    if status >= 400:
+        raise RuntimeError(f"{method} {path}: {status} {payload}")
+    return payload
+
+
+async def simulate_user(port, user, args, latencies, start):
+    rng = random.Random(user)
+    await start.wait()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    base = f"/users/u{user}"
+    try:
+        for _ in range(args.rounds):
+            ops = [
+                (
+                    "add",
+                    "POST",
+                    base + "/tasks",
+                    {
+                        "title": f"Task {rng.randrange(10**6)}",
+                        "category": rng.choice(CATEGORIES),
+                        "priority": rng.choice(PRIORITIES),
+                        "duration_minutes": rng.choice(DURATIONS),
+                    },
+                )
+                for _ in range(args.adds)
+            ]
+            ops.append(("list", "GET", base + "/tasks", None))
+            ops.append(("plan", "POST", base + "/plan", {"start": "08:00", "end": "22:00"}))
+            for op, method, path, body in ops:
+                t0 = time.perf_counter()
+                await request(reader, writer, method, path, body)
+                latencies[op].append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+async def run(args):
+    # One socket per simulated user, twice over when the server is in-process.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    want = min(hard, max(soft, 2 * args.users + 256))
+    if want > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (want, hard))
+
+    server = app = tmp = None
+    port = args.port
+    if port is None:
+        tmp = tempfile.TemporaryDirectory()
+        capacity = args.pool or args.users
+        server, app = await start_server(tmp.name, port=0, capacity=capacity, sqlite=args.sqlite)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = {"add": [], "list": [], "plan": []}
+    start = asyncio.Event()
+    users = [
+        asyncio.create_task(simulate_user(port, u, args, latencies, start))
+        for u in range(args.users)
+    ]
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    start.set()
+    await asyncio.gather(*users)
+    elapsed = time.perf_counter() - t0
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"{args.users} users, {total} requests in {elapsed:.2f}s: {total / elapsed:,.0f} req/s")
+    print(f"{'op':<6} {'count':>7} {'p50':>9} {'p99':>9} {'max':>9}")
+    for op, values in latencies.items():
+        values.sort()
+        print(
+            f"{op:<6} {len(values):>7} {_percentile(values, 50) * 1000:>7.1f}ms "
+            f"{_percentile(values, 99) * 1000:>7.1f}ms {values[-1] * 1000:>7.1f}ms"
+        )
+    if app is not None:
+        print("pool:", app.pool.stats())
+        server.close()
+        await server.wait_closed()
+        await app.pool.close()
+        tmp.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_server")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--adds", type=int, default=5)
+    parser.add_argument("--pool", type=int, help="server's open-user limit (default: --users)")
+    parser.add_argument("--sqlite", action="store_true")
+    parser.add_argument("--port", type=int, help="use a server already running on this port")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
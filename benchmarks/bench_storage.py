@@ -0,0 +1,72 @@
+"""Cold startup and common queries: JSON snapshot vs. SQLite backend.
+
+Usage: python -m benchmarks.bench_storage [n]   (default 100k)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, time
+
+from dailyflow import apply_plan, plan_day
+from dailyflow.journal import JournalStorage
+from dailyflow.models import MINUTES_PER_DAY, day_start_minutes
+from dailyflow.sqlite_store import SqliteStorage, migrate_json
+
+from .common import make_tasks, timed
+
+
+def cold(storage_cls, path, query):
+    """Open a backend from scratch and answer one query, as a fresh process would."""
+    s = storage_cls(path)
+    if storage_cls is JournalStorage:
+        s.load()  # the JSON path has to deserialize everything first
+    result = query(s)
+    s.close()
+    return result
+
+
+def work_tasks(s):
+    if isinstance(s, SqliteStorage):
+        return s.by_category("Work")
+    return [t for t in s.pending() if t.category == "Work"]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n = int(argv[0]) if argv else 100_000
+    today = date.today()
+    tasks = make_tasks(n, seed=5, today=today)
+    for t in tasks[::3]:
+        t.completed = True
+    apply_plan(tasks, plan_day(tasks[:200], time(8), time(22), today))
+    day0 = day_start_minutes(today)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "data.json")
+        db_path = os.path.join(tmp, "tasks.db")
+        js = JournalStorage(json_path)
+        js.tasks.clear()
+        for t in tasks:
+            js.tasks.add(t)
+        js.compact()
+        js.close()
+        secs, _ = timed(migrate_json, json_path, db_path, repeat=1)
+        print(f"{n} tasks; JSON {os.path.getsize(json_path) / 2**20:.1f} MiB, "
+              f"SQLite {os.path.getsize(db_path) / 2**20:.1f} MiB, migration {secs:.2f}s")
+
+        day = (day0, day0 + MINUTES_PER_DAY)
+        queries = [
+            ("pending backlog", lambda s: s.pending()),
+            ("today's plan", lambda s: s.scheduled_between(*day)),
+            ("one category", work_tasks),
+        ]
+        print(f"{'cold start +':<16} {'json':>10} {'sqlite':>10} {'rows':>8}")
+        for name, query in queries:
+            t_json, expected = timed(cold, JournalStorage, json_path, query)
+            t_db, got = timed(cold, SqliteStorage, db_path, query)
+            assert [t.id for t in expected] == [t.id for t in got], name
+            print(f"{name:<16} {t_json * 1000:>8.1f}ms {t_db * 1000:>8.1f}ms {len(got):>8}")
+
+if __name__ == "__main__":
+    main()
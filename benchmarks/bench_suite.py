@@ -0,0 +1,236 @@
+"""Planner benchmark suite: every hot path at several sizes, as JSON.
+
+Generates a synthetic backlog per size (shape configurable below), times
+scoring, ranking, scheduling, serialization and the view refresh logic
+(headlessly, against an in-memory stand-in for the Treeview), prints a
+table and optionally writes the results as JSON. ``--compare`` reads an
+earlier JSON file and flags steps that got slower.
+
+Usage:
+    python -m benchmarks.bench_suite [--sizes 1000 10000 100000] [--repeat 3]
+        [--priority-mix Low=1,Medium=2,High=2,Critical=1]
+        [--due-share 0.7] [--due-distribution uniform|soon|none]
+        [--durations 15=1,30=2,60=2,120=1] [--completed-share 0.2]
+        [--out results.json] [--compare baseline.json]
+"""
+
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, time as clock
+
+from dailyflow import apply_plan, plan_day, plan_horizon
+from dailyflow.incremental import IncrementalPlanner
+from dailyflow.journal import JournalStorage
+from dailyflow.models import TaskStore
+from dailyflow.planner import rank_pending, scheduled_today
+from dailyflow.tasklist import VirtualTaskList
+from dailyflow.transfer import write_json
+
+from .common import DUE_DISTRIBUTIONS, generate_tasks, parse_weights, timed
+
+START, END = clock(8, 0), clock(22, 0)
+OPTIMAL_MAX_TASKS = 10_000  # the knapsack strategy is for day-sized backlogs
+REGRESSION = 1.10  # flag steps more than 10% slower than the baseline
+
+
+class _HeadlessTree:
+    """The slice of ttk.Treeview that VirtualTaskList uses, in memory."""
+
+    def __init__(self, height=30):
+        self.height = height
+        self.children = []
+        self.values = {}
+        self.selected = ()
+
+    def cget(self, option):
+        return self.height
+
+    def configure(self, **kwargs):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid, values):
+        self.children.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.children.remove(iid)
+            del self.values[iid]
+
+    def item(self, iid, values):
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids)
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+class _HeadlessScrollbar:
+    def configure(self, **kwargs):
+        pass
+
+    def set(self, first, last):
+        pass
+
+
+def _have_numpy():
+    return importlib.util.find_spec("numpy") is not None
+
+
+def steps_for(tasks, today, tmp):
+    """(name, callable) pairs to time for one backlog."""
+    store = TaskStore(tasks)
+    json_path = os.path.join(tmp, "data.json")
+
+    def save():
+        s = JournalStorage(json_path)
+        s.tasks = store
+        s.compact()
+        s.close()
+
+    def load():
+        s = JournalStorage(json_path)
+        s.load()
+        s.close()
+
+    tree_list = VirtualTaskList(_HeadlessTree(), _HeadlessScrollbar())
+    tree_list.refresh(store)
+
+    def refresh_after_edit():
+        first = tasks[0]
+        first.completed = not first.completed
+        tree_list.refresh(store)
+
+    steps = [
+        ("score", lambda: [t.score_for_today(today) for t in tasks]),
+        ("rank", lambda: rank_pending(tasks, today)),
+    ]
+    if _have_numpy():
+        steps.append(("rank_vectorized", lambda: rank_pending(tasks, today, vectorized=True)))
+    steps += [
+        ("plan_greedy", lambda: plan_day(tasks, START, END, today)),
+        ("plan_incremental_build", lambda: IncrementalPlanner(tasks, START, END, today)),
+        ("plan_horizon_7d", lambda: plan_horizon(tasks, 7, START, END, today)),
+    ]
+    if len(tasks) <= OPTIMAL_MAX_TASKS:
+        steps.append(
+            ("plan_optimal", lambda: plan_day(tasks, START, END, today, strategy="optimal"))
+        )
+    plan = plan_day(tasks, START, END, today)
+    steps += [
+        ("apply_plan", lambda: apply_plan(tasks, plan)),
+        ("serialize_json", lambda: write_json((t.to_dict() for t in tasks), io.StringIO())),
+        ("save_snapshot", save),
+        ("load_snapshot", load),
+        ("refresh_task_list", refresh_after_edit),
+        ("refresh_today_split", lambda: scheduled_today(tasks, today)),
+    ]
+    return steps
+
+
+def run(args):
+    today = date.today()
+    workload = {
+        "priority_mix": args.priority_mix,
+        "due_share": args.due_share,
+        "due_distribution": args.due_distribution,
+        "durations": args.durations,
+        "completed_share": args.completed_share,
+    }
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            tasks = generate_tasks(n, seed=n, today=today, **workload)
+            # Order matters: save_snapshot must run before load_snapshot.
+            for name, fn in steps_for(tasks, today, tmp):
+                secs, _ = timed(fn, repeat=args.repeat)
+                results.append({"size": n, "step": name, "seconds": secs})
+                print(f"{n:>8} {name:<24} {secs * 1000:>10.2f}ms {secs / n * 1e6:>8.2f}µs/task")
+    return {"meta": _meta(args, workload), "results": results}
+
+
+def _meta(args, workload):
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        rev = ""
+    return {
+        "revision": rev or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "workload": dict(workload),
+    }
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["size"], r["step"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nvs. {baseline_path} ({baseline['meta'].get('revision') or 'unknown revision'})")
+    slower = 0
+    for r in report["results"]:
+        old = before.get((r["size"], r["step"]))
+        if not old:
+            continue
+        ratio = r["seconds"] / old
+        flag = "  SLOWER" if ratio > REGRESSION else ""
+        slower += bool(flag)
+        print(f"{r['size']:>8} {r['step']:<24} {ratio:>6.2f}x{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--priority-mix", type=parse_weights, metavar="P=W,...")
+    parser.add_argument("--due-share", type=float, default=0.7)
+    parser.add_argument("--due-distribution", choices=DUE_DISTRIBUTIONS, default="uniform")
+    parser.add_argument(
+        "--durations", type=lambda s: parse_weights(s, int), metavar="MINUTES=W,..."
+    )
+    parser.add_argument("--completed-share", type=float, default=0.0)
+    parser.add_argument("--out", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="earlier JSON results to compare with")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare and compare(report, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
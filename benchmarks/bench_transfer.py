@@ -0,0 +1,90 @@
+"""Streaming export/import throughput and peak memory vs. ``json.load``.
+
+Export times include generating the synthetic tasks; tasks/s counts the
+records each step reads or writes. Peak memory is measured in a separate
+pass under tracemalloc (which slows everything down), so the timing columns
+are not distorted by it. Streaming peaks should stay flat as n grows; the
+``json.load`` baseline grows with n.
+
+Usage: python -m benchmarks.bench_transfer [n ...]   (default 100k 400k)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from dailyflow.transfer import in_categories, only_pending, read_records, write_records
+
+from .common import make_tasks
+
+
+def generate(n, chunk=10_000):
+    """``n`` task dicts, built a chunk at a time so the source is not a big list."""
+    for first in range(1, n + 1, chunk):
+        for t in make_tasks(min(chunk, n + 1 - first), seed=first, start_id=first):
+            if t.id % 3 == 0:
+                t.completed = True
+            yield t.to_dict()
+
+
+def drain(records):
+    count = 0
+    for _ in records:
+        count += 1
+    return count
+
+
+def json_load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return len(json.load(f)["tasks"])
+
+
+def measure(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    secs = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return secs, peak, result
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sizes = [int(a) for a in argv] or [100_000, 400_000]
+
+    print(f"{'n':>8} {'step':<26} {'time':>8} {'tasks/s':>10} {'MiB/s':>7} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            json_path = os.path.join(tmp, "tasks.json")
+            nd_path = os.path.join(tmp, "tasks.ndjson")
+            out_path = os.path.join(tmp, "work.ndjson")
+            steps = [
+                ("export json", json_path, lambda: write_records(generate(n), json_path)),
+                ("export ndjson", nd_path, lambda: write_records(generate(n), nd_path)),
+                ("json.load (baseline)", json_path, lambda: json_load(json_path)),
+                ("stream json", json_path, lambda: drain(read_records(json_path))),
+                ("stream ndjson", nd_path, lambda: drain(read_records(nd_path))),
+                (
+                    "pending Work -> ndjson",
+                    nd_path,
+                    lambda: write_records(
+                        in_categories(only_pending(read_records(nd_path)), ["Work"]), out_path
+                    ),
+                ),
+            ]
+            for name, path, fn in steps:
+                secs, peak, count = measure(fn)
+                mib = os.path.getsize(path) / 2**20
+                print(
+                    f"{n:>8} {name:<26} {secs * 1000:>6.0f}ms {count / secs:>10.0f} "
+                    f"{mib / secs:>7.1f} {peak / 2**20:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
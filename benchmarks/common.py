@@ -0,0 +1,106 @@
+"""Shared helpers for the benchmark scripts."""
+
+import random
+import time
+from datetime import date, timedelta
+
+from dailyflow import Task
+
+PRIORITIES = ("Low", "Medium", "High", "Critical")
+CATEGORIES = ("Work", "Study", "Personal", "Health", "General")
+DURATIONS = (15, 30, 45, 60, 90, 120, 180)
+DUE_DISTRIBUTIONS = ("uniform", "soon", "none")
+
+
+def make_tasks(n, seed=0, today=None, start_id=1):
+    """Return ``n`` random pending tasks with due dates around ``today``."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    tasks = []
+    for i in range(start_id, start_id + n):
+        due = None
+        if rng.random() < 0.7:
+            due = (today + timedelta(days=rng.randint(-3, 30))).isoformat()
+        tasks.append(
+            Task(
+                i,
+                f"Task {i}",
+                rng.choice(CATEGORIES),
+                due,
+                rng.choice((15, 30, 45, 60, 90, 120, 180)),
+                rng.choice(PRIORITIES),
+            )
+        )
+    return tasks
+
+
+def generate_tasks(
+    n,
+    seed=0,
+    today=None,
+    start_id=1,
+    priority_mix=None,
+    due_share=0.7,
+    due_distribution="uniform",
+    due_range=(-3, 30),
+    durations=None,
+    completed_share=0.0,
+):
+    """``n`` synthetic tasks with a configurable shape.
+
+    priority_mix: {priority: weight}, default uniform over PRIORITIES.
+    due_share: fraction of tasks with a due date, drawn from due_range
+    (days from ``today``) either uniformly or "soon" (exponential, most
+    due within a few days); "none" gives no due dates at all.
+    durations: {minutes: weight}, default uniform over DURATIONS.
+    completed_share: fraction of tasks already marked done.
+    """
+    if due_distribution not in DUE_DISTRIBUTIONS:
+        raise ValueError(f"Unknown due-date distribution: {due_distribution!r}")
+    rng = random.Random(seed)
+    today = today or date.today()
+    priority_mix = priority_mix or dict.fromkeys(PRIORITIES, 1)
+    durations = durations or dict.fromkeys(DURATIONS, 1)
+    priorities = rng.choices(list(priority_mix), list(priority_mix.values()), k=n)
+    minutes = rng.choices(list(durations), list(durations.values()), k=n)
+    lo, hi = due_range
+    tasks = []
+    for i in range(n):
+        due = None
+        if due_distribution != "none" and rng.random() < due_share:
+            if due_distribution == "uniform":
+                offset = rng.randint(lo, hi)
+            else:
+                offset = min(hi, lo + int(rng.expovariate(1 / 4)))
+            due = (today + timedelta(days=offset)).isoformat()
+        t = Task(
+            start_id + i,
+            f"Task {start_id + i}",
+            rng.choice(CATEGORIES),
+            due,
+            minutes[i],
+            priorities[i],
+        )
+        t.completed = rng.random() < completed_share
+        tasks.append(t)
+    return tasks
+
+
+def parse_weights(text, cast=str):
+    """'High=3,Low=1' -> {'High': 3.0, 'Low': 1.0} (keys converted by ``cast``)."""
+    weights = {}
+    for part in text.split(","):
+        key, _, weight = part.partition("=")
+        weights[cast(key.strip())] = float(weight or 1)
+    return weights
+
+
+def timed(fn, *args, repeat=3, **kwargs):
+    """Best-of-``repeat`` wall time of ``fn(*args, **kwargs)`` in seconds."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
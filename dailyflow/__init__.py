@@ -0,0 +1,38 @@
+"""DailyFlow core: task model and planning, free of any GUI imports.
+
+The public names are imported on first use (PEP 562 ``__getattr__``), so
+``import dailyflow`` and the CLI only pay for the modules they touch.
+"""
+
+_EXPORTS = {
+    "PRIORITY_SCORES": "models",
+    "Task": "models",
+    "TaskStore": "models",
+    "Plan": "planner",
+    "Slot": "planner",
+    "apply_plan": "planner",
+    "parse_time": "planner",
+    "plan_day": "planner",
+    "plan_many": "planner",
+    "HorizonPlan": "horizon",
+    "plan_horizon": "horizon",
+    "Storage": "storage",
+    "open_storage": "storage",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,7 @@
+"""``python -m dailyflow``: the command-line interface (see dailyflow.cli)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
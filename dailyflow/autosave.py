@@ -0,0 +1,133 @@
+"""Debounced background saving.
+
+The UI records each mutation in the storage backend (cheap: an append to
+a buffer or an uncommitted row) and calls :meth:`AutoSaver.touch`. A single
+worker thread waits until no change has arrived for ``delay`` seconds (but
+never longer than ``max_delay`` after the first unsaved change) and then
+calls ``storage.flush()``. A burst of edits becomes one write, there is
+never more than one write in flight, and the Tk thread never waits on
+disk. :meth:`close` performs a final flush before the window goes away.
+
+Nothing here touches tkinter: the UI thread calls ``touch``/``save_now``/
+``close`` and shows :attr:`AutoSaver.status` from an ``after()`` poll.
+"""
+
+import threading
+import time
+
+from . import profiling
+
+SAVED = "saved"
+PENDING = "pending"
+SAVING = "saving"
+FAILED = "failed"
+
+
+class AutoSaver:
+    def __init__(self, storage, delay=1.0, max_delay=5.0):
+        self.storage = storage
+        storage.autoflush = False  # this saver decides when to write
+        self.delay = delay
+        self.max_delay = max_delay
+        self.state = SAVED
+        self.error = None  # exception from the last failed write
+        self.saved_at = None  # time.time() of the last successful write
+        self.writes = 0
+        self._cond = threading.Condition()
+        self._first_change = None  # monotonic time of the oldest unsaved change
+        self._last_change = None
+        self._compact = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="dailyflow-autosave", daemon=True)
+        self._thread.start()
+
+    # ---------------- UI THREAD ----------------
+
+    def touch(self):
+        """Note that the storage has unsaved changes."""
+        with self._cond:
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            if self.state != SAVING:
+                self.state = PENDING
+            self._cond.notify()
+
+    def save_now(self, compact=False):
+        """Write without waiting for the debounce (and optionally compact)."""
+        with self._cond:
+            now = time.monotonic()
+            self._first_change = self._last_change = now - self.max_delay
+            self._compact = self._compact or compact
+            self._cond.notify()
+
+    def close(self, timeout=None):
+        """Stop the worker after a final flush; True if it finished in time."""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    @property
+    def status(self):
+        """Short text for a status label."""
+        if self.state == SAVED:
+            if self.saved_at is None:
+                return "All changes saved"
+            return time.strftime("Saved %H:%M:%S", time.localtime(self.saved_at))
+        if self.state == FAILED:
+            return f"Save failed: {self.error}"
+        return "Saving…" if self.state == SAVING else "Unsaved changes"
+
+    # ---------------- WORKER THREAD ----------------
+
+    def _due(self):
+        """Seconds until the pending changes should be written (None: nothing to do)."""
+        if self._first_change is None:
+            return None
+        now = time.monotonic()
+        return max(
+            0.0,
+            min(self._last_change + self.delay, self._first_change + self.max_delay) - now,
+        )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    wait = self._due()
+                    if self._closing or wait == 0.0:
+                        break
+                    self._cond.wait(wait)
+                closing = self._closing
+                compact, self._compact = self._compact, False
+                self._first_change = self._last_change = None
+                self.state = SAVING
+            try:
+                if compact:
+                    with profiling.span("storage.compact"):
+                        self.storage.compact()
+                else:
+                    with profiling.span("storage.flush"):
+                        self.storage.flush()
+            except Exception as e:
+                with self._cond:
+                    self.state = FAILED
+                    self.error = e
+                    # Keep the changes marked unsaved and retry later.
+                    if self._first_change is None:
+                        self._first_change = self._last_change = time.monotonic()
+                    self._compact = self._compact or compact
+                if closing:
+                    return
+                time.sleep(self.max_delay)
+                continue
+            with self._cond:
+                self.writes += 1
+                self.saved_at = time.time()
+                self.error = None
+                self.state = PENDING if self._first_change is not None else SAVED
+            if closing:
+                return
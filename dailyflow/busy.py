@@ -0,0 +1,298 @@
+"""Fixed busy time (meetings, lunch, commutes) that the planner must avoid.
+
+:class:`BusyCalendar` keeps busy blocks as sorted, merged, disjoint
+intervals in epoch minutes. Because they never overlap, bisection over the
+start times is all an interval tree would give us here: overlap checks and
+"free windows between A and B" cost O(log n + k). The planner then turns
+those free windows into a :class:`~dailyflow.slots.FreeSlots` index for
+first-fit placement.
+
+Blocks come from :func:`load_ics` (a local iCalendar file) or
+:func:`weekly_blocks` (e.g. lunch 12:00-13:00 on weekdays, written
+``"12:00-13:00 mon-fri"`` for :func:`parse_weekly`).
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta, timezone
+
+from .models import to_minutes
+
+
+class BusyCalendar:
+    def __init__(self, blocks=()):
+        self.starts = []
+        self.ends = []
+        for start, end in blocks:
+            self.add(start, end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def add(self, start, end):
+        """Mark [start, end) busy, merging with any touching blocks."""
+        if start >= end:
+            return
+        lo = bisect_left(self.ends, start)  # first block ending at/after start
+        hi = bisect_right(self.starts, end)  # blocks starting after end stay
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def overlaps(self, start, end):
+        """True if any busy block intersects [start, end)."""
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def free_windows(self, start, end):
+        """Free sub-windows of [start, end), in order."""
+        windows = []
+        i = bisect_right(self.ends, start)
+        cursor = start
+        while i < len(self.starts) and self.starts[i] < end:
+            if self.starts[i] > cursor:
+                windows.append((cursor, self.starts[i]))
+            cursor = max(cursor, self.ends[i])
+            i += 1
+        if cursor < end:
+            windows.append((cursor, end))
+        return windows
+
+
+def free_windows(busy, spans):
+    """Split ``(start, end)`` spans around the blocks of ``busy`` (may be None)."""
+    if not busy:
+        return list(spans)
+    out = []
+    for s, e in spans:
+        out.extend(busy.free_windows(s, e))
+    return out
+
+
+def weekly_blocks(first_day, days, start, end, weekdays=range(7)):
+    """Busy blocks from ``start`` to ``end`` (times) on the given weekdays.
+
+    ``weekdays`` uses ``date.weekday()`` numbering (Monday is 0).
+    """
+    weekdays = set(weekdays)
+    blocks = []
+    for i in range(days):
+        d = first_day + timedelta(days=i)
+        if d.weekday() in weekdays:
+            blocks.append(
+                (to_minutes(datetime.combine(d, start)), to_minutes(datetime.combine(d, end)))
+            )
+    return blocks
+
+
+_DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_weekly(spec):
+    """``(start, end, weekdays)`` for :func:`weekly_blocks` from text like
+    ``"12:00-13:00"`` (every day), ``"12:00-13:00 mon-fri"`` or
+    ``"07:30-08:15 mon,wed,fri"``. Raises ValueError if it does not parse.
+    """
+    span, _, days = spec.strip().partition(" ")
+    try:
+        start, end = (datetime.strptime(s, "%H:%M").time() for s in span.split("-"))
+    except ValueError:
+        raise ValueError(f"Expected HH:MM-HH:MM, got {span!r}.") from None
+    if start >= end:
+        raise ValueError("A busy block must end after it starts.")
+    weekdays = set()
+    for part in days.replace(" ", "").lower().split(",") if days.strip() else ("mon-sun",):
+        first, _, last = part.partition("-")
+        try:
+            a = _DAY_NAMES.index(first[:3])
+            b = _DAY_NAMES.index(last[:3]) if last else a
+        except ValueError:
+            raise ValueError(f"Unknown day {part!r}; use mon..sun.") from None
+        weekdays.update(range(a, b + 1) if a <= b else (*range(a, 7), *range(b + 1)))
+    return start, end, sorted(weekdays)
+
+
+# ---------------- ICS IMPORT ----------------
+
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+def _unfold(lines):
+    # RFC 5545 folds long lines; a leading space/tab continues the previous one.
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _parse_when(params, value):
+    """Local naive datetime for an ICS date-time, or None for all-day dates."""
+    if "VALUE=DATE" in params or len(value) == 8:
+        return None
+    if value.endswith("Z"):
+        dt = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return dt.astimezone().replace(tzinfo=None)
+    dt = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    for p in params:
+        if p.startswith("TZID="):
+            try:
+                from zoneinfo import ZoneInfo
+
+                dt = dt.replace(tzinfo=ZoneInfo(p[5:])).astimezone().replace(tzinfo=None)
+            except Exception:
+                pass  # unknown zone: keep wall-clock time
+    return dt
+
+
+def _parse_duration(value):
+    # Enough of RFC 5545 durations for meetings: [-]P[nW][nD][T[nH][nM][nS]]
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-").lstrip("P")
+    total = timedelta()
+    number = ""
+    in_time = False
+    for ch in value:
+        if ch.isdigit():
+            number += ch
+        elif ch == "T":
+            in_time = True
+        else:
+            n = int(number or 0)
+            number = ""
+            if ch == "W":
+                total += timedelta(weeks=n)
+            elif ch == "D":
+                total += timedelta(days=n)
+            elif ch == "H" and in_time:
+                total += timedelta(hours=n)
+            elif ch == "M" and in_time:
+                total += timedelta(minutes=n)
+            elif ch == "S" and in_time:
+                total += timedelta(seconds=n)
+    return sign * total
+
+
+def _expand(start, end, rrule, exdates, first, last):
+    """Occurrences of one event overlapping [first, last) (datetimes)."""
+    length = end - start
+    if not rrule:
+        if start < last and start + length > first:
+            yield start, start + length
+        return
+
+    rule = dict(part.split("=", 1) for part in rrule.split(";") if "=" in part)
+    freq = rule.get("FREQ")
+    if freq not in ("DAILY", "WEEKLY"):
+        # Other frequencies are rare for busy time; keep the first instance.
+        if start < last and start + length > first:
+            yield start, start + length
+        return
+    interval = int(rule.get("INTERVAL", 1))
+    count = int(rule["COUNT"]) if "COUNT" in rule else None
+    until = None
+    if "UNTIL" in rule:
+        until = _parse_when((), rule["UNTIL"])
+        if until is None:
+            # A date-only UNTIL includes that whole day (RFC 5545).
+            day = datetime.strptime(rule["UNTIL"][:8], "%Y%m%d").date()
+            until = datetime.combine(day, time.max)
+    byday = None
+    if freq == "WEEKLY" and "BYDAY" in rule:
+        byday = {_WEEKDAYS[d[-2:]] for d in rule["BYDAY"].split(",") if d[-2:] in _WEEKDAYS}
+    if freq == "WEEKLY" and not byday:
+        byday = {start.weekday()}
+
+    seen = 0
+    day = start.date()
+    week0 = day - timedelta(days=day.weekday())
+    if count is None and day < first.date():
+        # Skip whole periods before the range; COUNT needs every occurrence.
+        period = 7 * interval
+        day += timedelta(days=(first.date() - day).days // period * period)
+    while True:
+        occ = datetime.combine(day, start.time())
+        if freq == "DAILY":
+            due = (day - start.date()).days % interval == 0
+        else:
+            due = day.weekday() in byday and ((day - week0).days // 7) % interval == 0
+        if due:
+            if (until is not None and occ > until) or (count is not None and seen >= count):
+                return
+            seen += 1
+            if occ >= last:
+                return
+            if occ + length > first and occ not in exdates:
+                yield occ, occ + length
+        day += timedelta(days=1)
+
+
+def load_ics(path, first_day, days):
+    """Busy blocks from a local .ics file within ``days`` days of ``first_day``.
+
+    Handles timed VEVENTs with DTEND or DURATION, UTC and TZID times,
+    EXDATE, and DAILY/WEEKLY RRULEs (INTERVAL, BYDAY, COUNT, UNTIL).
+    Cancelled, transparent ("free") and all-day events are skipped. Returns
+    a list of ``(start, end)`` epoch-minute pairs.
+    """
+    first = datetime.combine(first_day, datetime.min.time())
+    last = first + timedelta(days=days)
+    blocks = []
+    event = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in _unfold(f):
+            if line == "BEGIN:VEVENT":
+                event = {"EXDATE": set()}
+                continue
+            if event is None:
+                continue
+            if line == "END:VEVENT":
+                blocks.extend(_event_blocks(event, first, last))
+                event = None
+                continue
+            name, _, value = line.partition(":")
+            name, *params = name.split(";")
+            if name == "EXDATE":
+                for v in value.split(","):
+                    dt = _parse_when(params, v)
+                    if dt is not None:
+                        event["EXDATE"].add(dt)
+            else:
+                event[name] = (params, value)
+    return blocks
+
+
+def _event_blocks(event, first, last):
+    if "DTSTART" not in event:
+        return []
+    if event.get("STATUS", ((), ""))[1] == "CANCELLED":
+        return []
+    if event.get("TRANSP", ((), ""))[1] == "TRANSPARENT":
+        return []
+    start = _parse_when(*event["DTSTART"])
+    if start is None:
+        return []
+    if "DTEND" in event:
+        end = _parse_when(*event["DTEND"])
+        if end is None:
+            return []
+    elif "DURATION" in event:
+        end = start + _parse_duration(event["DURATION"][1])
+    else:
+        return []
+    rrule = event.get("RRULE", ((), ""))[1]
+    return [
+        (to_minutes(s), to_minutes(e))
+        for s, e in _expand(start, end, rrule, event["EXDATE"], first, last)
+        if e > s
+    ]
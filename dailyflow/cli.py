@@ -0,0 +1,273 @@
+"""Command-line interface: plan, add and list tasks without the GUI.
+
+    python -m dailyflow add "Write report" --priority High --due 2025-06-01
+    python -m dailyflow plan --start 09:00 --end 17:30
+    python -m dailyflow list
+    python -m dailyflow stats
+    python -m dailyflow serve --root users/ --port 8765
+
+Uses the same storage (``DAILYFLOW_DATA`` or ``--data``) and planner as the
+app, so the window shows whatever the CLI changed. Nothing here imports
+tkinter, and each command imports only the modules it needs, so a cold
+start costs a few tens of milliseconds (see ``benchmarks/bench_cli.py``).
+"""
+
+import argparse
+import os
+import sys
+
+from .models import PRIORITY_SCORES, TaskStore, hhmm
+
+DEFAULT_DATA = "dailyflow_data.json"
+
+
+def _open(path, full=False):
+    """Open the storage; load every task if ``full`` or if it cannot query without."""
+    from .storage import open_storage
+
+    storage = open_storage(path)
+    if full or not storage.indexed:
+        storage.load()
+    return storage
+
+
+def _slot_text(t):
+    if t.start_min is None:
+        return "-"
+    return f"{hhmm(t.start_min)}–{hhmm(t.end_min)}"
+
+
+def _task_line(t):
+    due = f"  due {t.due_date}" if t.due_date else ""
+    return f"{t.id:>5}  {t.title}  [{t.category}]  ({t.priority}, {t.duration_minutes}m){due}"
+
+
+# ---------------- COMMANDS ----------------
+
+
+def cmd_add(args):
+    from datetime import date
+
+    if args.due is not None:
+        try:
+            date.fromisoformat(args.due)
+        except ValueError:
+            raise ValueError("Due date must be YYYY-MM-DD.") from None
+    if args.duration <= 0:
+        raise ValueError("Duration must be a positive number of minutes.")
+
+    # Checking --after needs every task and link.
+    storage = _open(args.data, full=bool(args.after))
+    try:
+        if storage.indexed and not args.after:
+            # Indexed backends are not loaded; ask them for the next id.
+            storage.tasks.next_id = storage.next_id()
+        missing = [i for i in args.after if i not in storage.tasks]
+        if missing:
+            raise ValueError(f"No task {', '.join(map(str, missing))}.")
+        task = storage.tasks.create(
+            args.title, args.category, args.due, args.duration, args.priority
+        )
+        storage.add(task)
+        if args.after:
+            # A new task cannot close a cycle.
+            storage.set_prerequisites(task.id, args.after)
+    finally:
+        storage.close()
+    print(f"Added task {task.id}: {task.title}")
+
+
+def cmd_list(args):
+    storage = _open(args.data, full=args.all)
+    try:
+        tasks = list(storage.tasks) if args.all else storage.pending()
+    finally:
+        storage.close()
+    if args.category:
+        tasks = [t for t in tasks if t.category == args.category]
+    for t in tasks:
+        status = "done" if t.completed else _slot_text(t)
+        print(f"{_task_line(t)}  {status}")
+    if not tasks:
+        print("No tasks.")
+
+
+def cmd_plan(args):
+    from datetime import date
+
+    from .planner import apply_plan, parse_time
+    from .recurrence import PlanningView, expand, record_schedule
+
+    start, end = parse_time(args.start), parse_time(args.end)
+    if start is None or end is None:
+        raise ValueError("Start/End time must be in HH:MM format.")
+
+    busy = None
+    if args.ics or args.busy:
+        from .busy import BusyCalendar, load_ics, parse_weekly, weekly_blocks
+
+        busy = BusyCalendar()
+        blocks = load_ics(args.ics, date.today(), args.days) if args.ics else []
+        for spec in args.busy:
+            blocks += weekly_blocks(date.today(), args.days, *parse_weekly(spec))
+        for start_min, end_min in blocks:
+            busy.add(start_min, end_min)
+
+    storage = _open(args.data, full=True)
+    estimator = storage.history.estimator if args.learned else None
+    # Recurring tasks only exist as occurrences of the days being planned.
+    first = date.today()
+    occurrences = expand(
+        storage.templates.values(), first, date.fromordinal(first.toordinal() + args.days - 1)
+    )
+    tasks = PlanningView(storage.tasks, TaskStore(occurrences))
+    try:
+        if args.days > 1:
+            from .horizon import plan_horizon
+
+            plan = plan_horizon(
+                tasks,
+                args.days,
+                start,
+                end,
+                busy=busy,
+                dependencies=storage.dependencies,
+                estimator=estimator,
+            )
+        else:
+            from .planner import plan_day
+
+            plan = plan_day(
+                tasks,
+                start,
+                end,
+                strategy=args.strategy,
+                busy=busy,
+                dependencies=storage.dependencies,
+                estimator=estimator,
+            )
+        apply_plan(tasks, plan)
+        record_schedule(storage, [t for t in tasks if not t.completed])
+    finally:
+        storage.close()
+
+    day = None
+    for slot in plan.slots:
+        if slot.start.date() != day:
+            day = slot.start.date()
+            print(day.strftime("%a %d %b %Y"))
+        t = tasks.get(slot.task_id)
+        print(f"  {slot.start:%H:%M}–{slot.end:%H:%M}  {t.title}  [{t.category}]  ({t.priority})")
+    if not plan.slots:
+        print("Nothing scheduled.")
+    if plan.unscheduled:
+        print(f"{len(plan.unscheduled)} task(s) did not fit.")
+
+
+def cmd_stats(args):
+    from .history import report
+
+    storage = _open(args.data)
+    try:
+        if storage.indexed:
+            storage.history.load()  # not loaded with the tasks
+        print("\n".join(report(storage.history.rollups, weeks=args.weeks)))
+    finally:
+        storage.close()
+
+
+def cmd_serve(args):
+    import asyncio
+
+    from .server import serve
+
+    try:
+        asyncio.run(
+            serve(args.root, args.host, args.port, capacity=args.pool, sqlite=args.sqlite)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+# ---------------- ENTRY POINT ----------------
+
+
+def _positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="dailyflow", description="DailyFlow day planner.")
+    parser.add_argument(
+        "--data",
+        default=os.environ.get("DAILYFLOW_DATA", DEFAULT_DATA),
+        help="data file (*.db for SQLite); default $DAILYFLOW_DATA or %(default)s",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="add a task")
+    p.add_argument("title")
+    p.add_argument("--category", default="General")
+    p.add_argument("--priority", choices=tuple(PRIORITY_SCORES), default="Medium")
+    p.add_argument("--due", metavar="YYYY-MM-DD")
+    p.add_argument("--duration", type=int, default=60, metavar="MINUTES")
+    p.add_argument(
+        "--after", type=int, nargs="+", default=[], metavar="ID", help="tasks this one waits for"
+    )
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("list", help="list pending tasks")
+    p.add_argument("--all", action="store_true", help="include completed tasks")
+    p.add_argument("--category")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("plan", help="plan today (or the next --days days)")
+    p.add_argument("--start", default="08:00", metavar="HH:MM")
+    p.add_argument("--end", default="22:00", metavar="HH:MM")
+    p.add_argument("--strategy", choices=("greedy", "optimal"), default="greedy")
+    p.add_argument("--days", type=_positive_int, default=1)
+    p.add_argument("--ics", metavar="FILE", help="avoid the events in this calendar")
+    p.add_argument(
+        "--busy",
+        action="append",
+        default=[],
+        metavar="'HH:MM-HH:MM [DAYS]'",
+        help="avoid a routine, e.g. '12:00-13:00 mon-fri' (repeatable)",
+    )
+    p.add_argument(
+        "--learned", action="store_true", help="book durations learned from focused work"
+    )
+    p.set_defaults(func=cmd_plan)
+
+    p = sub.add_parser("stats", help="completed tasks per day and week")
+    p.add_argument("--weeks", type=int, default=12)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("serve", help="serve many users' tasks over a local HTTP API")
+    p.add_argument("--root", default="dailyflow_users", help="one data file per user in here")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--pool", type=int, default=128, help="users kept open at once")
+    p.add_argument("--sqlite", action="store_true", help="store users in SQLite files")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
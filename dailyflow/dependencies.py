@@ -0,0 +1,204 @@
+"""Prerequisite links between tasks.
+
+The links are a plain dict, ``{task_id: (prerequisite ids...)}``, kept by
+the storage next to the tasks. A task may only be slotted after every one
+of its pending prerequisites has ended; completed or deleted prerequisites
+no longer block anything.
+
+:func:`order_pending` turns the backlog and the links into a planning
+order in O(V + E) plus the sort the planners already do:
+
+* a Kahn pass over the pending tasks gives a topological order (or a
+  :class:`CycleError` naming the loop);
+* walking that order backwards propagates urgency to blockers: a task's
+  effective score is the highest score of anything it (transitively)
+  blocks, and it remembers the longest chain of work still waiting on
+  it - the critical path - to break ties;
+* list scheduling then emits the ready task with the best effective
+  score, so the result is topological and otherwise as close to plain
+  score order as possible. Without links it is exactly ``rank_pending``.
+"""
+
+from collections import namedtuple
+from heapq import heapify, heappop, heappush
+
+from .planner import rank_pending
+
+# tasks/scores: the planning order and each task's effective score;
+# prerequisites: task id -> ids of its pending prerequisites (only tasks
+# that have some); deadlines: task id -> due ordinal, for tasks whose due
+# date was pulled earlier by a task they block.
+Ordered = namedtuple("Ordered", "tasks scores prerequisites deadlines")
+
+
+class CycleError(ValueError):
+    """The links contain a loop; ``chain`` lists it, each task a
+    prerequisite of the next and the first repeated at the end."""
+
+    def __init__(self, chain):
+        self.chain = chain
+        super().__init__("Dependency cycle: " + " -> ".join(map(str, chain)))
+
+
+def find_cycle(dependencies, task_id, prerequisite_ids):
+    """The cycle that making ``task_id`` wait for ``prerequisite_ids`` would
+    close (as a chain, see :class:`CycleError`), or None."""
+    # A cycle exists iff task_id is already a transitive prerequisite of
+    # one of the new prerequisites.
+    parent = {}
+    stack = []
+    for p in prerequisite_ids:
+        if p == task_id:
+            return [task_id, task_id]
+        if p not in parent:
+            parent[p] = None
+            stack.append(p)
+    while stack:
+        node = stack.pop()
+        for p in dependencies.get(node, ()):
+            if p in parent:
+                continue
+            parent[p] = node
+            if p == task_id:
+                chain = [task_id]
+                while node is not None:
+                    chain.append(node)
+                    node = parent[node]
+                chain.append(task_id)
+                return chain
+            stack.append(p)
+    return None
+
+
+def set_prerequisites(dependencies, task_id, prerequisite_ids):
+    """Make ``task_id`` wait for ``prerequisite_ids`` (replacing its old
+    ones). Raises CycleError, leaving ``dependencies`` unchanged, if that
+    would create a loop."""
+    ids = tuple(dict.fromkeys(prerequisite_ids))
+    if ids:
+        chain = find_cycle(dependencies, task_id, ids)
+        if chain is not None:
+            raise CycleError(chain)
+        dependencies[task_id] = ids
+    else:
+        dependencies.pop(task_id, None)
+    return ids
+
+
+def set_prerequisites_many(dependencies, task_ids, prerequisite_ids):
+    """:func:`set_prerequisites` for several tasks, all or nothing.
+
+    Returns ``{task_id: ids}`` for the tasks whose links changed. Raises
+    CycleError, leaving ``dependencies`` unchanged, if any of them would
+    create a loop (including one through another task of the batch).
+    """
+    trial = dict(dependencies)
+    changed = {}
+    for task_id in task_ids:
+        old = trial.get(task_id, ())
+        new = set_prerequisites(trial, task_id, prerequisite_ids)
+        if new != old:
+            changed[task_id] = new
+    for task_id, ids in changed.items():
+        if ids:
+            dependencies[task_id] = ids
+        else:
+            dependencies.pop(task_id, None)
+    return changed
+
+
+def order_pending(tasks, day, dependencies, vectorized=False, cache=None):
+    """Pending tasks in a planning order that respects ``dependencies``.
+
+    Arguments as for :func:`~dailyflow.planner.rank_pending`; returns an
+    :class:`Ordered`. Raises CycleError if the pending tasks' links loop.
+    """
+    ranked, scores = rank_pending(tasks, day, vectorized, cache)
+    n = len(ranked)
+    pos = {t.id: i for i, t in enumerate(ranked)}
+
+    # Links between pending tasks only; children by rank position.
+    prerequisites = {}
+    children = [[] for _ in range(n)]
+    indegree = [0] * n
+    get = pos.get
+    for task_id, prereqs in dependencies.items():
+        i = get(task_id)
+        if i is None:
+            continue
+        found = [p for p in prereqs if p in pos]
+        if found:
+            prerequisites[task_id] = found
+            indegree[i] = len(found)
+            for p in found:
+                children[pos[p]].append(i)
+    if not prerequisites:
+        return Ordered(ranked, scores, {}, {})
+
+    # Kahn: a topological order, or a cycle among the leftovers.
+    remaining = indegree[:]
+    topo = [i for i in range(n) if not remaining[i]]
+    for i in topo:  # grows while iterating
+        for c in children[i]:
+            remaining[c] -= 1
+            if not remaining[c]:
+                topo.append(c)
+    if len(topo) < n:
+        stuck = {ranked[i].id for i in range(n) if remaining[i]}
+        raise CycleError(_cycle(stuck, prerequisites))
+
+    # Backwards: effective score, pulled-in due date, work left behind each task.
+    effective = list(scores)
+    due = [t.due_ordinal for t in ranked]
+    deadlines = {}
+    tail = [0] * n  # minutes of the longest chain of dependents
+    for i in reversed(topo):
+        best = effective[i]
+        d = due[i]
+        longest = 0
+        for c in children[i]:
+            if effective[c] > best:
+                best = effective[c]
+            dc = due[c]
+            if dc is not None and (d is None or dc < d):
+                d = dc
+            chain = ranked[c].duration_minutes + tail[c]
+            if chain > longest:
+                longest = chain
+        effective[i] = best
+        if d != due[i]:
+            due[i] = d
+            deadlines[ranked[i].id] = d
+        tail[i] = longest
+
+    # List scheduling: best effective score first, then the longest tail,
+    # then the plain rank (so unlinked tasks keep rank_pending's order).
+    heap = [(-effective[i], -tail[i], i) for i in range(n) if not indegree[i]]
+    heapify(heap)
+    order = []
+    while heap:
+        i = heappop(heap)[2]
+        order.append(i)
+        for c in children[i]:
+            indegree[c] -= 1
+            if not indegree[c]:
+                heappush(heap, (-effective[c], -tail[c], c))
+
+    return Ordered(
+        [ranked[i] for i in order], [effective[i] for i in order], prerequisites, deadlines
+    )
+
+
+def _cycle(stuck, prerequisites):
+    # Every task Kahn could not reach waits on another such task, so
+    # following those links from any of them must come back round.
+    seen = {}
+    path = []
+    task_id = next(iter(stuck))
+    while task_id not in seen:
+        seen[task_id] = len(path)
+        path.append(task_id)
+        task_id = next(p for p in prerequisites[task_id] if p in stuck)
+    loop = path[seen[task_id] :]
+    loop.reverse()  # prerequisite first
+    return loop + [loop[0]]
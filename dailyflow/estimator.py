@@ -0,0 +1,127 @@
+"""Learned corrections for the durations users estimate.
+
+Each focused completion (see :mod:`dailyflow.history`) gives one
+observation: the task took ``actual`` minutes where the user said
+``duration_minutes``. :class:`DurationEstimator` keeps, per category and
+per title prefix (the first word of the title, lowercased), a running
+mean of ``log(actual / estimated)`` - two numbers per key, updated in O(1)
+as each completion comes in and never refit over the history. The mean
+starts as a plain average and becomes an exponentially weighted one
+after ``1 / ALPHA`` observations, so habits that change are followed.
+
+The correction for a task blends the two: the prefix where it has data,
+the category otherwise, each shrunk towards "no correction" while it has
+few observations. :meth:`DurationEstimator.minutes` is what the planners
+call when asked to plan with learned durations.
+"""
+
+import re
+from math import exp, log
+
+# Weight of the newest observation once a key has 1 / ALPHA of them.
+ALPHA = 0.1
+# Observations a key needs before its correction counts half.
+PRIOR = 3
+# Ratios outside this range are clipped (a forgotten focus session etc.).
+MIN_RATIO, MAX_RATIO = 0.25, 4.0
+# Corrected durations are rounded to this many minutes.
+ROUND_TO = 5
+
+_WORD = re.compile(r"\w+")
+
+
+def title_prefix(title):
+    m = _WORD.search(title)
+    return m.group().lower() if m else ""
+
+
+class _Mean:
+    __slots__ = ("n", "mean")
+
+    def __init__(self, n=0, mean=0.0):
+        self.n = n
+        self.mean = mean
+
+    def add(self, x):
+        self.n += 1
+        self.mean += (x - self.mean) * max(1.0 / self.n, ALPHA)
+
+    def weight(self):
+        return self.n / (self.n + PRIOR)
+
+
+class DurationEstimator:
+    def __init__(self):
+        self.categories = {}  # category -> _Mean of log ratios
+        self.prefixes = {}  # title prefix -> _Mean of log ratios
+        self.observations = 0
+
+    def __len__(self):
+        return len(self.categories) + len(self.prefixes)
+
+    # ---------------- LEARNING ----------------
+
+    def observe(self, category, title, estimated, actual):
+        """Learn from one task that took ``actual`` minutes instead of ``estimated``."""
+        if not estimated or estimated <= 0 or actual <= 0:
+            return
+        x = log(min(MAX_RATIO, max(MIN_RATIO, actual / estimated)))
+        for table, key in ((self.categories, category), (self.prefixes, title_prefix(title))):
+            m = table.get(key)
+            if m is None:
+                m = table[key] = _Mean()
+            m.add(x)
+        self.observations += 1
+
+    def add(self, c):
+        """Learn from a :class:`~dailyflow.history.Completion`, if it was timed."""
+        if c.actual_start is None:
+            return
+        estimated = c.duration_minutes
+        if estimated is None and c.planned_start is not None:
+            estimated = c.planned_end - c.planned_start
+        self.observe(c.category, c.title, estimated, c.actual_end - c.actual_start)
+
+    # ---------------- PREDICTION ----------------
+
+    def factor(self, category, title):
+        """Multiplier for a task's estimate (1.0 when nothing is known)."""
+        x = 0.0
+        rest = 1.0
+        m = self.prefixes.get(title_prefix(title))
+        if m is not None:
+            w = m.weight()
+            x += w * m.mean
+            rest -= w
+        m = self.categories.get(category)
+        if m is not None:
+            x += rest * m.weight() * m.mean
+        return exp(x)
+
+    def minutes(self, task):
+        """``task.duration_minutes`` corrected, rounded to ROUND_TO minutes."""
+        d = task.duration_minutes
+        if not self.observations:
+            return d
+        f = self.factor(task.category, task.title)
+        if f == 1.0:
+            return d
+        corrected = d * f
+        return max(ROUND_TO, int(round(corrected / ROUND_TO)) * ROUND_TO)
+
+    # ---------------- SERIALIZATION ----------------
+
+    def to_dict(self):
+        return {
+            "observations": self.observations,
+            "categories": {k: [m.n, m.mean] for k, m in self.categories.items()},
+            "prefixes": {k: [m.n, m.mean] for k, m in self.prefixes.items()},
+        }
+
+    @staticmethod
+    def from_dict(d):
+        e = DurationEstimator()
+        e.observations = d.get("observations", 0)
+        e.categories = {k: _Mean(n, mean) for k, (n, mean) in d.get("categories", {}).items()}
+        e.prefixes = {k: _Mean(n, mean) for k, (n, mean) in d.get("prefixes", {}).items()}
+        return e
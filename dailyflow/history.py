@@ -0,0 +1,411 @@
+"""Completion history and time-bucketed rollups.
+
+Every task marked done appends a :class:`Completion` to an append-only
+log next to the data file (``<data>.history``, one JSON object per line):
+what it was, when it was planned and when it was actually worked on. The
+log is never rewritten; undoing or deleting a task does not erase it.
+
+:class:`Rollups` keeps per-day and per-week :class:`Bucket` totals of the
+log, updated in O(1) per completion, so a dashboard over a year reads
+about 60 buckets instead of every event. The rollups are snapshotted with
+the log offset they cover (``<data>.history.rollups``) whenever the data
+file is compacted and on close; loading reads the snapshot and replays
+only the lines written after it.
+
+Times are epoch minutes like ``Task.start_min``. ``actual_start`` is when
+the task was put in Focus Mode, or None if that was never done;
+``duration_minutes`` is the user's estimate at the time. Timed
+completions also train the log's
+:class:`~dailyflow.estimator.DurationEstimator`, which is snapshotted and
+replayed along with the rollups.
+"""
+
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import date, datetime
+
+from .estimator import DurationEstimator
+from .models import EPOCH_ORDINAL, MINUTES_PER_DAY, to_minutes
+
+_DUMP = json.JSONEncoder(separators=(",", ":")).encode
+
+# Bumped whenever Bucket totals change meaning; older snapshots are rebuilt.
+ROLLUP_VERSION = 2
+
+Completion = namedtuple(
+    "Completion",
+    "task_id title category priority planned_start planned_end actual_start actual_end "
+    "duration_minutes",
+    defaults=(None,),
+)
+
+
+def now_minutes():
+    return to_minutes(datetime.now())
+
+
+def completion(task, now=None, started=None):
+    """The Completion of ``task`` finished at ``now`` (epoch minutes, default
+    the current minute).
+
+    Call it before the task's slot is cleared. ``started`` is when work on
+    it began, if known.
+    """
+    if now is None:
+        now = now_minutes()
+    return Completion(
+        task.id,
+        task.title,
+        task.category,
+        task.priority,
+        task.start_min,
+        task.end_min,
+        started,
+        now,
+        task.duration_minutes,
+    )
+
+
+def day_of(minute):
+    """Date ordinal of an epoch-minute timestamp."""
+    return minute // MINUTES_PER_DAY + EPOCH_ORDINAL
+
+
+def week_of(ordinal):
+    """Ordinal of the Monday starting the week of ``ordinal``."""
+    return ordinal - (ordinal - 1) % 7
+
+
+class Bucket:
+    """Totals over the completions of one day or week.
+
+    ``planned``: tasks done that had a slot, of which ``on_time`` finished
+    by its end; ``timed``: tasks with both a slot and a known start, which
+    took ``actual_minutes`` against ``estimated_minutes`` planned for them;
+    ``categories``: category -> tasks done.
+    """
+
+    __slots__ = (
+        "count",
+        "planned",
+        "on_time",
+        "timed",
+        "actual_minutes",
+        "estimated_minutes",
+        "categories",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.planned = 0
+        self.on_time = 0
+        self.timed = 0
+        self.actual_minutes = 0
+        self.estimated_minutes = 0
+        self.categories = {}
+
+    def add(self, c):
+        self.count += 1
+        if c.planned_end is not None:
+            self.planned += 1
+            if c.actual_end <= c.planned_end:
+                self.on_time += 1
+        if c.actual_start is not None and c.planned_start is not None:
+            self.timed += 1
+            self.actual_minutes += c.actual_end - c.actual_start
+            self.estimated_minutes += c.planned_end - c.planned_start
+        self.categories[c.category] = self.categories.get(c.category, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.planned += other.planned
+        self.on_time += other.on_time
+        self.timed += other.timed
+        self.actual_minutes += other.actual_minutes
+        self.estimated_minutes += other.estimated_minutes
+        for category, n in other.categories.items():
+            self.categories[category] = self.categories.get(category, 0) + n
+        return self
+
+    def to_list(self):
+        return [
+            self.count,
+            self.planned,
+            self.on_time,
+            self.timed,
+            self.actual_minutes,
+            self.estimated_minutes,
+            dict(self.categories),
+        ]
+
+    @staticmethod
+    def from_list(values):
+        b = Bucket()
+        (
+            b.count,
+            b.planned,
+            b.on_time,
+            b.timed,
+            b.actual_minutes,
+            b.estimated_minutes,
+            b.categories,
+        ) = values
+        return b
+
+
+class Rollups:
+    def __init__(self):
+        self.days = {}  # date ordinal -> Bucket
+        self.weeks = {}  # Monday's ordinal -> Bucket
+
+    def add(self, c):
+        day = day_of(c.actual_end)
+        bucket = self.days.get(day)
+        if bucket is None:
+            bucket = self.days[day] = Bucket()
+        bucket.add(c)
+        week = week_of(day)
+        bucket = self.weeks.get(week)
+        if bucket is None:
+            bucket = self.weeks[week] = Bucket()
+        bucket.add(c)
+
+    def daily(self, first, last):
+        """``[(date, Bucket)]`` for every day from ``first`` to ``last``."""
+        empty = Bucket()
+        return [
+            (date.fromordinal(o), self.days.get(o, empty))
+            for o in range(first.toordinal(), last.toordinal() + 1)
+        ]
+
+    def weekly(self, first, last):
+        """``[(Monday, Bucket)]`` for every week touching ``first``..``last``."""
+        empty = Bucket()
+        return [
+            (date.fromordinal(o), self.weeks.get(o, empty))
+            for o in range(week_of(first.toordinal()), last.toordinal() + 1, 7)
+        ]
+
+    def total(self, first, last):
+        """One Bucket for ``first``..``last``: whole weeks, days at the edges."""
+        lo, hi = first.toordinal(), last.toordinal()
+        out = Bucket()
+        o = lo
+        while o <= hi:
+            if week_of(o) == o and o + 6 <= hi:
+                bucket = self.weeks.get(o)
+                o += 7
+            else:
+                bucket = self.days.get(o)
+                o += 1
+            if bucket is not None:
+                out.merge(bucket)
+        return out
+
+    def to_dict(self):
+        return {"days": [[o, b.to_list()] for o, b in sorted(self.days.items())]}
+
+    @staticmethod
+    def from_dict(d):
+        r = Rollups()
+        for o, values in d["days"]:
+            bucket = r.days[o] = Bucket.from_list(values)
+            week = r.weeks.get(week_of(o))
+            if week is None:
+                week = r.weeks[week_of(o)] = Bucket()
+            week.merge(bucket)
+        return r
+
+
+def report(rollups, today=None, weeks=12):
+    """Text lines summarizing the last 7 days and ``weeks`` weeks."""
+    if today is None:
+        today = date.today()
+    week_start = date.fromordinal(week_of(today.toordinal()))
+    this_week = rollups.total(week_start, today)
+    last_week = rollups.total(
+        date.fromordinal(week_start.toordinal() - 7), date.fromordinal(week_start.toordinal() - 1)
+    )
+    lines = [f"This week: {this_week.count} done (last week {last_week.count})"]
+    if this_week.planned:
+        lines.append(f"On time: {this_week.on_time / this_week.planned:.0%} of planned tasks")
+    if this_week.timed and this_week.estimated_minutes:
+        ratio = this_week.actual_minutes / this_week.estimated_minutes
+        lines.append(f"Focused tasks took {ratio:.0%} of their planned time")
+    if this_week.categories:
+        top = sorted(this_week.categories.items(), key=lambda kv: -kv[1])[:3]
+        lines.append("Top: " + ", ".join(f"{c} {n}" for c, n in top))
+
+    lines.append("")
+    first = date.fromordinal(today.toordinal() - 6)
+    for day, bucket in rollups.daily(first, today):
+        lines.append(f"{day:%a %d %b}  {'■' * min(bucket.count, 30)} {bucket.count}")
+
+    lines.append("")
+    first = date.fromordinal(week_start.toordinal() - 7 * (weeks - 1))
+    year = rollups.total(date.fromordinal(today.toordinal() - 364), today)
+    lines.append(f"Last {weeks} weeks (past year: {year.count} done)")
+    for monday, bucket in rollups.weekly(first, today):
+        lines.append(f"{monday:%d %b}  {'■' * min(bucket.count // 2, 30)} {bucket.count}")
+    return lines
+
+
+def _complete_size(f):
+    # Length of the file open as ``f`` up to the end of its last full line.
+    end = f.seek(0, os.SEEK_END)
+    pos = end
+    while pos:
+        step = min(pos, 4096)
+        f.seek(pos - step)
+        chunk = f.read(step)
+        i = chunk.rfind(b"\n")
+        if i >= 0:
+            return pos - step + i + 1
+        pos -= step
+    return 0
+
+
+class CompletionLog:
+    """The append-only log at ``path`` plus its rollups and duration estimator.
+
+    Files are only created once something is recorded. :meth:`record`
+    buffers; :meth:`flush` writes and fsyncs, :meth:`snapshot` also saves
+    the rollups. Storage backends call these from their own
+    flush/compact/close, so the log is saved along with the tasks.
+
+    Until :meth:`load` has succeeded the rollups only cover what was
+    recorded since, so :meth:`snapshot` saves no rollups and writes go to
+    the end of the log as found on disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rollup_path = path + ".rollups"
+        self.rollups = Rollups()
+        self.estimator = DurationEstimator()
+        self._pending = []
+        self._size = None  # bytes of complete lines in the log, once known
+        self._loaded = False  # self.rollups cover the log's first _size bytes
+        # record() runs on the UI thread, flush()/snapshot() maybe on a
+        # saver; self.lock guards the buffer and rollups, _io_lock the files.
+        self.lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+    def load(self):
+        """Read the rollup snapshot, then replay the log lines after it."""
+        rollups, estimator, offset = Rollups(), DurationEstimator(), 0
+        if os.path.exists(self.rollup_path):
+            with open(self.rollup_path, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if snap.get("version") == ROLLUP_VERSION and snap["offset"] <= size:
+                rollups, offset = Rollups.from_dict(snap["rollups"]), snap["offset"]
+                estimator = DurationEstimator.from_dict(snap.get("estimator", {}))
+        for c, offset in self._read(offset):
+            rollups.add(c)
+            estimator.add(c)
+        self.rollups = rollups
+        self.estimator = estimator
+        self._size = offset
+        self._loaded = True
+
+    def _read(self, offset=0):
+        # (completion, offset just past its line)
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn final write; the next flush overwrites it
+                offset += len(line)
+                d = json.loads(line)
+                c = Completion(
+                    d["id"],
+                    d["title"],
+                    d["category"],
+                    d.get("priority"),
+                    d.get("planned_start"),
+                    d.get("planned_end"),
+                    d.get("actual_start"),
+                    d["actual_end"],
+                    d.get("duration_minutes"),
+                )
+                yield c, offset
+
+    def __iter__(self):
+        """Every completion saved in the log, oldest first."""
+        return (c for c, _ in self._read())
+
+    def record(self, completions):
+        lines = []
+        for c in completions:
+            d = {
+                "id": c.task_id,
+                "title": c.title,
+                "category": c.category,
+                "priority": c.priority,
+                "actual_end": c.actual_end,
+                "duration_minutes": c.duration_minutes,
+            }
+            # Only the times that are known.
+            if c.planned_start is not None:
+                d["planned_start"] = c.planned_start
+                d["planned_end"] = c.planned_end
+            if c.actual_start is not None:
+                d["actual_start"] = c.actual_start
+            lines.append(_DUMP(d).encode("utf-8") + b"\n")
+        with self.lock:
+            for c in completions:
+                self.rollups.add(c)
+                self.estimator.add(c)
+            self._pending.extend(lines)
+
+    def flush(self):
+        with self._io_lock:
+            with self.lock:
+                lines, self._pending = self._pending, []
+            self._write(lines)
+
+    def _write(self, lines):
+        if not lines:
+            return
+        with open(self.path, "ab+") as f:
+            if self._size is None:
+                self._size = _complete_size(f)
+            if f.seek(0, os.SEEK_END) != self._size:
+                f.truncate(self._size)  # drop a torn tail
+            data = b"".join(lines)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._size += len(data)
+
+    def snapshot(self):
+        """Flush, then save the rollups so loading can skip the log so far."""
+        with self._io_lock:
+            with self.lock:
+                # The rollups cover exactly the log once these lines are out.
+                lines, self._pending = self._pending, []
+                rollups = self.rollups.to_dict()
+                estimator = self.estimator.to_dict()
+            self._write(lines)
+            if not self._loaded or not self._size:
+                return
+            tmp = self.rollup_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(
+                    _DUMP(
+                        {
+                            "version": ROLLUP_VERSION,
+                            "offset": self._size,
+                            "rollups": rollups,
+                            "estimator": estimator,
+                        }
+                    )
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.rollup_path)
@@ -0,0 +1,125 @@
+"""Multi-day planning: spread the backlog over the next N days.
+
+Tasks are scored and sorted once (against the first day) and then placed
+one by one into the earliest day that still has room before the task's
+due date, using :class:`~dailyflow.slots.FreeSlots` for the first-fit
+lookup. That is O(n log n + n log days) overall, instead of re-sorting and
+re-planning the backlog once per day.
+
+Occurrences of recurring tasks (``Task.not_before`` set) are only placed
+on or after their own day. With ``dependencies`` the order comes from
+:func:`~dailyflow.dependencies.order_pending` and each task goes after its
+prerequisites' slots, no later than the due date of anything it blocks.
+"""
+
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from .busy import free_windows
+from .models import EPOCH_ORDINAL, MINUTES_PER_DAY, from_minutes, to_minutes
+from .planner import Plan, Slot, duration_of, rank_pending
+from .slots import FreeSlots
+
+
+class HorizonPlan(namedtuple("HorizonPlan", "first_day days unscheduled")):
+    """first_day: date; days: one Plan per day (each with empty
+    ``unscheduled``); unscheduled: ids of pending tasks that fit nowhere,
+    highest score first.
+    """
+
+    __slots__ = ()
+
+    @property
+    def slots(self):
+        """Every slot over the horizon, in time order (works with apply_plan)."""
+        return tuple(s for p in self.days for s in p.slots)
+
+
+def plan_horizon(
+    tasks,
+    days,
+    start,
+    end,
+    first_day=None,
+    windows=None,
+    vectorized=False,
+    busy=None,
+    cache=None,
+    dependencies=None,
+    estimator=None,
+):
+    """Schedule pending tasks over ``days`` consecutive days.
+
+    Every day uses the ``start``-``end`` window unless ``windows`` maps its
+    date to another ``(start, end)`` pair of times, or to None for a day
+    off. A task is never placed after its due date; overdue tasks may only
+    go on the first day. ``busy`` (a :class:`~dailyflow.busy.BusyCalendar`)
+    carves meetings and other fixed blocks out of the windows; ``cache`` is
+    an optional :class:`~dailyflow.models.ScoreCache`. ``dependencies``
+    (``{task_id: prerequisite ids}``) orders tasks after their pending
+    prerequisites, as in :func:`~dailyflow.planner.plan_day`, and
+    ``estimator`` books learned durations, also as there.
+    """
+    if first_day is None:
+        first_day = date.today()
+    if days < 1:
+        raise ValueError("The horizon must span at least one day.")
+    windows = windows or {}
+
+    dates = [first_day + timedelta(days=i) for i in range(days)]
+    spans = []
+    for d in dates:
+        window = windows.get(d, (start, end))
+        if window is None:
+            continue
+        s = to_minutes(datetime.combine(d, window[0]))
+        e = to_minutes(datetime.combine(d, window[1]))
+        if s >= e:
+            raise ValueError(f"Start time must be before end time ({d.isoformat()}).")
+        spans.append((s, e))
+    free = FreeSlots(free_windows(busy, spans))
+
+    first_ordinal = first_day.toordinal()
+    placed = {d: [] for d in dates}
+    unscheduled = []
+    prereqs = deadlines = {}
+    if dependencies:
+        from .dependencies import order_pending
+
+        ordered, _scores, prereqs, deadlines = order_pending(
+            tasks, first_day, dependencies, vectorized, cache
+        )
+    else:
+        ordered, _scores = rank_pending(tasks, first_day, vectorized, cache)
+    length = duration_of(estimator)
+    ends = {}  # with prereqs: id -> end minute of each placed task
+    for t in ordered:
+        deadline = None
+        due = deadlines.get(t.id, t.due_ordinal)
+        if due is not None:
+            # end of the due day; overdue tasks get the first day only
+            due = max(due, first_ordinal)
+            deadline = (due + 1 - EPOCH_ORDINAL) * MINUTES_PER_DAY
+        earliest = None
+        if t.not_before is not None:
+            earliest = (t.not_before - EPOCH_ORDINAL) * MINUTES_PER_DAY
+        span = None
+        if t.id in prereqs:
+            after = free.earliest_after(ends, prereqs[t.id])
+            if after != -1:
+                earliest = after if earliest is None else max(earliest, after)
+                span = free.place(length(t), deadline, earliest)
+        else:
+            span = free.place(length(t), deadline, earliest)
+        if span is None:
+            unscheduled.append(t.id)
+            continue
+        if prereqs:
+            ends[t.id] = span[1]
+        slot = Slot(t.id, from_minutes(span[0]), from_minutes(span[1]))
+        placed[slot.start.date()].append(slot)
+
+    plans = tuple(
+        Plan(d, tuple(sorted(placed[d], key=lambda s: s.start)), ()) for d in dates
+    )
+    return HorizonPlan(first_day, plans, tuple(unscheduled))
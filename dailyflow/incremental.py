@@ -0,0 +1,277 @@
+"""Incremental re-planning for single-task and bulk changes.
+
+:class:`IncrementalPlanner` produces exactly the greedy plan of
+:func:`dailyflow.planner.plan_day`, but keeps it up to date as tasks are
+added, edited, completed or deleted instead of re-sorting and re-laying out
+everything. It keeps two persistent structures:
+
+* the score-ordered queue, a sorted list of ``(-score, seq, task_id)`` keys
+  (ties keep insertion order, like the stable sort in ``plan_day``; a task
+  keeps its seq when it is re-ranked, so an edit never reorders a tie);
+* the timeline, the keys of the scheduled tasks - in the greedy layout key
+  order and time order coincide, so it doubles as an interval list.
+
+A change is located by bisection in O(log n), but inserting or deleting a
+key shifts the rest of the list, so an update costs O(n), not O(log n).
+The shift is a memmove of pointers: ``benchmarks/bench_incremental.py``
+measures a change at the very front of a 1M-task queue at about 0.5 ms.
+Re-layout starts at the changed position and stops as soon as the cursor
+is back where the old layout had it, since everything after that point
+is unchanged; a change that never falls back into step walks the rest of
+the queue. Each mutation returns a :class:`PlanDiff` naming the slots
+that moved.
+"""
+
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import date, datetime
+
+from .models import from_minutes, to_minutes
+from .planner import BREAK_MINUTES, Plan, Slot, duration_of
+
+# added: newly scheduled Slots; moved: Slots whose time changed;
+# removed: ids of tasks that lost their slot (or left the planner).
+PlanDiff = namedtuple("PlanDiff", "added moved removed")
+
+EMPTY_DIFF = PlanDiff((), (), ())
+
+
+class IncrementalPlanner:
+    def __init__(self, tasks, start, end, day=None, cache=None, estimator=None):
+        if day is None:
+            day = date.today()
+        self.day = day
+        self.cache = cache  # optional ScoreCache
+        # Booked length of a task, taken when it is queued (see plan_day).
+        self.length = duration_of(estimator)
+        self.start_min = to_minutes(datetime.combine(day, start))
+        self.end_min = to_minutes(datetime.combine(day, end))
+        if self.start_min >= self.end_min:
+            raise ValueError("Start time must be before end time.")
+
+        self._seq = 0
+        self._keys = []  # score-ordered queue
+        self._key_of = {}  # task_id -> key
+        self._seq_of = {}  # task_id -> seq, kept across re-ranking
+        self._duration = {}  # task_id -> minutes
+        self._timeline = []  # keys of scheduled tasks, in time order
+        self._slots = {}  # task_id -> (start_min, end_min)
+
+        for t in tasks:
+            if not t.completed:
+                key = self._new_key(t)
+                self._keys.append(key)
+        self._keys.sort()
+        self._relayout(0)
+
+    def _new_key(self, task):
+        seq = self._seq_of.get(task.id)
+        if seq is None:
+            self._seq += 1
+            seq = self._seq_of[task.id] = self._seq
+        if self.cache is None:
+            score = task.score_for_today(self.day)
+        else:
+            score = self.cache.score(task, self.day)
+        key = (-score, seq, task.id)
+        self._key_of[task.id] = key
+        self._duration[task.id] = self.length(task)
+        return key
+
+    # ---------------- QUERIES ----------------
+
+    def __contains__(self, task_id):
+        return task_id in self._key_of
+
+    def slot(self, task_id):
+        """The Slot of ``task_id``, or None if it is not scheduled."""
+        span = self._slots.get(task_id)
+        return None if span is None else self._make_slot(task_id, span)
+
+    def plan(self):
+        """Snapshot of the current plan."""
+        slots = tuple(self._make_slot(k[2], self._slots[k[2]]) for k in self._timeline)
+        unscheduled = tuple(k[2] for k in self._keys if k[2] not in self._slots)
+        return Plan(self.day, slots, unscheduled)
+
+    def _make_slot(self, task_id, span):
+        return Slot(task_id, from_minutes(span[0]), from_minutes(span[1]))
+
+    # ---------------- MUTATIONS ----------------
+
+    def add(self, task):
+        """Queue a new pending task (completed tasks are ignored)."""
+        if task.completed:
+            return EMPTY_DIFF
+        if task.id in self._key_of:
+            return self.update(task)
+        changes = {}
+        self._insert(task, changes)
+        return self._diff(changes)
+
+    def remove(self, task_id):
+        """Drop a task that was completed or deleted."""
+        changes = {}
+        self._remove(task_id, changes)
+        self._seq_of.pop(task_id, None)
+        return self._diff(changes)
+
+    def update(self, task):
+        """Re-rank a task after its priority/due date/duration changed."""
+        changes = {}
+        self._remove(task.id, changes)
+        if task.completed:
+            self._seq_of.pop(task.id, None)
+        else:
+            self._insert(task, changes)
+        return self._diff(changes)
+
+    def remove_many(self, task_ids):
+        """:meth:`remove` for several tasks, with one re-layout and one diff."""
+        task_ids = list(task_ids)
+        for task_id in task_ids:
+            self._seq_of.pop(task_id, None)
+        return self._batch(task_ids, ())
+
+    def update_many(self, tasks):
+        """:meth:`update` for several tasks, with one re-layout and one diff."""
+        for t in tasks:
+            if t.completed:
+                self._seq_of.pop(t.id, None)
+        return self._batch([t.id for t in tasks], [t for t in tasks if not t.completed])
+
+    def _batch(self, remove_ids, insert_tasks):
+        # Edit the queue first, then lay out the tail once from the earliest
+        # change (stopping early would miss the edits further down).
+        changes = {}
+        first = None
+        for task_id in remove_ids:
+            key = self._key_of.pop(task_id, None)
+            if key is None:
+                continue
+            pos = bisect_left(self._keys, key)
+            del self._keys[pos]
+            del self._duration[task_id]
+            span = self._slots.pop(task_id, None)
+            if span is not None:
+                changes.setdefault(task_id, span)
+                del self._timeline[bisect_left(self._timeline, key)]
+            first = pos if first is None else min(first, pos)
+        for task in insert_tasks:
+            key = self._new_key(task)
+            insort(self._keys, key)
+            changes.setdefault(task.id, None)
+            pos = bisect_left(self._keys, key)
+            first = pos if first is None else min(first, pos)
+        if first is not None:
+            self._relayout(first, changes)
+        return self._diff(changes)
+
+    def _insert(self, task, changes):
+        key = self._new_key(task)
+        insort(self._keys, key)
+        # The old layout had nothing here, so its cursor is the same.
+        self._relayout(bisect_left(self._keys, key), changes, self._cursor_before(key))
+
+    def _remove(self, task_id, changes):
+        key = self._key_of.pop(task_id, None)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        del self._keys[pos]
+        del self._duration[task_id]
+        span = self._slots.pop(task_id, None)
+        if span is None:
+            old_cursor = self._cursor_before(key)
+        else:
+            changes.setdefault(task_id, span)
+            del self._timeline[bisect_left(self._timeline, key)]
+            old_cursor = span[1] + BREAK_MINUTES
+        self._relayout(pos, changes, old_cursor)
+
+    # ---------------- LAYOUT ----------------
+
+    def _cursor_before(self, key):
+        """Where the greedy layout stands just before ``key``."""
+        i = bisect_left(self._timeline, key)
+        if i == 0:
+            return self.start_min
+        return self._slots[self._timeline[i - 1][2]][1] + BREAK_MINUTES
+
+    def _relayout(self, pos, changes=None, old_cursor=None):
+        """Re-run the greedy layout from queue position ``pos`` onwards.
+
+        ``changes`` collects task_id -> previous span (None if the task was
+        unscheduled) for every slot that is touched. ``old_cursor`` is where
+        the previous layout stood at ``pos``; once the new cursor matches
+        the old one the rest of the plan cannot change, so the walk stops.
+        Without it the whole tail is laid out.
+        """
+        keys = self._keys
+        if pos >= len(keys):
+            return
+        slots = self._slots
+        timeline = self._timeline
+        end = self.end_min
+        cursor = self._cursor_before(keys[pos])
+        stop_early = old_cursor is not None
+
+        for i in range(pos, len(keys)):
+            key = keys[i]
+            task_id = key[2]
+            old = slots.get(task_id)
+            if stop_early and cursor == old_cursor and i > pos:
+                break
+            if old is not None:
+                old_cursor = old[1] + BREAK_MINUTES
+
+            slot_end = cursor + self._duration[task_id]
+            if cursor < end and slot_end <= end:
+                new = (cursor, slot_end)
+                cursor = slot_end + BREAK_MINUTES
+            else:
+                new = None
+
+            if new == old:
+                continue
+            if changes is not None:
+                changes.setdefault(task_id, old)
+            if new is None:
+                del slots[task_id]
+                del timeline[bisect_left(timeline, key)]
+            else:
+                if old is None:
+                    insort(timeline, key)
+                slots[task_id] = new
+
+    def _diff(self, changes):
+        added, moved, removed = [], [], []
+        for task_id, old in changes.items():
+            new = self._slots.get(task_id)
+            if new == old:
+                continue
+            if new is None:
+                removed.append(task_id)
+            elif old is None:
+                added.append(self._make_slot(task_id, new))
+            else:
+                moved.append(self._make_slot(task_id, new))
+        return PlanDiff(tuple(added), tuple(moved), tuple(removed))
+
+
+def apply_diff(tasks, diff):
+    """Write ``diff`` onto the tasks in a TaskStore; return the tasks touched."""
+    touched = []
+    for slot in diff.added + diff.moved:
+        t = tasks.get(slot.task_id)
+        if t is not None:
+            t.start_min = to_minutes(slot.start)
+            t.end_min = to_minutes(slot.end)
+            touched.append(t)
+    for task_id in diff.removed:
+        t = tasks.get(task_id)
+        if t is not None:
+            t.start_min = None
+            t.end_min = None
+            touched.append(t)
+    return touched
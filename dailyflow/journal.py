@@ -0,0 +1,312 @@
+"""Append-only journaled persistence for tasks.
+
+State lives in these files next to each other:
+
+* ``<path>`` - a snapshot in the original ``{"tasks": [...]}`` format.
+* ``<path>.journal`` - one JSON record per line for every mutation made
+  since that snapshot (add / complete / delete / schedule / put; a bulk
+  put, complete or delete is one record listing every task; template /
+  template_delete for recurring-task templates; depends for the
+  prerequisites of one task).
+* ``<path>.history`` (+ ``.rollups``) - the completion log, see
+  :mod:`dailyflow.history`; appended on flush, never compacted.
+* ``<path>.journal.old`` - only while a compaction is running (or after
+  one was interrupted): the records the new snapshot is being built from.
+
+Mutations only append a short line, so their cost does not depend on how
+many tasks exist. Lines are buffered and written + fsync'd in small batches;
+once the journal grows past ``compact_every`` records it is folded into a
+fresh snapshot, written to a temp file and atomically renamed into place.
+
+Flushing and compaction may run on a background thread (see
+:mod:`dailyflow.autosave`) while the UI keeps recording mutations.
+Compaction first rotates the journal, so later records land in a fresh
+file, and then writes the snapshot from the task list taken at that
+moment. The tasks' fields are read afterwards, outside the lock, so the
+snapshot may already include edits recorded in the new journal. Every
+record sets state rather than changing it, so replaying the new journal
+on top of that snapshot (or the old journal and then the new one on top
+of the previous snapshot) gives the same result, and a crash at any
+point loses nothing.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+from .history import CompletionLog
+from .models import Task, TaskStore
+from .recurrence import RecurringTask
+from .storage import Storage
+from .transfer import iter_json, write_json
+
+_DUMP = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _fsync_dir(path):
+    # Make the rename itself durable. Not supported on Windows; skip there.
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class JournalStorage(Storage):
+    def __init__(self, path, batch_size=32, compact_every=5000):
+        super().__init__()
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.old_journal_path = self.journal_path + ".old"
+        self.history = CompletionLog(path + ".history")
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self._pending = []  # encoded lines not yet written
+        self._journal = None
+        self._journal_size = None  # complete bytes found by load, cut to on open
+        self._template_dicts = {}  # template id -> its last recorded to_dict()
+        self._entries = 0  # records in the journal file (written or pending)
+        # Held while writing files; self.lock only guards _pending/_entries.
+        self._io_lock = threading.RLock()
+
+    # ---------------- LOADING ----------------
+
+    def load(self):
+        """Read the snapshot, replay the journal and return the TaskStore."""
+        for _ in self.load_batches():
+            pass
+        return self.tasks
+
+    def load_batches(self, batch_size=5000):
+        tasks = TaskStore()
+        batch = []
+        extra = {}
+        if os.path.exists(self.path):
+            # Streamed: only the Task objects are kept, never the parsed document.
+            with open(self.path, "r", encoding="utf-8") as f:
+                for d in iter_json(f, extra=extra):
+                    t = Task.from_dict(d)
+                    tasks.add(t)
+                    batch.append(t)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        if batch:
+            yield batch
+
+        self._template_dicts = {d["id"]: d for d in extra.get("templates", ())}
+        self.templates = {i: RecurringTask.from_dict(d) for i, d in self._template_dicts.items()}
+        self.dependencies = {i: tuple(ids) for i, ids in extra.get("dependencies", ())}
+        self._entries = self._replay_file(tasks, self.old_journal_path)[0]
+        entries, good_size = self._replay_file(tasks, self.journal_path)
+        self._entries += entries
+        self.tasks = tasks
+        self.history.load()
+        # Loading writes nothing; a torn tail is cut when the journal is
+        # next opened for writing.
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._journal_size = good_size
+
+    def _replay_file(self, tasks, path):
+        """Apply the records in ``path``; return (records, bytes) up to any torn tail."""
+        entries = good_size = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn final write
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        break
+                    self._replay(tasks, rec)
+                    good_size += len(line)
+                    entries += 1
+        return entries, good_size
+
+    def _open_journal(self, size=None):
+        if self._journal is not None:
+            self._journal.close()
+        self._journal_size = None
+        self._journal = open(self.journal_path, "ab")
+        # Drop any torn tail so new records start on a clean line.
+        if size is not None and self._journal.tell() != size:
+            self._journal.truncate(size)
+            self._journal.seek(size)
+
+    def _replay(self, tasks, rec):
+        op = rec.get("op")
+        if op in ("add", "put"):
+            for d in rec["tasks"] if "tasks" in rec else (rec["task"],):
+                tasks.add(Task.from_dict(d))
+        elif op == "delete":
+            for task_id in rec["ids"] if "ids" in rec else (rec["id"],):
+                tasks.remove(task_id)
+        elif op == "complete":
+            for task_id in rec["ids"] if "ids" in rec else (rec["id"],):
+                t = tasks.get(task_id)
+                if t is not None:
+                    t.completed = True
+                    t.start_min = None
+                    t.end_min = None
+        elif op == "schedule":
+            for task_id, start, end in rec["slots"]:
+                t = tasks.get(task_id)
+                if t is not None:
+                    t.start_min = start
+                    t.end_min = end
+        elif op == "template":
+            template = RecurringTask.from_dict(rec["template"])
+            self.templates[template.id] = template
+            self._template_dicts[template.id] = rec["template"]
+        elif op == "template_delete":
+            self.templates.pop(rec["id"], None)
+            self._template_dicts.pop(rec["id"], None)
+        elif op == "depends":
+            if rec["on"]:
+                self.dependencies[rec["id"]] = tuple(rec["on"])
+            else:
+                self.dependencies.pop(rec["id"], None)
+
+    # ---------------- MUTATIONS ----------------
+
+    def _append(self, rec):
+        line = _DUMP(rec).encode("utf-8") + b"\n"
+        with self.lock:
+            self._pending.append(line)
+            self._entries += 1
+            full = self.autoflush and len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def add(self, task):
+        self._append({"op": "add", "task": task.to_dict()})
+
+    def put(self, task):
+        self._append({"op": "put", "task": task.to_dict()})
+
+    def complete(self, task):
+        self._append({"op": "complete", "id": task.id})
+
+    def delete(self, task_id):
+        self._append({"op": "delete", "id": task_id})
+
+    def schedule(self, tasks):
+        # One line for the whole plan, however many tasks it touches.
+        self._append(
+            {"op": "schedule", "slots": [[t.id, t.start_min, t.end_min] for t in tasks]}
+        )
+
+    def put_many(self, tasks):
+        self._append({"op": "put", "tasks": [t.to_dict() for t in tasks]})
+
+    def complete_many(self, tasks):
+        self._append({"op": "complete", "ids": [t.id for t in tasks]})
+
+    def delete_many(self, task_ids):
+        self._append({"op": "delete", "ids": list(task_ids)})
+
+    def put_template(self, template):
+        d = template.to_dict()
+        with self.lock:
+            self.templates[template.id] = template
+            self._template_dicts[template.id] = d
+        self._append({"op": "template", "template": d})
+
+    def delete_template(self, template_id):
+        with self.lock:
+            self.templates.pop(template_id, None)
+            self._template_dicts.pop(template_id, None)
+        self._append({"op": "template_delete", "id": template_id})
+
+    def set_prerequisites(self, task_id, prerequisite_ids):
+        self._append({"op": "depends", "id": task_id, "on": list(prerequisite_ids)})
+
+    def flush(self):
+        """Write and fsync buffered records; compact if the journal is long."""
+        with self._io_lock:
+            self._write_pending()
+            self.history.flush()
+            if self._entries >= self.compact_every:
+                self.compact()
+
+    def _write_pending(self):
+        with self.lock:
+            lines, self._pending = self._pending, []
+        if lines:
+            if self._journal is None:
+                self._open_journal(self._journal_size)
+            self._journal.write(b"".join(lines))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+
+    # ---------------- COMPACTION ----------------
+
+    def compact(self):
+        """Fold everything into a new snapshot and start an empty journal."""
+        with self._io_lock:
+            self._write_pending()
+            with self.lock:
+                # Mutations wait only for the rotation, not the snapshot.
+                self._write_pending()
+                self._rotate_journal()
+                tasks = list(self.tasks)
+                # As last recorded: the UI edits templates in place, unlocked.
+                templates = list(self._template_dicts.values())
+                dependencies = list(self.dependencies.items())
+                self._entries = 0
+
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                # Links of deleted tasks are dropped here.
+                ids = {t.id for t in tasks}
+                dependencies = [
+                    [i, [p for p in ps if p in ids]] for i, ps in dependencies if i in ids
+                ]
+                write_json(
+                    (t.to_dict() for t in tasks),
+                    f,
+                    {"templates": templates, "dependencies": [d for d in dependencies if d[1]]},
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            _fsync_dir(self.path)
+            os.remove(self.old_journal_path)
+            _fsync_dir(self.path)
+            self.history.snapshot()
+
+    def _rotate_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.old_journal_path):
+            # An earlier compaction was interrupted; its records still
+            # matter until a snapshot lands, so keep them in front.
+            with open(self.old_journal_path, "ab") as old, open(self.journal_path, "rb") as f:
+                shutil.copyfileobj(f, old)
+                old.flush()
+                os.fsync(old.fileno())
+            os.remove(self.journal_path)
+        elif os.path.exists(self.journal_path):
+            os.replace(self.journal_path, self.old_journal_path)
+        else:
+            open(self.old_journal_path, "wb").close()
+        _fsync_dir(self.path)
+        self._open_journal(0)
+
+    def close(self):
+        with self._io_lock:
+            self.flush()
+            self.history.snapshot()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
@@ -0,0 +1,325 @@
+import sys
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+from itertools import count
+
+
+PRIORITY_SCORES = {
+    "Low": 1,
+    "Medium": 2,
+    "High": 3,
+    "Critical": 4,
+}
+
+# Slot times are kept as whole minutes since this (naive, local) epoch.
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(dt: datetime):
+    return (dt - EPOCH) // timedelta(minutes=1)
+
+
+def from_minutes(m: int):
+    return EPOCH + timedelta(minutes=m)
+
+
+def day_start_minutes(d: date):
+    return (d.toordinal() - EPOCH_ORDINAL) * MINUTES_PER_DAY
+
+
+def hhmm(m: int):
+    """'HH:MM' wall-clock time of an epoch-minute timestamp."""
+    return f"{m // 60 % 24:02d}:{m % 60:02d}"
+
+
+def _iso_to_minutes(s):
+    if not s:
+        return None
+    try:
+        return to_minutes(datetime.fromisoformat(s))
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_due_ordinal(s):
+    """Proleptic ordinal of a 'YYYY-MM-DD' string, or None if it is invalid.
+
+    Backlogs share a small number of distinct due dates, so this is cached.
+    """
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern(s):
+    return sys.intern(s) if type(s) is str else s
+
+
+# Process-wide, so a (task id, version) pair is never reused - not even by
+# a Task object rebuilt from disk with the same id.
+_versions = count(1)
+
+
+class Task:
+    # Compact layout: no per-instance __dict__, category/priority/due strings
+    # interned, slot times stored as epoch minutes instead of ISO strings.
+    # ``version`` changes whenever a field that affects the score does.
+    __slots__ = (
+        "id",
+        "title",
+        "category",
+        "_priority",
+        "_duration_minutes",
+        "completed",
+        "start_min",
+        "end_min",
+        "_due_date",
+        "due_ordinal",
+        "version",
+    )
+
+    # Earliest day (ordinal) the task may be planned on; only occurrences of
+    # recurring tasks set one (see dailyflow.recurrence).
+    not_before = None
+
+    def __init__(
+        self,
+        task_id,
+        title,
+        category="General",
+        due_date=None,
+        duration_minutes=60,
+        priority="Medium",
+        completed=False,
+        start_time=None,
+        end_time=None,
+    ):
+        self.id = task_id
+        self.title = title
+        self.category = _intern(category)
+        self.due_date = due_date  # string "YYYY-MM-DD" or None
+        self.duration_minutes = duration_minutes
+        self.priority = priority
+        self.completed = completed
+        self.start_time = start_time  # iso string or None
+        self.end_time = end_time
+
+    # due_date is kept as given (it is shown to the user) alongside its
+    # parsed ordinal, so scoring never has to parse strings.
+    @property
+    def due_date(self):
+        return self._due_date
+
+    @due_date.setter
+    def due_date(self, value):
+        self._due_date = _intern(value)
+        self.due_ordinal = parse_due_ordinal(value) if value else None
+        self.version = next(_versions)
+
+    @property
+    def priority(self):
+        return self._priority
+
+    @priority.setter
+    def priority(self, value):
+        self._priority = _intern(value)
+        self.version = next(_versions)
+
+    @property
+    def duration_minutes(self):
+        return self._duration_minutes
+
+    @duration_minutes.setter
+    def duration_minutes(self, value):
+        self._duration_minutes = value
+        self.version = next(_versions)
+
+    # start_time/end_time keep their ISO-string interface for callers and
+    # the JSON format; start_min/end_min are the stored representation.
+    @property
+    def start_time(self):
+        m = self.start_min
+        return None if m is None else from_minutes(m).isoformat()
+
+    @start_time.setter
+    def start_time(self, value):
+        self.start_min = _iso_to_minutes(value)
+
+    @property
+    def end_time(self):
+        m = self.end_min
+        return None if m is None else from_minutes(m).isoformat()
+
+    @end_time.setter
+    def end_time(self, value):
+        self.end_min = _iso_to_minutes(value)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "title": self.title,
+            "category": self.category,
+            "due_date": self.due_date,
+            "duration_minutes": self.duration_minutes,
+            "priority": self.priority,
+            "completed": self.completed,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
+
+    @staticmethod
+    def from_dict(d):
+        return Task(
+            d["id"],
+            d["title"],
+            d.get("category", "General"),
+            d.get("due_date"),
+            d.get("duration_minutes", 60),
+            d.get("priority", "Medium"),
+            d.get("completed", False),
+            d.get("start_time"),
+            d.get("end_time"),
+        )
+
+    def score_for_today(self, today: date):
+        """Higher score = more important to schedule earlier."""
+        base = PRIORITY_SCORES.get(self.priority, 2)
+        urgency = 0
+        if self.due_ordinal is not None:
+            days_left = self.due_ordinal - today.toordinal()
+            if days_left <= 0:
+                urgency = 3  # overdue / due today
+            elif days_left == 1:
+                urgency = 2
+            elif days_left <= 3:
+                urgency = 1
+        # Longer tasks get a slight penalty so shorter chunks fit earlier
+        length_penalty = min(1, self.duration_minutes / 240.0)
+        return base + urgency - length_penalty
+
+
+class ScoreCache:
+    """Memoized ``Task.score_for_today``, keyed by task id and version.
+
+    An entry is reused while the task's version matches (it changes with
+    priority, due date or duration) and the whole cache is dropped when
+    the day changes, so re-planning unchanged tasks computes no scores.
+    ``hits``/``misses`` count lookups; :meth:`stats` adds the due-date
+    parse cache.
+    """
+
+    def __init__(self):
+        self.day = None
+        self._entries = {}  # task id -> (version, score)
+        self.hits = 0
+        self.misses = 0
+        self.rollovers = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _use_day(self, day):
+        if day is None:
+            day = date.today()
+        if day != self.day:
+            if self.day is not None:
+                self.rollovers += 1
+            self.day = day
+            self._entries = {}
+        return day
+
+    def score(self, task, day=None):
+        day = self._use_day(day)
+        entry = self._entries.get(task.id)
+        if entry is not None and entry[0] == task.version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        score = task.score_for_today(day)
+        self._entries[task.id] = (task.version, score)
+        return score
+
+    def scores(self, tasks, day=None):
+        """``[self.score(t, day) for t in tasks]``, without the per-call overhead."""
+        day = self._use_day(day)
+        entries = self._entries
+        get = entries.get
+        out = []
+        misses = 0
+        for t in tasks:
+            entry = get(t.id)
+            if entry is not None and entry[0] == t.version:
+                out.append(entry[1])
+            else:
+                misses += 1
+                score = t.score_for_today(day)
+                entries[t.id] = (t.version, score)
+                out.append(score)
+        self.misses += misses
+        self.hits += len(out) - misses
+        return out
+
+    def discard(self, task_id):
+        self._entries.pop(task_id, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        parse = parse_due_ordinal.cache_info()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "rollovers": self.rollovers,
+            "date_parse_hits": parse.hits,
+            "date_parse_misses": parse.misses,
+        }
+
+
+class TaskStore:
+    """Tasks in insertion order with an id -> task index.
+
+    Lookup and removal by id are O(1); iteration yields tasks in the order
+    they were added, like the plain list it replaces.
+    """
+
+    __slots__ = ("_rows", "next_id")
+
+    def __init__(self, tasks=()):
+        self._rows = {}
+        self.next_id = 1
+        for t in tasks:
+            self.add(t)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows.values())
+
+    def __contains__(self, task_id):
+        return task_id in self._rows
+
+    def get(self, task_id, default=None):
+        return self._rows.get(task_id, default)
+
+    def add(self, task):
+        self._rows[task.id] = task
+        if task.id >= self.next_id:
+            self.next_id = task.id + 1
+        return task
+
+    def create(self, title, *args, **kwargs):
+        """Build a Task with the next free id and add it."""
+        return self.add(Task(self.next_id, title, *args, **kwargs))
+
+    def remove(self, task_id):
+        """Remove and return the task with ``task_id`` (None if missing)."""
+        return self._rows.pop(task_id, None)
+
+    def clear(self):
+        self._rows.clear()
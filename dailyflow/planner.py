@@ -0,0 +1,326 @@
+"""Headless day planner.
+
+Nothing here touches tkinter/customtkinter, so plans can be built from
+scripts, servers and worker processes. The GUI calls :func:`plan_day` and
+then :func:`apply_plan` to write the slots back onto its tasks.
+"""
+
+import os
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, date
+from functools import partial
+from math import gcd
+from operator import attrgetter
+
+from .models import MINUTES_PER_DAY, day_start_minutes, from_minutes, to_minutes
+
+BREAK_MINUTES = 5
+
+STRATEGIES = ("greedy", "optimal")
+
+# Default wall-clock allowance for the "optimal" strategy before it gives up
+# and falls back to greedy.
+OPTIMAL_TIME_BUDGET = 0.25
+
+# One scheduled task. start/end are naive datetimes on the planned day.
+Slot = namedtuple("Slot", "task_id start end")
+
+# Result of planning one day: slots in time order, plus the ids of pending
+# tasks that did not fit (highest score first).
+Plan = namedtuple("Plan", "day slots unscheduled")
+
+
+def parse_time(s: str):
+    try:
+        return datetime.strptime(s, "%H:%M").time()
+    except ValueError:
+        return None
+
+
+_OWN_DURATION = attrgetter("duration_minutes")
+
+
+def duration_of(estimator=None):
+    """How long to book for a task: its ``duration_minutes``, or with an
+    ``estimator`` (:class:`~dailyflow.estimator.DurationEstimator`) the
+    learned correction of it."""
+    return _OWN_DURATION if estimator is None else estimator.minutes
+
+
+def rank_pending(tasks, day, vectorized=False, cache=None):
+    """Pending tasks and their scores, highest ``score_for_today`` first.
+
+    Ties keep their input order. ``cache`` is an optional
+    :class:`~dailyflow.models.ScoreCache` that remembers the scores of
+    unchanged tasks between calls.
+    """
+    pending = [t for t in tasks if not t.completed]
+    if vectorized and pending:
+        from .scoring import ScoreColumns
+
+        scores = ScoreColumns.from_tasks(pending).scores(day)
+        order = (-scores).argsort(kind="stable")
+        return [pending[i] for i in order], scores[order].tolist()
+    if cache is not None:
+        scored = list(zip(cache.scores(pending, day), pending))
+    else:
+        scored = [(t.score_for_today(day), t) for t in pending]
+    scored.sort(key=lambda p: p[0], reverse=True)
+    return [t for _, t in scored], [s for s, _ in scored]
+
+
+def _knapsack(tasks, scores, window, deadline, length=_OWN_DURATION):
+    """Indices of the task subset with the highest total score that fits.
+
+    Every task costs its duration plus a break and the window gets one
+    extra break's worth of room (the last task needs no break after it).
+    This is a 0/1 knapsack solved by DP over capacity, after dividing all
+    weights by their common gcd - with the usual 5/15-minute durations that
+    shrinks the table ~5-15x. Among subsets with the same score the one
+    using more time wins, so zero-score tasks still fill idle time. Returns
+    None once ``deadline`` (a ``time.perf_counter()`` value) has passed.
+    """
+    capacity = window + BREAK_MINUTES
+    items = [
+        (i, d + BREAK_MINUTES, s)
+        for i, (d, s) in enumerate(zip(map(length, tasks), scores))
+        if 0 < d <= window
+    ]
+    if not items:
+        return set()
+    g = capacity
+    for _, w, _ in items:
+        g = gcd(g, w)
+    capacity //= g
+
+    best = [0.0] * (capacity + 1)
+    used = [0] * (capacity + 1)  # weight of the subset behind best[c]
+    taken = []  # per item: bytearray, 1 where taking it improved best[c]
+    for i, w, v in items:
+        if time.perf_counter() > deadline:
+            return None
+        w //= g
+        take = bytearray(capacity + 1)
+        for c in range(capacity, w - 1, -1):
+            cand = best[c - w] + v
+            b = best[c]
+            if cand > b or (cand == b and used[c - w] + w > used[c]):
+                best[c] = cand
+                used[c] = used[c - w] + w
+                take[c] = 1
+        taken.append(take)
+
+    chosen = set()
+    c = capacity
+    for (i, w, _), take in zip(reversed(items), reversed(taken)):
+        if take[c]:
+            chosen.add(i)
+            c -= w // g
+    return chosen
+
+
+def plan_day(
+    tasks,
+    start,
+    end,
+    day=None,
+    vectorized=False,
+    strategy="greedy",
+    time_budget=OPTIMAL_TIME_BUDGET,
+    busy=None,
+    cache=None,
+    dependencies=None,
+    estimator=None,
+):
+    """Schedule the pending tasks back-to-back inside the start-end window.
+
+    ``start``/``end`` are ``datetime.time`` values and ``day`` defaults to
+    today. Tasks are taken by descending ``score_for_today``; one that does
+    not fit in the remaining time is left unscheduled. The tasks themselves
+    are not modified. Raises ValueError if the window is empty.
+
+    ``vectorized=True`` scores through NumPy (see :mod:`dailyflow.scoring`),
+    which pays off for large backlogs and gives the same plan.
+
+    ``strategy="optimal"`` instead picks the subset of tasks with the highest
+    total score that fits (breaks included), so gaps left by a task that
+    did not fit get filled by smaller ones. Chosen tasks are still laid out
+    in score order. If that takes longer than ``time_budget`` seconds the
+    greedy plan is returned instead.
+
+    ``busy`` is an optional :class:`~dailyflow.busy.BusyCalendar`. Tasks
+    then go into the earliest free gap they fit in (first fit), so short
+    tasks can still use the time before a meeting. With busy time the
+    "optimal" subset is chosen against the total free time, which makes it
+    near-optimal rather than exact.
+
+    ``cache`` (a :class:`~dailyflow.models.ScoreCache`) reuses the scores
+    of tasks that have not changed since the last plan.
+
+    ``dependencies`` (``{task_id: prerequisite ids}``, see
+    :mod:`dailyflow.dependencies`) keeps every task after its pending
+    prerequisites and lifts blockers of urgent tasks; a task whose
+    prerequisite is left unscheduled stays unscheduled too. Raises
+    :class:`~dailyflow.dependencies.CycleError` if the links loop.
+
+    ``estimator`` (a :class:`~dailyflow.estimator.DurationEstimator`) books
+    each task for its learned duration instead of ``duration_minutes``;
+    scores still use the user's estimate.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown planning strategy: {strategy!r}")
+    if day is None:
+        day = date.today()
+    start_dt = datetime.combine(day, start)
+    end_dt = datetime.combine(day, end)
+    if start_dt >= end_dt:
+        raise ValueError("Start time must be before end time.")
+
+    # Filter tasks to schedule: incomplete, sorted by importance (score desc)
+    prereqs = None
+    if dependencies:
+        from .dependencies import order_pending
+
+        to_schedule, scores, prereqs, _ = order_pending(tasks, day, dependencies, vectorized, cache)
+    else:
+        to_schedule, scores = rank_pending(tasks, day, vectorized, cache)
+
+    gaps = None
+    window = int((end_dt - start_dt).total_seconds() // 60)
+    if busy is not None:
+        from .busy import free_windows
+
+        gaps = free_windows(busy, [(to_minutes(start_dt), to_minutes(end_dt))])
+        # Each gap can absorb one trailing break, like the window itself.
+        window = sum(e - s + BREAK_MINUTES for s, e in gaps) - BREAK_MINUTES
+
+    length = duration_of(estimator)
+    chosen = None
+    if strategy == "optimal":
+        chosen = _knapsack(to_schedule, scores, window, time.perf_counter() + time_budget, length)
+
+    if gaps is not None:
+        return _plan_in_gaps(day, gaps, to_schedule, chosen, prereqs, length)
+
+    slots = []
+    unscheduled = []
+    blocked = set()  # with prereqs: ids left unscheduled
+    brk = timedelta(minutes=BREAK_MINUTES)
+    current = start_dt
+    for i, t in enumerate(to_schedule):
+        if (chosen is not None and i not in chosen) or (
+            prereqs and t.id in prereqs and not blocked.isdisjoint(prereqs[t.id])
+        ):
+            unscheduled.append(t.id)
+            blocked.add(t.id)
+            continue
+        if current >= end_dt:
+            # no more time
+            unscheduled.append(t.id)
+            blocked.add(t.id)
+            continue
+        slot_end = current + timedelta(minutes=length(t))
+        if slot_end > end_dt:
+            # not enough space; leave unscheduled
+            unscheduled.append(t.id)
+            blocked.add(t.id)
+        else:
+            slots.append(Slot(t.id, current, slot_end))
+            current = slot_end + brk  # small break
+
+    return Plan(day, tuple(slots), tuple(unscheduled))
+
+
+def _plan_in_gaps(day, gaps, to_schedule, chosen, prereqs=None, length=_OWN_DURATION):
+    from .slots import FreeSlots
+
+    free = FreeSlots(gaps)
+    slots = []
+    unscheduled = []
+    ends = {}  # with prereqs: id -> end minute of each placed task
+    for i, t in enumerate(to_schedule):
+        span = None
+        if chosen is None or i in chosen:
+            earliest = None
+            if prereqs and t.id in prereqs:
+                earliest = free.earliest_after(ends, prereqs[t.id])
+            if earliest != -1:
+                span = free.place(length(t), earliest=earliest)
+        if span is None:
+            unscheduled.append(t.id)
+        else:
+            if prereqs:
+                ends[t.id] = span[1]
+            slots.append(Slot(t.id, from_minutes(span[0]), from_minutes(span[1])))
+    slots.sort(key=lambda s: s.start)
+    return Plan(day, tuple(slots), tuple(unscheduled))
+
+
+def scheduled_today(tasks, day=None):
+    """Split pending tasks into (slotted on ``day``, by start; everything else)."""
+    if day is None:
+        day = date.today()
+    day_start = day_start_minutes(day)
+    day_end = day_start + MINUTES_PER_DAY
+    active = []
+    unscheduled = []
+    for t in tasks:
+        if t.completed:
+            continue
+        if t.start_min is not None and t.end_min is not None and day_start <= t.start_min < day_end:
+            active.append(t)
+        else:
+            unscheduled.append(t)
+    active.sort(key=lambda t: t.start_min)
+    return active, unscheduled
+
+
+def apply_plan(tasks, plan):
+    """Write ``plan`` onto the pending tasks' start/end times.
+
+    Pending tasks that are not in the plan get their slot cleared; completed
+    tasks are left alone.
+    """
+    by_id = {s.task_id: s for s in plan.slots}
+    for t in tasks:
+        if t.completed:
+            continue
+        slot = by_id.get(t.id)
+        if slot is None:
+            t.start_min = None
+            t.end_min = None
+        else:
+            t.start_min = to_minutes(slot.start)
+            t.end_min = to_minutes(slot.end)
+
+
+def _plan_job(start, end, day, kwargs, tasks):
+    return plan_day(tasks, start, end, day, **kwargs)
+
+
+def plan_many(task_lists, start, end, day=None, workers=None, chunksize=256, **kwargs):
+    """Plan many independent task lists (e.g. one per user) in parallel.
+
+    Returns one :class:`Plan` per input list, in input order. Work is spread
+    over a process pool of ``workers`` processes (default: CPU count) and
+    shipped in chunks of ``chunksize`` lists to keep pickling overhead low.
+    With one worker, or a single chunk of work, everything runs in-process.
+
+    Extra keyword arguments (``strategy``, ...) are passed to :func:`plan_day`.
+    As with any ``multiprocessing`` code, call this from under an
+    ``if __name__ == "__main__":`` guard.
+    """
+    if day is None:
+        day = date.today()
+    task_lists = list(task_lists)
+    job = partial(_plan_job, start, end, day, kwargs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(task_lists) <= chunksize:
+        return [job(tasks) for tasks in task_lists]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(job, task_lists, chunksize=chunksize))
@@ -0,0 +1,204 @@
+"""Opt-in timing spans, rolling latency histograms and Chrome trace export.
+
+Profiling is off by default. While it is off, :func:`span` returns a
+shared no-op context manager, :func:`profiled` wrappers make one global
+check before calling straight through and :func:`count` returns at once,
+so the instrumentation can stay in hot paths. :func:`enable` (or
+``DAILYFLOW_PROFILE=1`` in the GUI) starts recording:
+
+* every span's duration goes into a per-name rolling window, from which
+  :meth:`Profiler.summary` reports count, p50, p99 and max;
+* spans are also kept as trace events (bounded) that
+  :meth:`Profiler.export_chrome_trace` writes in the Chrome trace-event
+  JSON format, viewable in ``chrome://tracing`` or Perfetto;
+* :func:`count` keeps named counters (e.g. widgets created).
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+_profiler = None  # the active Profiler, or None while disabled
+
+
+class Histogram:
+    """Durations of the last ``window`` samples, plus lifetime count/total."""
+
+    __slots__ = ("samples", "count", "total")
+
+    def __init__(self, window=1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+
+def _percentile(ordered, p):
+    """The ``p``-th percentile (0-100) of a sorted, non-empty list."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class Profiler:
+    def __init__(self, window=1024, max_events=100_000):
+        self.window = window
+        self.t0 = time.perf_counter()
+        self.histograms = {}
+        self.counters = {}
+        self.events = deque(maxlen=max_events)  # (name, start, end, thread id)
+        self._lock = threading.Lock()
+
+    def record(self, name, start, end):
+        """Add a span measured with ``time.perf_counter()`` timestamps."""
+        with self._lock:
+            h = self.histograms.get(name)
+            if h is None:
+                h = self.histograms[name] = Histogram(self.window)
+            h.add(end - start)
+            self.events.append((name, start, end, threading.get_ident()))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """``(name, count, p50, p99, max)`` per span name (seconds), by name."""
+        with self._lock:
+            items = [(name, h.count, list(h.samples)) for name, h in self.histograms.items()]
+        rows = []
+        for name, n, samples in sorted(items):
+            samples.sort()
+            rows.append((name, n, _percentile(samples, 50), _percentile(samples, 99), samples[-1]))
+        return rows
+
+    def report(self):
+        """The summary and counters as a fixed-width text table."""
+        lines = [f"{'operation':<26} {'count':>7} {'p50':>9} {'p99':>9} {'max':>9}"]
+        for name, n, p50, p99, worst in self.summary():
+            lines.append(
+                f"{name:<26} {n:>7} {p50 * 1000:>7.1f}ms {p99 * 1000:>7.1f}ms "
+                f"{worst * 1000:>7.1f}ms"
+            )
+        if self.counters:
+            lines.append("")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<26} {value:>7}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """Write the recorded spans as Chrome trace-event JSON; return the event count."""
+        with self._lock:
+            events = list(self.events)
+            counters = dict(self.counters)
+        pid = 1
+        names = {t.ident: t.name for t in threading.enumerate()}
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in names.items()
+        ]
+        for name, start, end, tid in events:
+            trace.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.t0) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+        now = (time.perf_counter() - self.t0) * 1e6
+        for name, value in counters.items():
+            trace.append({"name": name, "ph": "C", "ts": now, "pid": pid, "args": {name: value}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+# ---------------- MODULE-LEVEL API ----------------
+
+
+def enable(**kwargs):
+    """Start recording (keeps the current profiler if already enabled)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(**kwargs)
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def active():
+    """The recording Profiler, or None while profiling is off."""
+    return _profiler
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """``with span("plan_today"): ...`` - times the block when profiling is on."""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return _Span(profiler, name)
+
+
+def profiled(name):
+    """Decorator form of :func:`span`."""
+
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+
+        return wrapper
+
+    return decorate
+
+
+def count(name, n=1):
+    profiler = _profiler
+    if profiler is not None:
+        profiler.count(name, n)
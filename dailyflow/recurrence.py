@@ -0,0 +1,275 @@
+"""Recurring tasks, stored once and expanded lazily.
+
+A :class:`RecurringTask` is a template: title, category, priority and
+duration plus a rule (daily, weekdays, weekly on chosen days, or every N
+days). Storage keeps only templates. :func:`expand` turns them into
+:class:`Occurrence` tasks for the days being viewed or planned, so cost
+follows the size of that window, not the length of the history.
+
+Per-occurrence state is sparse: each template holds the dates completed or
+skipped and the slots booked for its occurrences. :meth:`RecurringTask.prune`
+drops entries for past days, which are never expanded again.
+
+Occurrences are ordinary :class:`~dailyflow.models.Task` objects (due on
+their day, never planned before it) with negative ids derived from the
+template id and date, so they cannot collide with stored tasks.
+:class:`PlanningView` lets the planners, views and ``apply_plan`` see a
+TaskStore and a window's occurrences as one collection.
+"""
+
+from datetime import date
+from itertools import chain
+
+from .models import EPOCH_ORDINAL, Task
+
+RULES = ("daily", "weekdays", "weekly", "every")
+
+_DAY_BITS = 20  # days since the epoch fit in 20 bits until the year 4840
+
+
+def occurrence_id(template_id, ordinal):
+    return -((template_id << _DAY_BITS) | (ordinal - EPOCH_ORDINAL))
+
+
+def split_occurrence_id(task_id):
+    """(template id, date ordinal) of an occurrence id."""
+    n = -task_id
+    return n >> _DAY_BITS, (n & ((1 << _DAY_BITS) - 1)) + EPOCH_ORDINAL
+
+
+def is_occurrence(task_id):
+    return task_id < 0
+
+
+class Occurrence(Task):
+    __slots__ = ("template_id", "not_before")
+
+    def __init__(self, template, ordinal):
+        super().__init__(
+            occurrence_id(template.id, ordinal),
+            template.title,
+            template.category,
+            date.fromordinal(ordinal).isoformat(),
+            template.duration_minutes,
+            template.priority,
+            ordinal in template.done,
+        )
+        self.template_id = template.id
+        self.not_before = ordinal
+        slot = template.slots.get(ordinal)
+        if slot is not None and not self.completed:
+            self.start_min, self.end_min = slot
+
+    @property
+    def ordinal(self):
+        return self.not_before
+
+
+class RecurringTask:
+    __slots__ = (
+        "id",
+        "title",
+        "category",
+        "priority",
+        "duration_minutes",
+        "rule",
+        "interval",
+        "weekdays",
+        "start_ordinal",
+        "until_ordinal",
+        "done",
+        "skipped",
+        "slots",
+    )
+
+    def __init__(
+        self,
+        template_id,
+        title,
+        rule,
+        start,
+        category="General",
+        duration_minutes=60,
+        priority="Medium",
+        interval=1,
+        weekdays=None,
+        until=None,
+    ):
+        if rule not in RULES:
+            raise ValueError(f"Unknown recurrence rule: {rule!r}")
+        if interval < 1:
+            raise ValueError("The interval must be at least 1.")
+        self.id = template_id
+        self.title = title
+        self.category = category
+        self.priority = priority
+        self.duration_minutes = duration_minutes
+        self.rule = rule
+        self.interval = interval
+        self.start_ordinal = start.toordinal()
+        # weekly: which weekdays (0 = Monday), by default the start's
+        self.weekdays = tuple(sorted(set(weekdays))) if weekdays else (start.weekday(),)
+        self.until_ordinal = None if until is None else until.toordinal()
+        self.done = set()  # ordinals of completed occurrences
+        self.skipped = set()  # ordinals of occurrences deleted on their own
+        self.slots = {}  # ordinal -> (start_min, end_min) of booked occurrences
+
+    # ---------------- RULE ----------------
+
+    def ordinals_between(self, first, last):
+        """Date ordinals in [first, last] on which the task recurs."""
+        lo = max(first, self.start_ordinal)
+        hi = last if self.until_ordinal is None else min(last, self.until_ordinal)
+        if lo > hi:
+            return
+        if self.rule == "daily":
+            yield from range(lo, hi + 1)
+        elif self.rule == "every":
+            n = self.interval
+            yield from range(lo + (self.start_ordinal - lo) % n, hi + 1, n)
+        elif self.rule == "weekdays":
+            # date.weekday() is (ordinal - 1) % 7
+            for o in range(lo, hi + 1):
+                if (o - 1) % 7 < 5:
+                    yield o
+        else:
+            week0 = self.start_ordinal - (self.start_ordinal - 1) % 7  # its Monday
+            days = self.weekdays
+            for o in range(lo, hi + 1):
+                if (o - 1) % 7 in days and (o - week0) // 7 % self.interval == 0:
+                    yield o
+
+    def occurrences(self, first, last, include_done=False):
+        skipped = self.skipped
+        for o in self.ordinals_between(first, last):
+            if o in skipped or (o in self.done and not include_done):
+                continue
+            yield Occurrence(self, o)
+
+    # ---------------- STATE ----------------
+
+    def set_slot(self, ordinal, start_min, end_min):
+        """Record an occurrence's slot; True if it changed."""
+        if start_min is None:
+            return self.slots.pop(ordinal, None) is not None
+        if self.slots.get(ordinal) == (start_min, end_min):
+            return False
+        self.slots[ordinal] = (start_min, end_min)
+        return True
+
+    def complete(self, ordinal):
+        self.done.add(ordinal)
+        self.slots.pop(ordinal, None)
+
+    def skip(self, ordinal):
+        self.skipped.add(ordinal)
+        self.slots.pop(ordinal, None)
+
+    def prune(self, before):
+        """Forget state for days before the ordinal ``before``; True if any was dropped."""
+        old = len(self.done) + len(self.skipped) + len(self.slots)
+        self.done = {o for o in self.done if o >= before}
+        self.skipped = {o for o in self.skipped if o >= before}
+        self.slots = {o: s for o, s in self.slots.items() if o >= before}
+        return len(self.done) + len(self.skipped) + len(self.slots) != old
+
+    # ---------------- SERIALIZATION ----------------
+
+    def to_dict(self):
+        d = {
+            "id": self.id,
+            "title": self.title,
+            "category": self.category,
+            "priority": self.priority,
+            "duration_minutes": self.duration_minutes,
+            "rule": self.rule,
+            "interval": self.interval,
+            "weekdays": list(self.weekdays),
+            "start": date.fromordinal(self.start_ordinal).isoformat(),
+            "until": None
+            if self.until_ordinal is None
+            else date.fromordinal(self.until_ordinal).isoformat(),
+        }
+        # Sparse per-occurrence state, only when there is some.
+        if self.done:
+            d["done"] = sorted(self.done)
+        if self.skipped:
+            d["skipped"] = sorted(self.skipped)
+        if self.slots:
+            d["slots"] = [[o, s, e] for o, (s, e) in sorted(self.slots.items())]
+        return d
+
+    @staticmethod
+    def from_dict(d):
+        until = d.get("until")
+        t = RecurringTask(
+            d["id"],
+            d["title"],
+            d["rule"],
+            date.fromisoformat(d["start"]),
+            d.get("category", "General"),
+            d.get("duration_minutes", 60),
+            d.get("priority", "Medium"),
+            d.get("interval", 1),
+            d.get("weekdays"),
+            None if until is None else date.fromisoformat(until),
+        )
+        t.done = set(d.get("done", ()))
+        t.skipped = set(d.get("skipped", ()))
+        t.slots = {o: (s, e) for o, s, e in d.get("slots", ())}
+        return t
+
+
+def new_template(templates, title, rule, start, **kwargs):
+    """A RecurringTask with the next free id in ``templates`` (id -> template)."""
+    return RecurringTask(max(templates, default=0) + 1, title, rule, start, **kwargs)
+
+
+def expand(templates, first_day, last_day=None, include_done=False):
+    """Occurrences of ``templates`` from ``first_day`` to ``last_day`` (inclusive).
+
+    Completed occurrences are left out unless ``include_done``; skipped
+    ones always are. Ordered by template and then date.
+    """
+    first = first_day.toordinal()
+    last = first if last_day is None else last_day.toordinal()
+    found = [o for t in templates for o in t.occurrences(first, last, include_done)]
+    found.sort(key=lambda o: (o.template_id, o.not_before))
+    return found
+
+
+def record_schedule(storage, tasks):
+    """``storage.schedule(tasks)``, keeping occurrences' slots in their templates."""
+    stored = [t for t in tasks if not is_occurrence(t.id)]
+    if stored:
+        storage.schedule(stored)
+    changed = {}
+    for t in tasks:
+        if is_occurrence(t.id):
+            template = storage.templates.get(t.template_id)
+            if template is not None and template.set_slot(t.ordinal, t.start_min, t.end_min):
+                changed[template.id] = template
+    for template in changed.values():
+        storage.put_template(template)
+
+
+class PlanningView:
+    """A TaskStore and a window's occurrences, iterated and looked up as one."""
+
+    __slots__ = ("tasks", "occurrences")
+
+    def __init__(self, tasks, occurrences):
+        self.tasks = tasks
+        self.occurrences = occurrences  # a TaskStore of Occurrence objects
+
+    def __len__(self):
+        return len(self.tasks) + len(self.occurrences)
+
+    def __iter__(self):
+        return chain(self.occurrences, self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in (self.occurrences if task_id < 0 else self.tasks)
+
+    def get(self, task_id, default=None):
+        return (self.occurrences if task_id < 0 else self.tasks).get(task_id, default)
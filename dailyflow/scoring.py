@@ -0,0 +1,64 @@
+"""Columnar (NumPy) version of ``Task.score_for_today``.
+
+``ScoreColumns.from_tasks`` pulls priority, due date and duration out of the
+task objects once; ``scores(today)`` then computes every score with a handful
+of array operations. Results are bit-for-bit identical to the scalar method.
+
+NumPy is optional: it is only imported when this module is used.
+"""
+
+import numpy as np
+
+from .models import EPOCH_ORDINAL, PRIORITY_SCORES
+
+_NAT = np.iinfo(np.int64).min  # int64 view of NaT
+
+
+class ScoreColumns:
+    def __init__(self, ids, base, due, duration):
+        self.ids = ids  # list of task ids, same order as the arrays
+        self.base = base  # float64 priority score
+        self.due = due  # datetime64[D], NaT when there is no (valid) due date
+        self.duration = duration  # float64 minutes
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        tasks = list(tasks)
+        n = len(tasks)
+        get_prio = PRIORITY_SCORES.get
+        base = np.fromiter((get_prio(t.priority, 2) for t in tasks), np.float64, n)
+        duration = np.fromiter((t.duration_minutes for t in tasks), np.float64, n)
+
+        # Tasks carry their due date pre-parsed; missing/invalid -> NaT.
+        due = np.fromiter(
+            (_NAT if t.due_ordinal is None else t.due_ordinal - EPOCH_ORDINAL for t in tasks),
+            np.int64,
+            n,
+        ).view("datetime64[D]")
+
+        return cls([t.id for t in tasks], base, due, duration)
+
+    def scores(self, today):
+        """Score of every task for ``today``, as a float64 array."""
+        days_left = (self.due - np.datetime64(today, "D")).astype(np.int64)
+        has_due = ~np.isnat(self.due)
+        urgency = np.select(
+            [days_left <= 0, days_left == 1, days_left <= 3],
+            [3.0, 2.0, 1.0],
+            0.0,
+        )
+        urgency[~has_due] = 0.0
+        length_penalty = np.minimum(1.0, self.duration / 240.0)
+        return self.base + urgency - length_penalty
+
+    def order(self, today):
+        """Row indices sorted by descending score, ties in input order."""
+        return np.argsort(-self.scores(today), kind="stable")
+
+
+def vector_scores(tasks, today):
+    """Vectorized ``[t.score_for_today(today) for t in tasks]``."""
+    return ScoreColumns.from_tasks(tasks).scores(today)
@@ -0,0 +1,211 @@
+"""In-memory inverted indexes for searching and filtering the task list.
+
+:class:`TaskIndex` keeps
+
+* a token index: lower-cased word in a title -> ids of the tasks using it,
+  with a sorted vocabulary so a partly typed word matches by prefix;
+* bucket indexes on category, priority and status (done or pending);
+* a due-date index: due ordinal -> ids, with the distinct ordinals sorted
+  for range queries.
+
+A query looks up one id set per criterion and intersects them smallest
+first, so its cost follows the size of the matches rather than the size
+of the backlog. The index is kept current with :meth:`TaskIndex.add`,
+:meth:`~TaskIndex.update` and :meth:`~TaskIndex.remove` as tasks change;
+:meth:`~TaskIndex.sync` reconciles it with a whole store after a reload.
+"""
+
+import re
+from bisect import bisect_left, bisect_right, insort
+
+_WORD = re.compile(r"\w+")
+
+
+def tokens(text):
+    """The set of lower-case words in ``text``."""
+    return set(_WORD.findall(text.lower()))
+
+
+def _indexed_fields(t):
+    return (t.title, t.category, t.priority, bool(t.completed), t.due_ordinal)
+
+
+class _SortedKeys:
+    """The keys of a ``key -> set`` index, sorted lazily for range lookups."""
+
+    __slots__ = ("index", "_sorted")
+
+    def __init__(self):
+        self.index = {}
+        self._sorted = None  # built on the first range lookup
+
+    def add(self, key, task_id):
+        ids = self.index.get(key)
+        if ids is None:
+            ids = self.index[key] = set()
+            if self._sorted is not None:
+                insort(self._sorted, key)
+        ids.add(task_id)
+
+    def discard(self, key, task_id):
+        ids = self.index.get(key)
+        if ids is None:
+            return
+        ids.discard(task_id)
+        if not ids:
+            del self.index[key]
+            if self._sorted is not None:
+                del self._sorted[bisect_left(self._sorted, key)]
+
+    def keys_between(self, lo, hi):
+        """Keys ``k`` with ``lo <= k < hi`` (either bound may be None)."""
+        if self._sorted is None:
+            self._sorted = sorted(self.index)
+        keys = self._sorted
+        i = 0 if lo is None else bisect_left(keys, lo)
+        j = len(keys) if hi is None else bisect_left(keys, hi)
+        return keys[i:j]
+
+    def keys_with_prefix(self, prefix):
+        if self._sorted is None:
+            self._sorted = sorted(self.index)
+        keys = self._sorted
+        i = bisect_left(keys, prefix)
+        j = bisect_right(keys, prefix + "\U0010ffff", i)
+        return keys[i:j]
+
+
+class TaskIndex:
+    def __init__(self, tasks=()):
+        self._fields = {}  # task id -> fields as last indexed
+        self.words = _SortedKeys()
+        self.due = _SortedKeys()
+        self.by_category = {}
+        self.by_priority = {}
+        self.by_status = {False: set(), True: set()}
+        for t in tasks:
+            self.add(t)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __contains__(self, task_id):
+        return task_id in self._fields
+
+    def categories(self):
+        return sorted(self.by_category)
+
+    # ---------------- MAINTENANCE ----------------
+
+    def add(self, task):
+        """Index ``task`` (re-indexes it if its id is already present)."""
+        if task.id in self._fields:
+            self.remove(task.id)
+        fields = _indexed_fields(task)
+        self._fields[task.id] = fields
+        self._insert(task.id, fields)
+
+    def update(self, task):
+        """Re-index ``task`` if any indexed field changed; True if it did."""
+        fields = _indexed_fields(task)
+        old = self._fields.get(task.id)
+        if old == fields:
+            return False
+        if old is not None:
+            self._drop(task.id, old)
+        self._fields[task.id] = fields
+        self._insert(task.id, fields)
+        return True
+
+    def remove(self, task_id):
+        fields = self._fields.pop(task_id, None)
+        if fields is not None:
+            self._drop(task_id, fields)
+
+    def sync(self, tasks):
+        """Make the index match ``tasks`` (a TaskStore), touching only what changed."""
+        for t in tasks:
+            self.update(t)
+        if len(self._fields) != len(tasks):
+            for task_id in [i for i in self._fields if i not in tasks]:
+                self.remove(task_id)
+
+    def _insert(self, task_id, fields):
+        title, category, priority, completed, due = fields
+        words = self.words
+        get = words.index.get
+        for word in tokens(title):
+            ids = get(word)
+            if ids is None:
+                words.add(word, task_id)
+            else:
+                ids.add(task_id)
+        self.by_category.setdefault(category, set()).add(task_id)
+        self.by_priority.setdefault(priority, set()).add(task_id)
+        self.by_status[completed].add(task_id)
+        if due is not None:
+            self.due.add(due, task_id)
+
+    def _drop(self, task_id, fields):
+        title, category, priority, completed, due = fields
+        for word in tokens(title):
+            self.words.discard(word, task_id)
+        for bucket, key in ((self.by_category, category), (self.by_priority, priority)):
+            ids = bucket.get(key)
+            if ids is not None:
+                ids.discard(task_id)
+                if not ids:
+                    del bucket[key]
+        self.by_status[completed].discard(task_id)
+        if due is not None:
+            self.due.discard(due, task_id)
+
+    # ---------------- QUERIES ----------------
+
+    def search(
+        self,
+        text="",
+        category=None,
+        priority=None,
+        completed=None,
+        due_from=None,
+        due_to=None,
+    ):
+        """Ids of the tasks matching every given criterion, as a set.
+
+        Each word of ``text`` must start a word of the title. ``due_from``
+        and ``due_to`` are inclusive date ordinals; giving either excludes
+        tasks without a due date. Returns None when no criterion is given
+        (everything matches).
+        """
+        sets = []
+        for word in tokens(text):
+            sets.append(self._word_ids(word))
+        if category is not None:
+            sets.append(self.by_category.get(category, set()))
+        if priority is not None:
+            sets.append(self.by_priority.get(priority, set()))
+        if completed is not None:
+            sets.append(self.by_status[bool(completed)])
+        if due_from is not None or due_to is not None:
+            hi = None if due_to is None else due_to + 1
+            sets.append(self._union(self.due, self.due.keys_between(due_from, hi)))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        if not sets[0]:
+            return set()
+        return sets[0].intersection(*sets[1:])
+
+    def _word_ids(self, prefix):
+        return self._union(self.words, self.words.keys_with_prefix(prefix))
+
+    @staticmethod
+    def _union(keys_index, keys):
+        index = keys_index.index
+        if len(keys) == 1:
+            return index[keys[0]]
+        out = set()
+        for key in keys:
+            out |= index[key]
+        return out
@@ -0,0 +1,505 @@
+"""Local multi-user task server: a small HTTP/JSON API on asyncio.
+
+    python -m dailyflow serve --root users/ --port 8765
+
+Every user has their own data file, ``<root>/<user>.json`` (``.db`` with
+``--sqlite``), opened through :func:`~dailyflow.storage.open_storage` like
+the app's. Routes (request and response bodies are JSON):
+
+    GET    /users/<user>/tasks                 pending tasks (?all=1, ?category=)
+    POST   /users/<user>/tasks                 add {"title", "category", ...}
+    GET    /users/<user>/tasks/<id>
+    PATCH  /users/<user>/tasks/<id>            edit any of the same fields
+    POST   /users/<user>/tasks/<id>/complete
+    DELETE /users/<user>/tasks/<id>
+    POST   /users/<user>/plan                  {"start", "end", "strategy", "days"}
+    GET    /stats                              storage pool counters
+
+Plans include the occurrences of the user's recurring tasks (see
+:mod:`dailyflow.recurrence`); their task ids are negative.
+
+:class:`StoragePool` keeps at most ``capacity`` users' storages open,
+evicting (and closing) the least recently used idle one. Requests for
+one user run one at a time; different users proceed concurrently. Like
+the app's autosave, mutations are acknowledged at once and written by a
+background flush every ``flush_interval`` seconds, off the event loop;
+a user's flush holds their lock like a request. Plans are computed on a
+worker thread too, so a big or "optimal" plan never stalls other users.
+
+Meant for localhost: there is no authentication.
+"""
+
+import asyncio
+import json
+import os
+import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .history import completion
+from .models import PRIORITY_SCORES, ScoreCache, parse_due_ordinal
+from .recurrence import record_schedule
+from .storage import open_storage
+
+MAX_BODY = 1 << 20
+
+_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+_USER = r"(?P<user>[A-Za-z0-9_-]{1,64})"
+_ID = r"(?P<task_id>\d+)"
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------- STORAGE POOL ----------------
+
+
+class _Handle:
+    __slots__ = ("user", "storage", "cache", "lock", "users", "dirty", "closed")
+
+    def __init__(self, user, storage):
+        self.user = user
+        self.storage = storage
+        self.cache = ScoreCache()  # scores reused across this user's plans
+        self.lock = asyncio.Lock()  # one request per user at a time
+        self.users = 0  # requests (or a flush) currently holding the handle
+        self.dirty = False
+        self.closed = False
+
+
+class StoragePool:
+    def __init__(self, root, capacity=128, suffix=".json", flush_interval=1.0):
+        if capacity < 1:
+            raise ValueError("The pool needs room for at least one user.")
+        self.root = root
+        self.capacity = capacity
+        self.suffix = suffix
+        self.flush_interval = flush_interval
+        self._handles = OrderedDict()  # user -> _Handle, least recently used first
+        self._opening = {}  # user -> Future of the _Handle being loaded
+        self._closing = {}  # user -> Future done once its evicted storage is closed
+        self._flusher = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._handles)
+
+    def path_for(self, user):
+        return os.path.join(self.root, user + self.suffix)
+
+    def _load(self, user):
+        storage = open_storage(self.path_for(user))
+        storage.autoflush = False  # the pool's flusher writes
+        storage.load()
+        return storage
+
+    @asynccontextmanager
+    async def use(self, user):
+        """``async with pool.use(user) as handle:`` - exclusive use of a user's storage."""
+        handle = await self._acquire(user)
+        try:
+            async with handle.lock:
+                yield handle
+        finally:
+            handle.users -= 1
+        await self._evict()
+
+    async def _acquire(self, user):
+        loop = asyncio.get_running_loop()
+        while True:
+            handle = self._handles.get(user)
+            if handle is not None:
+                self._handles.move_to_end(user)
+                self.hits += 1
+                handle.users += 1
+                return handle
+            pending = self._opening.get(user)
+            if pending is not None:
+                handle = await asyncio.shield(pending)
+                if handle.closed:
+                    continue  # evicted again before we got to it
+                handle.users += 1
+                return handle
+            closing = self._closing.get(user)
+            if closing is not None:
+                # Don't read the file while its last writes are in flight.
+                await asyncio.shield(closing)
+                continue
+            break
+
+        self.misses += 1
+        future = self._opening[user] = loop.create_future()
+        try:
+            storage = await loop.run_in_executor(None, self._load, user)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: waiters re-raise it themselves
+            raise
+        finally:
+            del self._opening[user]
+        handle = self._handles[user] = _Handle(user, storage)
+        handle.users += 1
+        future.set_result(handle)
+        return handle
+
+    async def _evict(self):
+        while len(self._handles) > self.capacity:
+            victim = next((h for h in self._handles.values() if h.users == 0), None)
+            if victim is None:
+                return  # every handle is in use; shrink later
+            del self._handles[victim.user]
+            victim.closed = True
+            self.evictions += 1
+            await self._close(victim)
+
+    async def _close(self, handle):
+        loop = asyncio.get_running_loop()
+        done = self._closing[handle.user] = loop.create_future()
+        try:
+            await loop.run_in_executor(None, handle.storage.close)
+        finally:
+            del self._closing[handle.user]
+            done.set_result(None)
+
+    # ---------------- FLUSHING ----------------
+
+    def start(self):
+        self._flusher = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Write every user's pending changes (on worker threads)."""
+        dirty = [h for h in self._handles.values() if h.dirty]
+        for h in dirty:
+            h.users += 1  # not evicted mid-flush
+        try:
+            results = await asyncio.gather(
+                *(self._flush_one(h) for h in dirty), return_exceptions=True
+            )
+        finally:
+            for h in dirty:
+                h.users -= 1
+        for h, result in zip(dirty, results):
+            if isinstance(result, Exception):
+                h.dirty = True  # retry on the next round
+                print(f"Failed to save {h.user}: {result}")
+
+    async def _flush_one(self, handle):
+        # A flush may compact, which reads every task; requests for the
+        # user change them, so they wait (like two requests would).
+        async with handle.lock:
+            handle.dirty = False
+            await asyncio.get_running_loop().run_in_executor(None, handle.storage.flush)
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        handles = list(self._handles.values())
+        self._handles.clear()
+        for h in handles:
+            h.closed = True
+            await self._close(h)
+
+    def stats(self):
+        return {
+            "open": len(self._handles),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# ---------------- REQUEST HANDLERS ----------------
+
+
+def _task_fields(body, partial=False):
+    """Validated Task keyword arguments from a request body."""
+    fields = {}
+    if "title" in body or not partial:
+        title = body.get("title")
+        if not isinstance(title, str) or not title.strip():
+            raise ValueError("A title is required.")
+        fields["title"] = title.strip()
+    if "category" in body:
+        category = body["category"]
+        if not isinstance(category, str) or not category.strip():
+            raise ValueError("Category must be a non-empty string.")
+        fields["category"] = category.strip()
+    if "priority" in body:
+        if body["priority"] not in PRIORITY_SCORES:
+            raise ValueError(f"Priority must be one of {', '.join(PRIORITY_SCORES)}.")
+        fields["priority"] = body["priority"]
+    if "due_date" in body:
+        due = body["due_date"]
+        if due is not None and parse_due_ordinal(due) is None:
+            raise ValueError("Due date must be YYYY-MM-DD or null.")
+        fields["due_date"] = due
+    if "duration_minutes" in body:
+        minutes = body["duration_minutes"]
+        if type(minutes) is not int or minutes <= 0:
+            raise ValueError("Duration must be a positive number of minutes.")
+        fields["duration_minutes"] = minutes
+    return fields
+
+
+def _get_task(handle, task_id):
+    task = handle.storage.tasks.get(int(task_id))
+    if task is None:
+        raise HTTPError(404, f"No task {task_id}.")
+    return task
+
+
+def _run_plan(tasks, body, cache, dependencies=None, templates=()):
+    """Plan and apply it; returns (plan, the tasks and occurrences planned)."""
+    from datetime import date, timedelta
+
+    from .models import TaskStore
+    from .planner import STRATEGIES, apply_plan, parse_time, plan_day
+    from .recurrence import PlanningView, expand
+
+    start = parse_time(body.get("start", "08:00"))
+    end = parse_time(body.get("end", "22:00"))
+    if start is None or end is None:
+        raise ValueError("Start/End time must be in HH:MM format.")
+    days = body.get("days", 1)
+    if type(days) is not int or not 1 <= days <= 366:
+        raise ValueError("Days must be a whole number from 1 to 366.")
+    strategy = body.get("strategy", "greedy")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Strategy must be one of {', '.join(STRATEGIES)}.")
+    # Recurring tasks only exist as occurrences of the days being planned.
+    first = date.today()
+    occurrences = expand(templates, first, first + timedelta(days=days - 1))
+    tasks = PlanningView(tasks, TaskStore(occurrences))
+    if days > 1:
+        from .horizon import plan_horizon
+
+        plan = plan_horizon(tasks, days, start, end, cache=cache, dependencies=dependencies)
+    else:
+        plan = plan_day(
+            tasks, start, end, strategy=strategy, cache=cache, dependencies=dependencies
+        )
+    apply_plan(tasks, plan)
+    return plan, tasks
+
+
+class TaskServer:
+    def __init__(self, pool):
+        self.pool = pool
+        self.requests = 0
+        self._routes = [
+            ("GET", re.compile(rf"/users/{_USER}/tasks"), self.list_tasks),
+            ("POST", re.compile(rf"/users/{_USER}/tasks"), self.add_task),
+            ("GET", re.compile(rf"/users/{_USER}/tasks/{_ID}"), self.get_task),
+            ("PATCH", re.compile(rf"/users/{_USER}/tasks/{_ID}"), self.edit_task),
+            ("POST", re.compile(rf"/users/{_USER}/tasks/{_ID}/complete"), self.complete_task),
+            ("DELETE", re.compile(rf"/users/{_USER}/tasks/{_ID}"), self.delete_task),
+            ("POST", re.compile(rf"/users/{_USER}/plan"), self.plan),
+        ]
+
+    async def dispatch(self, method, target, body):
+        """(status, JSON-able payload) for one request."""
+        url = urlsplit(target)
+        path = unquote(url.path).rstrip("/") or "/"
+        if path == "/stats" and method == "GET":
+            return 200, dict(self.pool.stats(), requests=self.requests)
+        allowed = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                raise HTTPError(400, "Body is not valid JSON.") from None
+            if not isinstance(data, dict):
+                raise HTTPError(400, "Expected a JSON object.")
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            params = match.groupdict()
+            async with self.pool.use(params.pop("user")) as handle:
+                return await handler(handle, data, query, **params)
+        if allowed:
+            raise HTTPError(405, f"{method} is not supported here.")
+        raise HTTPError(404, f"No route for {path}.")
+
+    async def list_tasks(self, handle, body, query):
+        tasks = handle.storage.tasks
+        if query.get("all") not in ("1", "true"):
+            tasks = (t for t in tasks if not t.completed)
+        category = query.get("category")
+        if category:
+            tasks = (t for t in tasks if t.category == category)
+        return 200, {"tasks": [t.to_dict() for t in tasks]}
+
+    async def add_task(self, handle, body, query):
+        fields = _task_fields(body)
+        storage = handle.storage
+        task = storage.tasks.create(fields.pop("title"), **fields)
+        storage.add(task)
+        handle.dirty = True
+        return 201, task.to_dict()
+
+    async def get_task(self, handle, body, query, task_id):
+        return 200, _get_task(handle, task_id).to_dict()
+
+    async def edit_task(self, handle, body, query, task_id):
+        task = _get_task(handle, task_id)
+        for name, value in _task_fields(body, partial=True).items():
+            setattr(task, name, value)
+        handle.storage.put(task)
+        handle.dirty = True
+        return 200, task.to_dict()
+
+    async def complete_task(self, handle, body, query, task_id):
+        task = _get_task(handle, task_id)
+        if not task.completed:
+            handle.storage.history.record([completion(task)])
+        task.completed = True
+        task.start_min = None
+        task.end_min = None
+        handle.storage.complete(task)
+        handle.dirty = True
+        return 200, task.to_dict()
+
+    async def delete_task(self, handle, body, query, task_id):
+        task = _get_task(handle, task_id)
+        handle.storage.tasks.remove(task.id)
+        handle.storage.delete(task.id)
+        handle.dirty = True
+        return 200, {"deleted": task.id}
+
+    async def plan(self, handle, body, query):
+        storage = handle.storage
+        # The user's lock is held, so nothing else touches these tasks.
+        # A CycleError in the links is a ValueError, so it answers 400.
+        plan, planned = await asyncio.get_running_loop().run_in_executor(
+            None,
+            _run_plan,
+            storage.tasks,
+            body,
+            handle.cache,
+            storage.dependencies,
+            list(storage.templates.values()),
+        )
+        record_schedule(storage, [t for t in planned if not t.completed])
+        handle.dirty = True
+        return 200, {
+            "slots": [
+                {"task_id": s.task_id, "start": s.start.isoformat(), "end": s.end.isoformat()}
+                for s in plan.slots
+            ],
+            "unscheduled": list(plan.unscheduled),
+        }
+
+    # ---------------- HTTP ----------------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as e:
+                    _write_response(writer, e.status, {"error": str(e)}, False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                self.requests += 1
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except ValueError as e:
+                    status, payload = 400, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """(method, target, headers, body) of the next request, or None at EOF."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length") or "0"
+    if not (length.isascii() and length.isdigit()):  # no sign, no spaces
+        raise HTTPError(400, "Invalid Content-Length.")
+    length = int(length)
+    if length > MAX_BODY:
+        raise HTTPError(413, "Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+async def start_server(root, host="127.0.0.1", port=8765, capacity=128, sqlite=False, **kwargs):
+    """Start serving; returns ``(asyncio server, TaskServer)``. ``port=0`` picks a free port."""
+    os.makedirs(root, exist_ok=True)
+    pool = StoragePool(root, capacity, ".db" if sqlite else ".json", **kwargs)
+    pool.start()
+    app = TaskServer(pool)
+    server = await asyncio.start_server(app.handle_connection, host, port, backlog=1024)
+    return server, app
+
+
+async def serve(root, host="127.0.0.1", port=8765, **kwargs):
+    server, app = await start_server(root, host, port, **kwargs)
+    print(f"Serving {os.path.abspath(root)} on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await app.pool.close()
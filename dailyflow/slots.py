@@ -0,0 +1,112 @@
+"""First-fit search over free time windows.
+
+:class:`FreeSlots` holds a sorted list of free windows (epoch minutes) and
+a max segment tree over their remaining capacity, so "the earliest window
+where a task of this length still fits" is answered in O(log n) instead
+of walking every window. Tasks are placed back-to-back from the start of
+a window, each followed by the usual break; like ``plan_day``, the break
+after the last task in a window may run past its end.
+"""
+
+from bisect import bisect_left
+
+from .planner import BREAK_MINUTES
+
+_NONE = -1
+
+
+class FreeSlots:
+    def __init__(self, windows):
+        windows = sorted(windows)
+        self.starts = [s for s, _ in windows]
+        self.ends = [e for _, e in windows]
+        self.cursors = list(self.starts)  # next free minute in each window
+        n = len(windows)
+        size = 1
+        while size < max(n, 1):
+            size *= 2
+        self._size = size
+        # tree[size + i] = room left in window i, counting one trailing break
+        self._tree = [_NONE] * (2 * size)
+        for i in range(n):
+            self._tree[size + i] = self.ends[i] + BREAK_MINUTES - self.starts[i]
+        for i in range(size - 1, 0, -1):
+            self._tree[i] = max(self._tree[2 * i], self._tree[2 * i + 1])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def last_window_before(self, minute):
+        """Index of the last window starting before ``minute`` (-1 if none)."""
+        return bisect_left(self.starts, minute) - 1
+
+    def earliest_after(self, ends, task_ids):
+        """``earliest`` for a task that must follow ``task_ids``.
+
+        ``ends`` maps placed tasks to their end minute. Returns -1 if one of
+        them is not placed, else the start of the window the last of them
+        ends in: that window's cursor, and every later window, is past it.
+        """
+        last = None
+        for task_id in task_ids:
+            end = ends.get(task_id)
+            if end is None:
+                return -1
+            if last is None or end > last:
+                last = end
+        return None if last is None else self.starts[self.last_window_before(last)]
+
+    def _first_fit(self, need, limit, first=0):
+        # Leftmost leaf in [first, limit] with value >= need.
+        tree = self._tree
+        if limit < first or tree[1] < need:
+            return None
+        node, lo, hi = 1, 0, self._size - 1
+        stack = []
+        while True:
+            if lo > limit or hi < first or tree[node] < need:
+                if not stack:
+                    return None
+                node, lo, hi = stack.pop()
+                continue
+            if lo == hi:
+                return lo
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid + 1, hi))
+            node, hi = 2 * node, mid
+
+    def _set(self, i, value):
+        tree = self._tree
+        i += self._size
+        tree[i] = value
+        i //= 2
+        while i:
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    def place(self, duration, deadline=None, earliest=None):
+        """Book ``duration`` minutes in the earliest window that fits.
+
+        With ``deadline`` (epoch minutes) only windows starting before it
+        are considered and the slot must end by then; with ``earliest``
+        only windows starting at or after it. Returns ``(start, end)`` or
+        None.
+        """
+        limit = len(self.starts) - 1
+        if deadline is not None:
+            limit = min(limit, self.last_window_before(deadline))
+        first = 0 if earliest is None else bisect_left(self.starts, earliest)
+        need = duration + BREAK_MINUTES
+        while True:
+            i = self._first_fit(need, limit, first)
+            if i is None:
+                return None
+            start = self.cursors[i]
+            end = start + duration
+            if deadline is not None and end > deadline:
+                # Only the last candidate window can straddle the deadline.
+                limit = i - 1
+                continue
+            self.cursors[i] = end + BREAK_MINUTES
+            self._set(i, self.ends[i] - end)
+            return start, end
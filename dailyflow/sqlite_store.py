@@ -0,0 +1,323 @@
+"""SQLite storage backend (stdlib ``sqlite3``, WAL mode).
+
+Tasks are stored one row each, with indexes on ``completed``, ``due_date``,
+``category`` and ``start_min`` so the pending backlog and a day's plan are
+indexed queries rather than a full load. Recurring-task templates are few
+and small, so each is one JSON row in ``templates``; prerequisite links
+are one ``dependencies`` row per edge. The completion log is the same
+append-only file as with the JSON backend (``<path>.history``, see
+:mod:`dailyflow.history`). Mutations run inside an implicit
+transaction that ``flush()`` commits. The connection may be shared with a
+background saver thread; every use of it holds ``self.lock``.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+from functools import wraps
+
+from .history import CompletionLog
+from .models import Task, TaskStore
+from .recurrence import RecurringTask
+from .storage import Storage
+
+_COLUMNS = (
+    "id, title, category, due_date, duration_minutes, priority, completed, start_min, end_min"
+)
+
+_INSERT = f"INSERT OR REPLACE INTO tasks ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?)"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT 'General',
+    due_date TEXT,
+    duration_minutes INTEGER NOT NULL DEFAULT 60,
+    priority TEXT NOT NULL DEFAULT 'Medium',
+    completed INTEGER NOT NULL DEFAULT 0,
+    start_min INTEGER,
+    end_min INTEGER
+);
+CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed);
+CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS tasks_category ON tasks (category);
+CREATE INDEX IF NOT EXISTS tasks_start_min ON tasks (start_min);
+CREATE TABLE IF NOT EXISTS templates (
+    id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dependencies (
+    task_id INTEGER NOT NULL,
+    prerequisite_id INTEGER NOT NULL,
+    PRIMARY KEY (task_id, prerequisite_id)
+) WITHOUT ROWID;
+"""
+
+
+def _row(t):
+    return (
+        t.id,
+        t.title,
+        t.category,
+        t.due_date,
+        t.duration_minutes,
+        t.priority,
+        int(bool(t.completed)),
+        t.start_min,
+        t.end_min,
+    )
+
+
+def _task(row):
+    t = Task(row[0], row[1], row[2], row[3], row[4], row[5], bool(row[6]))
+    t.start_min = row[7]
+    t.end_min = row[8]
+    return t
+
+
+def _locked(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class SqliteStorage(Storage):
+    indexed = True
+
+    def __init__(self, path, check_same_thread=False):
+        super().__init__()
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL is durable across application crashes and only risks
+        # the last commits on power loss, without an fsync per commit.
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.history = CompletionLog(path + ".history")
+
+    @_locked
+    def _select(self, where="", params=()):
+        cur = self.conn.execute(f"SELECT {_COLUMNS} FROM tasks {where}", params)
+        return [_task(r) for r in cur]
+
+    def load(self):
+        self.tasks = TaskStore(self._select("ORDER BY id"))
+        with self.lock:
+            self.templates = self._load_templates(self.conn)
+            self.dependencies = self._load_dependencies(self.conn)
+        self.history.load()
+        return self.tasks
+
+    @staticmethod
+    def _load_templates(conn):
+        rows = conn.execute("SELECT data FROM templates")
+        return {t.id: t for t in (RecurringTask.from_dict(json.loads(d)) for (d,) in rows)}
+
+    @staticmethod
+    def _load_dependencies(conn):
+        links = {}
+        for task_id, prerequisite_id in conn.execute("SELECT * FROM dependencies"):
+            links.setdefault(task_id, []).append(prerequisite_id)
+        return {i: tuple(ids) for i, ids in links.items()}
+
+    def load_batches(self, batch_size=5000):
+        # A private connection, so this can run on a loader thread.
+        conn = sqlite3.connect(self.path)
+        tasks = TaskStore()
+        try:
+            cur = conn.execute(f"SELECT {_COLUMNS} FROM tasks ORDER BY id")
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                batch = [_task(r) for r in rows]
+                for t in batch:
+                    tasks.add(t)
+                yield batch
+            templates = self._load_templates(conn)
+            dependencies = self._load_dependencies(conn)
+        finally:
+            conn.close()
+        self.templates = templates
+        self.dependencies = dependencies
+        self.history.load()
+        self.tasks = tasks
+
+    def iter_tasks(self, batch_size=5000):
+        """Every task in id order, read lazily in batches.
+
+        Each batch is one locked query that resumes after the last id seen,
+        so the lock is not held between batches and no cursor stays open
+        on the shared connection.
+        """
+        batch = self._select("ORDER BY id LIMIT ?", (batch_size,))
+        while batch:
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            last = batch[-1].id
+            batch = self._select("WHERE id > ? ORDER BY id LIMIT ?", (last, batch_size))
+
+    @_locked
+    def next_id(self):
+        (max_id,) = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()
+        return (max_id or 0) + 1
+
+    def get(self, task_id):
+        found = self._select("WHERE id = ?", (task_id,))
+        return found[0] if found else None
+
+    # ---------------- MUTATIONS ----------------
+
+    @_locked
+    def add(self, task):
+        self.conn.execute(_INSERT, _row(task))
+
+    put = add
+
+    @_locked
+    def add_many(self, tasks):
+        self.conn.executemany(_INSERT, (_row(t) for t in tasks))
+
+    @_locked
+    def complete(self, task):
+        self.conn.execute(
+            "UPDATE tasks SET completed = 1, start_min = NULL, end_min = NULL WHERE id = ?",
+            (task.id,),
+        )
+
+    put_many = add_many
+
+    @_locked
+    def complete_many(self, tasks):
+        self.conn.executemany(
+            "UPDATE tasks SET completed = 1, start_min = NULL, end_min = NULL WHERE id = ?",
+            ((t.id,) for t in tasks),
+        )
+
+    @_locked
+    def delete(self, task_id):
+        self.delete_many((task_id,))
+
+    @_locked
+    def delete_many(self, task_ids):
+        ids = [(i,) for i in task_ids]
+        self.conn.executemany("DELETE FROM tasks WHERE id = ?", ids)
+        # Links to a deleted task are ignored by the planner; its own go.
+        self.conn.executemany("DELETE FROM dependencies WHERE task_id = ?", ids)
+
+    @_locked
+    def put_template(self, template):
+        self.templates[template.id] = template
+        self.conn.execute(
+            "INSERT OR REPLACE INTO templates (id, data) VALUES (?, ?)",
+            (template.id, json.dumps(template.to_dict())),
+        )
+
+    @_locked
+    def delete_template(self, template_id):
+        self.templates.pop(template_id, None)
+        self.conn.execute("DELETE FROM templates WHERE id = ?", (template_id,))
+
+    @_locked
+    def set_prerequisites(self, task_id, prerequisite_ids):
+        self.conn.execute("DELETE FROM dependencies WHERE task_id = ?", (task_id,))
+        self.conn.executemany(
+            "INSERT INTO dependencies (task_id, prerequisite_id) VALUES (?, ?)",
+            ((task_id, p) for p in prerequisite_ids),
+        )
+
+    @_locked
+    def schedule(self, tasks):
+        self.conn.executemany(
+            "UPDATE tasks SET start_min = ?, end_min = ? WHERE id = ?",
+            ((t.start_min, t.end_min, t.id) for t in tasks),
+        )
+
+    @_locked
+    def flush(self):
+        self.conn.commit()
+        self.history.flush()
+
+    @_locked
+    def compact(self):
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.history.snapshot()
+
+    @_locked
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+        self.history.snapshot()
+
+    # ---------------- QUERIES ----------------
+
+    def pending(self):
+        return self._select("WHERE completed = 0 ORDER BY id")
+
+    def scheduled_between(self, start_min, end_min):
+        return self._select(
+            "WHERE start_min >= ? AND start_min < ? AND completed = 0 ORDER BY start_min",
+            (start_min, end_min),
+        )
+
+    def by_category(self, category, pending_only=True):
+        where = "WHERE category = ?" + (" AND completed = 0" if pending_only else "")
+        return self._select(where + " ORDER BY id", (category,))
+
+    def due_between(self, first, last, pending_only=True):
+        """Tasks due between two 'YYYY-MM-DD' dates (inclusive)."""
+        where = "WHERE due_date BETWEEN ? AND ?" + (" AND completed = 0" if pending_only else "")
+        return self._select(where + " ORDER BY due_date, id", (first, last))
+
+
+def migrate_json(json_path, db_path):
+    """One-shot copy of a JSON data file (and its journal) into SQLite.
+
+    Returns the number of tasks written. Existing rows with the same ids
+    are replaced, so the migration can safely be re-run. The source files
+    are only read.
+
+    The completion log (and its rollup snapshot) is copied along if the
+    database has none yet; one that already exists is left as it is, so a
+    re-run does not count completions twice.
+    """
+    from .journal import JournalStorage
+
+    source = JournalStorage(json_path)
+    tasks = source.load()  # nothing is written until a mutation
+
+    target = SqliteStorage(db_path)
+    try:
+        history = target.history
+        if os.path.exists(source.history.path) and not os.path.exists(history.path):
+            # Rollups after the log: a log without them is replayed in full.
+            tmp = history.path + ".tmp"
+            shutil.copyfile(source.history.path, tmp)
+            os.replace(tmp, history.path)
+            if os.path.exists(source.history.rollup_path):
+                shutil.copyfile(source.history.rollup_path, history.rollup_path)
+        with target.conn:
+            target.add_many(tasks)
+            for template in source.templates.values():
+                target.put_template(template)
+            for task_id, prerequisite_ids in source.dependencies.items():
+                target.set_prerequisites(task_id, prerequisite_ids)
+    finally:
+        target.close()
+    return len(tasks)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m dailyflow.sqlite_store DATA.json TASKS.db")
+    count = migrate_json(sys.argv[1], sys.argv[2])
+    print(f"Migrated {count} tasks to {sys.argv[2]}")
@@ -0,0 +1,91 @@
+"""Fast startup: load tasks off the UI thread and time what startup costs.
+
+:class:`BackgroundLoader` runs ``storage.load_batches()`` on a daemon
+thread and hands the batches over through a queue; the GUI drains it from
+an ``after()`` callback, so the window is drawn and responsive while a
+large data file is still being read. :class:`StartupTimer` records named
+marks (imports done, window built, first paint, data loaded) and prints the
+split when ``DAILYFLOW_STARTUP_REPORT=1`` is set.
+
+GUI-free: nothing here imports tkinter.
+"""
+
+import os
+import queue
+import sys
+import threading
+import time
+
+from . import profiling
+
+
+class StartupTimer:
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = []  # (name, seconds since t0)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.t0))
+
+    def has(self, *names):
+        marked = {name for name, _ in self.marks}
+        return all(name in marked for name in names)
+
+    def report(self):
+        lines = [f"{'startup':<14} {'step':>9} {'total':>9}"]
+        previous = 0.0
+        for name, at in self.marks:
+            lines.append(f"{name:<14} {(at - previous) * 1000:>7.0f}ms {at * 1000:>7.0f}ms")
+            previous = at
+        return "\n".join(lines)
+
+    def print_report(self, file=None):
+        """Print the report if ``DAILYFLOW_STARTUP_REPORT`` is set."""
+        if os.environ.get("DAILYFLOW_STARTUP_REPORT"):
+            print(self.report(), file=file or sys.stderr)
+
+
+class BackgroundLoader:
+    """Load a Storage on a worker thread; poll() the results from the UI thread.
+
+    poll() returns ``(batches, done, error)``: the task batches read since
+    the last call, whether loading has finished, and the exception that
+    stopped it (if any). Once ``done``, ``storage.tasks`` is the complete
+    TaskStore.
+    """
+
+    def __init__(self, storage, batch_size=5000):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.done = False
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="dailyflow-load", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            with profiling.span("load_data"):
+                for batch in self.storage.load_batches(self.batch_size):
+                    self._queue.put(("batch", batch))
+        except Exception as e:
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("done", None))
+
+    def poll(self):
+        batches = []
+        error = None
+        while not self.done:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "batch":
+                batches.append(value)
+            else:
+                self.done = True
+                error = value
+        return batches, self.done, error
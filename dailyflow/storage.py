@@ -0,0 +1,141 @@
+"""Pluggable persistence backends for tasks.
+
+Every backend implements the :class:`Storage` interface: ``load()`` returns
+the full :class:`~dailyflow.models.TaskStore`, the mutation methods record a
+change that ``flush()`` makes durable, and the query helpers answer the
+common questions (pending backlog, what is scheduled in a time range)
+without the caller walking every task. :func:`open_storage` picks the
+backend from the file name.
+"""
+
+import threading
+
+from .models import TaskStore
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+class Storage:
+    # True if the queries below work without load() (they hit an index).
+    indexed = False
+    # Backends that buffer writes may flush on their own once the buffer
+    # fills; a background saver turns this off to keep disk off the caller.
+    autoflush = True
+
+    def __init__(self):
+        self.tasks = TaskStore()
+        # Recurring task templates by id (see dailyflow.recurrence); loaded
+        # along with the tasks.
+        self.templates = {}
+        # Prerequisite links, task id -> tuple of task ids it waits for
+        # (see dailyflow.dependencies); loaded along with the tasks.
+        self.dependencies = {}
+        # Completion log and rollups (a dailyflow.history.CompletionLog),
+        # saved by flush()/compact()/close() along with the tasks.
+        self.history = None
+        # Mutations (UI thread) and flush() (possibly a background saver)
+        # may run concurrently; backends serialize their state with this.
+        self.lock = threading.RLock()
+
+    def load(self):
+        raise NotImplementedError
+
+    def load_batches(self, batch_size=5000):
+        """Load like load(), yielding lists of tasks as they are read.
+
+        Lets a caller show a large file progressively (see
+        :mod:`dailyflow.startup`). Backends with a journal yield the
+        snapshot before replaying it, so a yielded task may still change;
+        ``self.tasks`` holds the final state once the generator is done.
+        """
+        tasks = list(self.load())
+        for i in range(0, len(tasks), batch_size):
+            yield tasks[i : i + batch_size]
+
+    # ---------------- MUTATIONS ----------------
+
+    def add(self, task):
+        raise NotImplementedError
+
+    def put(self, task):
+        """Record every field of an edited task."""
+        raise NotImplementedError
+
+    def complete(self, task):
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        raise NotImplementedError
+
+    def schedule(self, tasks):
+        """Record the current start/end of ``tasks``."""
+        raise NotImplementedError
+
+    # Bulk forms of the above, for multi-select edits. Backends override
+    # them to record the whole batch as one change.
+
+    def put_many(self, tasks):
+        for t in tasks:
+            self.put(t)
+
+    def complete_many(self, tasks):
+        for t in tasks:
+            self.complete(t)
+
+    def delete_many(self, task_ids):
+        for task_id in task_ids:
+            self.delete(task_id)
+
+    def put_template(self, template):
+        """Record a new or changed recurring-task template.
+
+        Also sets ``self.templates[template.id]``, under ``self.lock`` like
+        :meth:`delete_template`, so a background save never sees the dict
+        change mid-way.
+        """
+        raise NotImplementedError
+
+    def delete_template(self, template_id):
+        raise NotImplementedError
+
+    def set_prerequisites(self, task_id, prerequisite_ids):
+        """Record the tasks ``task_id`` waits for (empty: none)."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Make every recorded mutation durable."""
+
+    def compact(self):
+        """Rewrite the backing files in their most compact form."""
+        self.flush()
+
+    def close(self):
+        self.flush()
+
+    # ---------------- QUERIES ----------------
+    # Defaults work on the loaded TaskStore; indexed backends override them.
+
+    def pending(self):
+        """Incomplete tasks, in id order."""
+        return [t for t in self.tasks if not t.completed]
+
+    def scheduled_between(self, start_min, end_min):
+        """Incomplete tasks whose slot starts in [start_min, end_min), by start."""
+        found = [
+            t
+            for t in self.tasks
+            if not t.completed and t.start_min is not None and start_min <= t.start_min < end_min
+        ]
+        found.sort(key=lambda t: t.start_min)
+        return found
+
+
+def open_storage(path, **kwargs):
+    """SQLite for ``*.db``/``*.sqlite``/``*.sqlite3``, the JSON journal otherwise."""
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        from .sqlite_store import SqliteStorage
+
+        return SqliteStorage(path, **kwargs)
+    from .journal import JournalStorage
+
+    return JournalStorage(path, **kwargs)
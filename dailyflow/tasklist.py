@@ -0,0 +1,169 @@
+"""Virtualized, diffing "All Tasks" list on top of a ttk.Treeview.
+
+Only the rows in (or just below) the viewport exist as Treeview items; the
+scrollbar is driven from the full id list, so scrolling a 100k-task list
+just swaps a screenful of rows. Items are keyed by task id (the Treeview
+iid is ``str(task.id)``), and a refresh only inserts, deletes, moves or
+re-values the rows that actually changed.
+
+Needs tkinter; import it from GUI code only.
+"""
+
+
+from . import profiling
+
+
+def row_values(t):
+    status = "Done" if t.completed else "Pending"
+    return (
+        f"{t.id}: {t.title}",
+        t.category,
+        t.priority,
+        t.due_date or "-",
+        f"{t.duration_minutes}m",
+        status,
+    )
+
+
+class VirtualTaskList:
+    def __init__(self, tree, scrollbar, overscan=10, row_height=20):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.tasks = None  # TaskStore being shown
+        self.overscan = overscan
+        self.row_height = row_height
+        self.ids = []  # every task id, in display order
+        self.offset = 0  # index in self.ids of the top visible row
+        self.visible = int(str(tree.cget("height")) or 10)
+        self._shown = {}  # iid -> values currently in the tree
+        self._selected = set()  # selected task ids, including scrolled-out ones
+        self._rendering = False
+
+        scrollbar.configure(command=self.yview)
+        tree.configure(yscrollcommand=self._on_tree_scrolled)
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<Configure>", self._on_resize, add="+")
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(seq, self._on_wheel, add="+")
+
+    # ---------------- PUBLIC API ----------------
+
+    def refresh(self, tasks, ids=None):
+        """Show ``tasks``; only the visible rows that changed are touched.
+
+        ``ids`` (e.g. search results) limits the list to those task ids,
+        shown in id order.
+        """
+        self.tasks = tasks
+        self.ids = [t.id for t in tasks] if ids is None else sorted(ids)
+        self._selected.intersection_update(self.ids)
+        self.offset = max(0, min(self.offset, len(self.ids) - self.visible))
+        self._render()
+
+    def select_all(self):
+        """Select every task in the list, including rows scrolled out of view."""
+        self._selected = set(self.ids)
+        self._render()
+
+    def selected_ids(self):
+        """Selected task ids in display order."""
+        if not self._selected:
+            return []
+        return [i for i in self.ids if i in self._selected]
+
+    # ---------------- SCROLLING ----------------
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            offset = int(float(args[1]) * len(self.ids))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            offset = self.offset + int(args[1]) * step
+        else:
+            return
+        self._scroll_to(offset)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.ids) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self.offset - 3)
+        else:
+            self._scroll_to(self.offset + 3)
+        return "break"
+
+    def _on_tree_scrolled(self, first, last):
+        # The tree scrolled itself (keyboard navigation into the overscan
+        # rows): fold that into our offset and re-window.
+        if self._rendering:
+            return
+        top = round(float(first) * len(self._shown))
+        if top:
+            self._scroll_to(self.offset + top)
+
+    def _on_resize(self, event):
+        # One row's worth of height goes to the column headings.
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    def _on_select(self, _event=None):
+        if self._rendering:
+            return
+        window = {int(iid) for iid in self._shown}
+        picked = {int(iid) for iid in self.tree.selection()}
+        self._selected = (self._selected - window) | picked
+
+    # ---------------- RENDERING ----------------
+
+    def _render(self):
+        tree = self.tree
+        window = self.ids[self.offset : self.offset + self.visible + self.overscan]
+        wanted = [str(i) for i in window]
+        wanted_set = set(wanted)
+
+        self._rendering = True
+        try:
+            stale = [iid for iid in self._shown if iid not in wanted_set]
+            if stale:
+                tree.delete(*stale)
+                for iid in stale:
+                    del self._shown[iid]
+
+            current = list(tree.get_children())
+            for index, (iid, task_id) in enumerate(zip(wanted, window)):
+                values = row_values(self.tasks.get(task_id))
+                old = self._shown.get(iid)
+                if old is None:
+                    tree.insert("", index, iid=iid, values=values)
+                    current.insert(index, iid)
+                    profiling.count("task_list.rows_inserted")
+                else:
+                    if old != values:
+                        tree.item(iid, values=values)
+                    if current[index] != iid:
+                        tree.move(iid, "", index)
+                        current.remove(iid)
+                        current.insert(index, iid)
+                self._shown[iid] = values
+
+            selection = [iid for iid in wanted if int(iid) in self._selected]
+            if tuple(selection) != tree.selection():
+                tree.selection_set(selection)
+            tree.yview_moveto(0)
+        finally:
+            self._rendering = False
+
+        total = len(self.ids)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
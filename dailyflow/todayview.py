@@ -0,0 +1,171 @@
+"""Pooled, diff-based renderer for the "Today" plan panel.
+
+Row widgets are created once and reused: each refresh assigns the new plan
+to the existing rows by position, reconfigures only the labels whose text
+changed, and hides (rather than destroys) rows that are no longer needed.
+Fonts are created once per size/weight.
+
+Needs customtkinter; import it from GUI code only.
+"""
+
+import customtkinter as ctk
+
+from . import profiling
+from .models import hhmm
+
+EMPTY_TEXT = "No tasks for today.\nAdd tasks on the left and click 'Auto Plan Day'."
+
+
+def planned_text(t):
+    return f"{t.title}  [{t.category}]  ({t.priority})"
+
+
+def unscheduled_text(t):
+    txt = f"{t.title}  [{t.category}]  ({t.priority})"
+    if t.due_date:
+        txt += f"  • Due: {t.due_date}"
+    return txt
+
+
+class _Row:
+    """One pooled row: a frame plus the widgets whose text we update."""
+
+    __slots__ = ("frame", "time_label", "text_widget", "task_id", "time_text", "text", "shown")
+
+    def __init__(self, frame, time_label, text_widget):
+        self.frame = frame
+        self.time_label = time_label
+        self.text_widget = text_widget
+        self.task_id = None
+        self.time_text = None
+        self.text = None
+        self.shown = False
+
+
+class TodayPlanView:
+    def __init__(self, parent, on_focus):
+        self.parent = parent
+        self.on_focus = on_focus  # called with a task id
+        self._fonts = {}
+        self._planned = []  # pool of planned-slot rows
+        self._unscheduled = []  # pool of unscheduled rows
+        self.widgets_created = 0
+
+        parent.columnconfigure(0, weight=1)
+        self.empty_label = self._label(parent, text=EMPTY_TEXT, font=self.font(14))
+        self.planned_header = self._label(parent, text="Planned Slots", font=self.font(14, "bold"))
+        self.planned_box = self._frame(parent, fg_color="transparent")
+        self.unscheduled_header = self._label(
+            parent, text="Unscheduled Tasks", font=self.font(14, "bold")
+        )
+        self.unscheduled_box = self._frame(parent, fg_color="transparent")
+        self.planned_box.columnconfigure(0, weight=1)
+        self.unscheduled_box.columnconfigure(0, weight=1)
+
+        # Fixed grid rows keep the sections in order when shown/hidden.
+        self._sections = (
+            (self.empty_label, dict(row=0, pady=40)),
+            (self.planned_header, dict(row=1, sticky="w", padx=6, pady=(4, 2))),
+            (self.planned_box, dict(row=2, sticky="ew")),
+            (self.unscheduled_header, dict(row=3, sticky="w", padx=6, pady=(10, 2))),
+            (self.unscheduled_box, dict(row=4, sticky="ew")),
+        )
+        for widget, opts in self._sections:
+            widget.grid(column=0, **opts)
+            widget.grid_remove()
+
+    # ---------------- WIDGET FACTORIES ----------------
+
+    def font(self, size, weight="normal"):
+        key = (size, weight)
+        f = self._fonts.get(key)
+        if f is None:
+            f = self._fonts[key] = ctk.CTkFont(size=size, weight=weight)
+        return f
+
+    def _created(self):
+        self.widgets_created += 1
+        profiling.count("today_view.widgets_created")
+
+    def _label(self, parent, **kwargs):
+        self._created()
+        return ctk.CTkLabel(parent, **kwargs)
+
+    def _frame(self, parent, **kwargs):
+        self._created()
+        return ctk.CTkFrame(parent, **kwargs)
+
+    def _new_planned_row(self):
+        frame = self._frame(self.planned_box)
+        time_label = self._label(frame, text="", width=90, font=self.font(12, "bold"))
+        time_label.pack(side="left", padx=(4, 8))
+        self._created()
+        row = _Row(frame, time_label, None)
+        row.text_widget = ctk.CTkButton(
+            frame,
+            text="",
+            anchor="w",
+            fg_color="#e5e7eb",
+            hover_color="#d1d5db",
+            text_color="#111827",
+            command=lambda: self.on_focus(row.task_id),
+        )
+        row.text_widget.pack(side="left", fill="x", expand=True, padx=(0, 4))
+        return row
+
+    def _new_unscheduled_row(self):
+        frame = self._frame(self.unscheduled_box, fg_color="#f5f5f5")
+        label = self._label(
+            frame, text="", anchor="w", font=self.font(12), text_color="#111827"
+        )
+        label.pack(side="left", padx=6, pady=4)
+        return _Row(frame, None, label)
+
+    # ---------------- RENDERING ----------------
+
+    def render(self, active, unscheduled):
+        """Show ``active`` (time-ordered, scheduled) and ``unscheduled`` tasks."""
+        self._show(self.empty_label, not active and not unscheduled)
+        self._show(self.planned_header, bool(active))
+        self._show(self.planned_box, bool(active))
+        self._show(self.unscheduled_header, bool(unscheduled))
+        self._show(self.unscheduled_box, bool(unscheduled))
+
+        self._fill(
+            self._planned,
+            self._new_planned_row,
+            [(t.id, f"{hhmm(t.start_min)}–{hhmm(t.end_min)}", planned_text(t)) for t in active],
+        )
+        self._fill(
+            self._unscheduled,
+            self._new_unscheduled_row,
+            [(t.id, None, unscheduled_text(t)) for t in unscheduled],
+        )
+
+    def _show(self, widget, visible):
+        if visible != bool(widget.winfo_manager()):
+            if visible:
+                widget.grid()
+            else:
+                widget.grid_remove()
+
+    def _fill(self, pool, factory, items):
+        for i, (task_id, time_text, text) in enumerate(items):
+            if i == len(pool):
+                pool.append(factory())
+            row = pool[i]
+            row.task_id = task_id
+            if time_text != row.time_text:
+                row.time_label.configure(text=time_text)
+                row.time_text = time_text
+            if text != row.text:
+                row.text_widget.configure(text=text)
+                row.text = text
+            if not row.shown:
+                row.frame.grid(row=i, column=0, sticky="ew", padx=6, pady=3)
+                row.shown = True
+        for row in pool[len(items):]:
+            if not row.shown:
+                break
+            row.frame.grid_remove()
+            row.shown = False
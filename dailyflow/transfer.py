@@ -0,0 +1,353 @@
+"""Streaming import/export of task lists.
+
+Task lists move between three formats, picked from the file name:
+
+* ``*.ndjson`` / ``*.jsonl`` - one task object per line;
+* ``*.db`` / ``*.sqlite`` / ``*.sqlite3`` - the SQLite backend;
+* anything else - the ``{"tasks": [...]}`` JSON snapshot.
+
+Readers are generators that yield one task dict at a time, filters are
+generators over those dicts, and writers consume them one by one, so a
+copy holds a single record (plus a read buffer) in memory however long the
+list is. The JSON snapshot is parsed incrementally with
+``JSONDecoder.raw_decode`` over fixed-size chunks instead of ``json.load``.
+
+A JSON data file the app is using may have a journal of changes next to
+it (see :mod:`dailyflow.journal`). Such a file is read and written through
+:class:`~dailyflow.journal.JournalStorage` instead, which holds the whole
+list in memory but sees (and leaves) the data as the app does.
+
+Command line::
+
+    python -m dailyflow.transfer SRC DST [--pending] [--category NAME ...]
+
+``-`` reads stdin / writes stdout as NDJSON.
+"""
+
+import json
+import os
+import sys
+
+from .models import Task
+from .storage import SQLITE_SUFFIXES
+
+CHUNK_SIZE = 1 << 16
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+_DUMP = json.JSONEncoder(separators=(",", ":")).encode
+_WHITESPACE = " \t\r\n"
+
+
+def _format(path):
+    lower = path.lower()
+    if path == "-" or lower.endswith(NDJSON_SUFFIXES):
+        return "ndjson"
+    if lower.endswith(SQLITE_SUFFIXES):
+        return "sqlite"
+    return "json"
+
+
+# ---------------- READERS ----------------
+
+
+class _ChunkReader:
+    """Just enough of a pull parser to walk ``{"tasks": [...]}`` lazily."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decode = json.JSONDecoder().raw_decode
+
+    def _more(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer stays one chunk or so.
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ("" at end of input), not consumed."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._more():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in task list at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next JSON value, reading more input until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decode(self.buf, self.pos)
+            except ValueError:
+                if self._more():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk.
+            if end < len(self.buf) or not self._more():
+                self.pos = end
+                return value
+
+
+def iter_json(f, chunk_size=CHUNK_SIZE, extra=None):
+    """Yield the task dicts of a ``{"tasks": [...]}`` document, one at a time.
+
+    Other top-level keys are skipped, or parsed into the ``extra`` dict if
+    one is given.
+    """
+    r = _ChunkReader(f, chunk_size)
+    if r.peek() == "":
+        return  # empty file: no tasks
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        key = r.value()
+        r.expect(":")
+        if key != "tasks":
+            value = r.value()  # other top-level keys are small
+            if extra is not None:
+                extra[key] = value
+        else:
+            r.expect("[")
+            if r.peek() == "]":
+                r.pos += 1
+            else:
+                while True:
+                    yield r.value()
+                    if r.peek() == "]":
+                        r.pos += 1
+                        break
+                    r.expect(",")
+        if r.peek() == "}":
+            return
+        r.expect(",")
+
+
+def iter_ndjson(f):
+    """Yield one task dict per non-blank line."""
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Line {lineno}: {e}") from None
+
+
+def iter_sqlite(path):
+    from .sqlite_store import SqliteStorage
+
+    storage = SqliteStorage(path)
+    try:
+        for t in storage.iter_tasks():
+            yield t.to_dict()
+    finally:
+        storage.close()
+
+
+def _has_journal(path):
+    return os.path.exists(path + ".journal") or os.path.exists(path + ".journal.old")
+
+
+def iter_journaled(path):
+    """Task dicts of a JSON data file with its journal replayed."""
+    from .journal import JournalStorage
+
+    storage = JournalStorage(path)
+    storage.load()  # a journal record may change any task, so not streamed
+    for t in storage.tasks:
+        yield t.to_dict()
+
+
+def read_records(path):
+    """Task dicts from ``path`` (``-`` for NDJSON on stdin), streamed."""
+    kind = _format(path)
+    if path == "-":
+        yield from iter_ndjson(sys.stdin)
+    elif kind == "sqlite":
+        yield from iter_sqlite(path)
+    elif kind == "json" and _has_journal(path):
+        yield from iter_journaled(path)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_ndjson(f) if kind == "ndjson" else iter_json(f)
+
+
+def iter_tasks(path):
+    """Like :func:`read_records`, but yields :class:`~dailyflow.models.Task`."""
+    return map(Task.from_dict, read_records(path))
+
+
+# ---------------- FILTERS ----------------
+
+
+def only_pending(records):
+    return (d for d in records if not d.get("completed"))
+
+
+def in_categories(records, categories):
+    categories = set(categories)
+    return (d for d in records if d.get("category", "General") in categories)
+
+
+# ---------------- WRITERS ----------------
+
+
+def write_ndjson(records, f):
+    """Write one compact JSON object per line; return how many were written."""
+    count = 0
+    for d in records:
+        f.write(_DUMP(d))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_json(records, f, extra=None):
+    """Write a ``{"tasks": [...]}`` snapshot; return how many tasks it holds.
+
+    ``extra`` adds other (small) top-level keys after the tasks.
+    """
+    count = 0
+    f.write('{"tasks":[')
+    for d in records:
+        if count:
+            f.write(",")
+        f.write(_DUMP(d))
+        count += 1
+    f.write("]")
+    for key, value in (extra or {}).items():
+        f.write(f",{_DUMP(key)}:{_DUMP(value)}")
+    f.write("}")
+    return count
+
+
+def write_sqlite(records, path, batch=10_000):
+    from itertools import islice
+
+    from .sqlite_store import SqliteStorage
+
+    storage = SqliteStorage(path)
+    count = 0
+    tasks = map(Task.from_dict, records)
+    try:
+        while True:
+            chunk = list(islice(tasks, batch))
+            if not chunk:
+                break
+            storage.add_many(chunk)
+            storage.flush()
+            count += len(chunk)
+    finally:
+        storage.close()
+    return count
+
+
+def write_journaled(records, path, batch=10_000):
+    """Replace the tasks of a JSON data file that has a journal.
+
+    The replacement is journaled like any edit (one delete, then puts) and
+    then compacted, so a crash at any point leaves either the old list or
+    the new one. Templates and links of the file are kept.
+    """
+    from .journal import JournalStorage
+
+    # Read everything first: a bad record must fail before anything is written.
+    tasks = [Task.from_dict(d) for d in records]
+    storage = JournalStorage(path)
+    storage.load()
+    storage.autoflush = False  # one write for the whole replacement
+    try:
+        storage.delete_many([t.id for t in storage.tasks])
+        storage.tasks.clear()
+        for i in range(0, len(tasks), batch):
+            chunk = tasks[i : i + batch]
+            for t in chunk:
+                storage.tasks.add(t)
+            storage.put_many(chunk)
+        storage.compact()
+    finally:
+        storage.close()
+    return len(tasks)
+
+
+def write_records(records, path):
+    """Stream ``records`` into ``path``; return the number written.
+
+    File outputs go to a temp file that is renamed into place at the end,
+    so an interrupted export never leaves a half-written backup behind.
+    """
+    kind = _format(path)
+    if path == "-":
+        return write_ndjson(records, sys.stdout)
+    if kind == "sqlite":
+        return write_sqlite(records, path)
+    if kind == "json" and _has_journal(path):
+        return write_journaled(records, path)
+    writer = write_ndjson if kind == "ndjson" else write_json
+    tmp = path + ".tmp"
+    f = open(tmp, "w", encoding="utf-8")
+    try:
+        with f:
+            count = writer(records, f)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return count
+
+
+def transfer(src, dst, pending=False, categories=None):
+    """Copy tasks from ``src`` to ``dst`` with optional filters; return the count."""
+    records = read_records(src)
+    if pending:
+        records = only_pending(records)
+    if categories:
+        records = in_categories(records, categories)
+    return write_records(records, dst)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m dailyflow.transfer",
+        description="Stream tasks between JSON, NDJSON and SQLite files.",
+    )
+    parser.add_argument("src", help="source file, or - for NDJSON on stdin")
+    parser.add_argument("dst", help="destination file, or - for NDJSON on stdout")
+    parser.add_argument("--pending", action="store_true", help="skip completed tasks")
+    parser.add_argument(
+        "--category", action="append", metavar="NAME", help="keep only this category (repeatable)"
+    )
+    args = parser.parse_args(argv)
+    try:
+        count = transfer(args.src, args.dst, args.pending, args.category)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+    print(f"Copied {count} tasks to {args.dst}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
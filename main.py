@@ -1,90 +1,76 @@
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
-import os
-from datetime import datetime, timedelta, date
+import time
 
-DATA_FILE = "dailyflow_data.json"
+STARTED = time.perf_counter()  # before the heavy imports, for the startup report
 
+import sys
 
-PRIORITY_SCORES = {
-    "Low": 1,
-    "Medium": 2,
-    "High": 3,
-    "Critical": 4,
-}
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # `python main.py plan|add|list ...`: the CLI, without importing Tk.
+    from dailyflow.cli import main as cli_main
 
+    sys.exit(cli_main())
 
-class Task:
-    def __init__(
-        self,
-        task_id,
-        title,
-        category="General",
-        due_date=None,
-        duration_minutes=60,
-        priority="Medium",
-        completed=False,
-        start_time=None,
-        end_time=None,
-    ):
-        self.id = task_id
-        self.title = title
-        self.category = category
-        self.due_date = due_date  # string "YYYY-MM-DD" or None
-        self.duration_minutes = duration_minutes
-        self.priority = priority
-        self.completed = completed
-        self.start_time = start_time  # iso string or None
-        self.end_time = end_time
-
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "category": self.category,
-            "due_date": self.due_date,
-            "duration_minutes": self.duration_minutes,
-            "priority": self.priority,
-            "completed": self.completed,
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-        }
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import os
+from datetime import date
+
+from dailyflow import Task, TaskStore, apply_plan, parse_time, plan_day, profiling
+from dailyflow.autosave import FAILED, AutoSaver
+from dailyflow.busy import BusyCalendar, load_ics, parse_weekly, weekly_blocks
+from dailyflow.dependencies import CycleError, set_prerequisites_many
+from dailyflow.history import completion, now_minutes, report
+from dailyflow.incremental import IncrementalPlanner, apply_diff
+from dailyflow.models import hhmm, parse_due_ordinal, ScoreCache
+from dailyflow.planner import scheduled_today
+from dailyflow.recurrence import PlanningView, expand, is_occurrence, new_template, record_schedule
+from dailyflow.search import TaskIndex
+from dailyflow.startup import BackgroundLoader, StartupTimer
+from dailyflow.storage import open_storage
+from dailyflow.tasklist import VirtualTaskList
+from dailyflow.todayview import TodayPlanView
+
+# A *.db / *.sqlite path selects the SQLite backend.
+DATA_FILE = os.environ.get("DAILYFLOW_DATA", "dailyflow_data.json")
+
+# Tasks load on a worker thread while the window is already up; set
+# DAILYFLOW_SYNC_LOAD=1 to load before building the UI instead.
+SYNC_LOAD = bool(os.environ.get("DAILYFLOW_SYNC_LOAD"))
+LOAD_POLL_MS = 50
+SAVE_STATUS_POLL_MS = 500
+
+# F12 toggles the Performance tab (and profiling); DAILYFLOW_PROFILE=1
+# turns both on from the start.
+PERF_POLL_MS = 1000
+if os.environ.get("DAILYFLOW_PROFILE"):
+    profiling.enable()
+
+STARTUP = StartupTimer(STARTED)
+STARTUP.mark("imports")
+
+PLAN_STRATEGIES = {
+    "Greedy": "greedy",
+    "Best fit": "optimal",
+}
+
+# Recurrence choices in the Add Task form -> dailyflow.recurrence rule
+REPEAT_OPTIONS = {
+    "Does not repeat": None,
+    "Daily": "daily",
+    "Weekdays": "weekdays",
+    "Weekly": "weekly",
+    "Every N days": "every",
+}
 
-    @staticmethod
-    def from_dict(d):
-        return Task(
-            d["id"],
-            d["title"],
-            d.get("category", "General"),
-            d.get("due_date"),
-            d.get("duration_minutes", 60),
-            d.get("priority", "Medium"),
-            d.get("completed", False),
-            d.get("start_time"),
-            d.get("end_time"),
-        )
-
-    def score_for_today(self, today: date):
-        """Higher score = more important to schedule earlier."""
-        base = PRIORITY_SCORES.get(self.priority, 2)
-        urgency = 0
-        if self.due_date:
-            try:
-                d = datetime.strptime(self.due_date, "%Y-%m-%d").date()
-                days_left = (d - today).days
-                if days_left <= 0:
-                    urgency = 3  # overdue / due today
-                elif days_left == 1:
-                    urgency = 2
-                elif days_left <= 3:
-                    urgency = 1
-            except ValueError:
-                pass
-        # Longer tasks get a slight penalty so shorter chunks fit earlier
-        length_penalty = min(1, self.duration_minutes / 240.0)
-        return base + urgency - length_penalty
+# "All Tasks" filters; the first entry of each means "don't filter".
+ANY_CATEGORY = "All categories"
+ANY_PRIORITY = "Any priority"
+STATUS_FILTERS = {
+    "Any status": None,
+    "Pending": False,
+    "Done": True,
+}
 
 
 class DailyFlowApp(ctk.CTk):
@@ -98,13 +84,43 @@ class DailyFlowApp(ctk.CTk):
         self.geometry("1150x700")
         self.minsize(950, 600)
 
-        self.tasks = []
-        self.next_task_id = 1
-
-        self.load_data()
-
+        self.tasks = TaskStore()
+        self.storage = open_storage(DATA_FILE)
+        # Writes changes in the background shortly after they happen.
+        self.autosave = AutoSaver(self.storage)
+        # Set by a greedy "Auto Plan Day"; keeps today's plan current as
+        # tasks are added, completed or deleted.
+        self.planner = None
+        # Busy blocks from an .ics calendar and routines, for this session only
+        self.busy = None
+        # Scores of unchanged tasks are reused across plans (until tomorrow).
+        self.score_cache = ScoreCache()
+        # Token and field indexes behind the All Tasks search box.
+        self.search_index = TaskIndex()
+        # Today's occurrences of recurring tasks; only templates are stored.
+        self.occurrences = TaskStore()
+        self.occurrence_day = None
+        # task id -> epoch minute it was first put in Focus Mode (its actual start)
+        self.focus_started = {}
+        self.startup = STARTUP
+        self.loader = None  # BackgroundLoader while tasks are still loading
+
+        if SYNC_LOAD:
+            self.load_data()
+            self.startup.mark("data loaded")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self.perf_tab = None
         self.build_ui()
+        self.bind("<F12>", self.toggle_performance_tab)
         self.refresh_all_views()
+        self.refresh_analytics()
+        self.startup.mark("window built")
+        self.after(0, self.on_first_paint)
+        self.after(SAVE_STATUS_POLL_MS, self.poll_autosave)
+        if not SYNC_LOAD:
+            self.loader = BackgroundLoader(self.storage).start()
+            self.after(LOAD_POLL_MS, self.poll_load)
 
     # ---------------- UI BUILD ----------------
 
@@ -205,6 +221,14 @@ class DailyFlowApp(ctk.CTk):
         self.priority_option.set("Medium")
         self.priority_option.grid(row=7, column=1, sticky="ew", padx=(6, 0), pady=(0, 8))
 
+        # Repeat (the due date, if any, is the first occurrence)
+        ctk.CTkLabel(form, text="Repeat", anchor="w").grid(row=8, column=0, sticky="w")
+        self.repeat_option = ctk.CTkOptionMenu(form, values=list(REPEAT_OPTIONS))
+        self.repeat_option.grid(row=9, column=0, sticky="ew", pady=(0, 8))
+        ctk.CTkLabel(form, text="N (days)", anchor="w").grid(row=8, column=1, sticky="w")
+        self.repeat_every_entry = ctk.CTkEntry(form, placeholder_text="2")
+        self.repeat_every_entry.grid(row=9, column=1, sticky="ew", padx=(6, 0), pady=(0, 8))
+
         form.columnconfigure(0, weight=1)
         form.columnconfigure(1, weight=1)
 
@@ -219,11 +243,64 @@ class DailyFlowApp(ctk.CTk):
         add_btn.pack(fill="x", padx=16, pady=(8, 4))
 
         # Subheader: All tasks
-        ctk.CTkLabel(
+        self.tasks_header = ctk.CTkLabel(
             parent,
             text="All Tasks",
             font=ctk.CTkFont(size=14, weight="bold"),
-        ).pack(anchor="w", padx=16, pady=(14, 4))
+        )
+        self.tasks_header.pack(anchor="w", padx=16, pady=(14, 4))
+
+        # Search and filters
+        search = ctk.CTkFrame(parent, fg_color="transparent")
+        search.pack(fill="x", padx=14, pady=(0, 4))
+
+        self.search_entry = ctk.CTkEntry(search, placeholder_text="🔍 Search titles")
+        self.search_entry.grid(row=0, column=0, columnspan=3, sticky="ew", pady=(0, 4))
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        self.status_filter = ctk.CTkOptionMenu(
+            search,
+            values=list(STATUS_FILTERS),
+            width=110,
+            command=self.on_search_changed,
+        )
+        self.status_filter.grid(row=0, column=3, sticky="ew", padx=(6, 0), pady=(0, 4))
+
+        self.category_filter = ctk.CTkOptionMenu(
+            search,
+            values=[ANY_CATEGORY],
+            width=110,
+            command=self.on_search_changed,
+        )
+        self.category_filter.grid(row=1, column=0, sticky="ew")
+        self.filter_categories = []
+
+        self.priority_filter = ctk.CTkOptionMenu(
+            search,
+            values=[ANY_PRIORITY, "Low", "Medium", "High", "Critical"],
+            width=100,
+            command=self.on_search_changed,
+        )
+        self.priority_filter.grid(row=1, column=1, sticky="ew", padx=(6, 0))
+
+        self.due_from_entry = ctk.CTkEntry(search, placeholder_text="due from", width=90)
+        self.due_from_entry.grid(row=1, column=2, sticky="ew", padx=(6, 0))
+        self.due_from_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        self.due_to_entry = ctk.CTkEntry(search, placeholder_text="due to", width=90)
+        self.due_to_entry.grid(row=1, column=3, sticky="ew", padx=(6, 0))
+        self.due_to_entry.bind("<KeyRelease>", self.on_search_changed)
+
+        for col in range(4):
+            search.columnconfigure(col, weight=1)
+
+        self.search_count = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#6b7280",
+        )
+        self.search_count.pack(anchor="w", padx=16)
 
         # Treeview for all tasks
         tree_frame = ctk.CTkFrame(parent)
@@ -236,8 +313,9 @@ class DailyFlowApp(ctk.CTk):
             show="headings",
             height=8,
         )
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tasks_tree.yview)
-        self.tasks_tree.configure(yscrollcommand=vsb.set)
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical")
+        # Only the rows on screen exist in the tree; see dailyflow.tasklist
+        self.task_list = VirtualTaskList(self.tasks_tree, vsb)
 
         for col, w in zip(columns, (140, 80, 70, 80, 80, 80)):
             self.tasks_tree.heading(col, text=col.title())
@@ -264,10 +342,42 @@ class DailyFlowApp(ctk.CTk):
             text="🗑 Delete",
             fg_color="#dc2626",
             hover_color="#b91c1c",
-            command=self.delete_selected_task,
+            command=self.delete_selected_tasks,
         )
         delete_btn.pack(side="left")
 
+        # Bulk edits of every selected task (Ctrl+A selects all shown)
+        edit_row = ctk.CTkFrame(parent, fg_color="transparent")
+        edit_row.pack(fill="x", padx=16, pady=(0, 8))
+
+        self.bulk_priority = ctk.CTkOptionMenu(
+            edit_row,
+            values=["Low", "Medium", "High", "Critical"],
+            command=self.set_selected_priority,
+        )
+        self.bulk_priority.set("Set priority…")
+        self.bulk_priority.pack(side="left", padx=(0, 6))
+
+        category_btn = ctk.CTkButton(
+            edit_row,
+            text="🏷 Set category…",
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+            command=self.set_selected_category,
+        )
+        category_btn.pack(side="left", padx=(0, 6))
+
+        depends_btn = ctk.CTkButton(
+            edit_row,
+            text="🔗 Depends on…",
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+            command=self.set_selected_prerequisites,
+        )
+        depends_btn.pack(side="left")
+
+        self.tasks_tree.bind("<Control-a>", self.select_all_tasks)
+
         save_btn = ctk.CTkButton(
             parent,
             text="💾 Save Now",
@@ -275,7 +385,15 @@ class DailyFlowApp(ctk.CTk):
             hover_color="#4b5563",
             command=self.save_data,
         )
-        save_btn.pack(fill="x", padx=16, pady=(0, 10))
+        save_btn.pack(fill="x", padx=16, pady=(0, 2))
+
+        self.save_status = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#6b7280",
+        )
+        self.save_status.pack(anchor="w", padx=16, pady=(0, 8))
 
     def build_right_panel(self, parent):
         header_row = ctk.CTkFrame(parent, fg_color="transparent")
@@ -320,16 +438,54 @@ class DailyFlowApp(ctk.CTk):
         )
         plan_btn.pack(side="left", padx=(8, 0))
 
+        # "Best fit" packs the window with the highest-value set of tasks
+        # instead of stopping at the first one that doesn't fit.
+        self.strategy_option = ctk.CTkOptionMenu(
+            header_row,
+            width=100,
+            values=list(PLAN_STRATEGIES),
+        )
+        self.strategy_option.set("Greedy")
+        self.strategy_option.pack(side="left", padx=(6, 0))
+
+        # Book the durations learned from focused work (dailyflow.estimator)
+        self.learned_switch = ctk.CTkSwitch(header_row, text="Learned durations")
+        self.learned_switch.pack(side="left", padx=(6, 0))
+
+        self.busy_btn = ctk.CTkButton(
+            header_row,
+            text="📅 Import .ics",
+            width=110,
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+            command=self.import_calendar,
+        )
+        self.busy_btn.pack(side="left", padx=(6, 0))
+
+        # Routines like lunch, added to the same busy calendar
+        self.routine_btn = ctk.CTkButton(
+            header_row,
+            text="⏰ Routine",
+            width=90,
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+            command=self.add_routine,
+        )
+        self.routine_btn.pack(side="left", padx=(6, 0))
+
         # Tab view
-        tabs = ctk.CTkTabview(parent)
-        tabs.pack(fill="both", expand=True, padx=12, pady=(4, 12))
+        self.tabs = ctk.CTkTabview(parent)
+        self.tabs.pack(fill="both", expand=True, padx=12, pady=(4, 12))
 
-        self.today_tab = tabs.add("Today")
-        self.focus_tab = tabs.add("Focus Mode")
+        self.today_tab = self.tabs.add("Today")
+        self.focus_tab = self.tabs.add("Focus Mode")
+        self.analytics_tab = self.tabs.add("Analytics")
 
         # Today tab content
         self.today_frame = ctk.CTkScrollableFrame(self.today_tab)
         self.today_frame.pack(fill="both", expand=True, padx=6, pady=6)
+        # Row widgets are pooled and reused; see dailyflow.todayview
+        self.today_view = TodayPlanView(self.today_frame, self.focus_task_id)
 
         # Focus mode
         self.focus_label = ctk.CTkLabel(
@@ -340,37 +496,176 @@ class DailyFlowApp(ctk.CTk):
         )
         self.focus_label.pack(expand=True)
 
+        # Analytics: read from the completion rollups (dailyflow.history)
+        self.analytics_text = ctk.CTkTextbox(
+            self.analytics_tab,
+            font=ctk.CTkFont(family="Courier", size=12),
+            wrap="none",
+        )
+        self.analytics_text.pack(fill="both", expand=True, padx=6, pady=6)
+        self.analytics_text.configure(state="disabled")
+
+        if profiling.active() is not None:
+            self.toggle_performance_tab()
+
+    # ---------------- PERFORMANCE OVERLAY ----------------
+
+    def toggle_performance_tab(self, _event=None):
+        """Show p50/p99 per operation; profiling runs only while it is shown."""
+        if self.perf_tab is not None:
+            self.tabs.delete("Performance")
+            self.perf_tab = None
+            profiling.disable()
+            return
+        profiling.enable()
+        self.perf_tab = self.tabs.add("Performance")
+        self.perf_text = ctk.CTkTextbox(
+            self.perf_tab,
+            font=ctk.CTkFont(family="Courier", size=12),
+            wrap="none",
+        )
+        self.perf_text.pack(fill="both", expand=True, padx=6, pady=(6, 4))
+        self.perf_text.configure(state="disabled")
+        row = ctk.CTkFrame(self.perf_tab, fg_color="transparent")
+        row.pack(fill="x", padx=6, pady=(0, 6))
+        ctk.CTkButton(
+            row,
+            text="Export trace…",
+            width=120,
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+            command=self.export_trace,
+        ).pack(side="left")
+        self.perf_status = ctk.CTkLabel(row, text="", font=ctk.CTkFont(size=11), text_color="#6b7280")
+        self.perf_status.pack(side="left", padx=8)
+        self.tabs.set("Performance")
+        self.refresh_performance()
+
+    def refresh_performance(self):
+        if self.perf_tab is None:
+            return
+        profiler = profiling.active()
+        if profiler is not None and self.tabs.get() == "Performance":
+            text = profiler.report()
+            if text != self.perf_text.get("1.0", "end-1c"):
+                self.perf_text.configure(state="normal")
+                self.perf_text.delete("1.0", "end")
+                self.perf_text.insert("1.0", text)
+                self.perf_text.configure(state="disabled")
+        self.after(PERF_POLL_MS, self.refresh_performance)
+
+    def export_trace(self):
+        profiler = profiling.active()
+        if profiler is None:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export trace",
+            defaultextension=".json",
+            initialfile="dailyflow-trace.json",
+            filetypes=[("Chrome trace", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            n = profiler.export_chrome_trace(path)
+        except OSError as e:
+            self.perf_status.configure(text=f"Export failed: {e}", text_color="#dc2626")
+            return
+        self.perf_status.configure(
+            text=f"{n} spans → {os.path.basename(path)} (open in chrome://tracing)",
+            text_color="#6b7280",
+        )
+
     # ---------------- DATA PERSISTENCE ----------------
 
+    # Every mutation is recorded in the storage backend as it happens (see
+    # dailyflow.storage) and written to disk by the autosave thread;
+    # "Save Now" writes immediately and compacts the backing files.
+
+    @profiling.profiled("load_data")
     def load_data(self):
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-                tasks_raw = raw.get("tasks", [])
-                self.tasks = [Task.from_dict(d) for d in tasks_raw]
-                if self.tasks:
-                    self.next_task_id = max(t.id for t in self.tasks) + 1
-            except Exception as e:
-                print("Failed to load data:", e)
-                self.tasks = []
+        try:
+            self.tasks = self.storage.load()
+        except Exception as e:
+            print("Failed to load data:", e)
+            self.tasks = self.storage.tasks = TaskStore()
+        self.search_index = TaskIndex(self.tasks)
+
+    def poll_load(self):
+        """Move batches from the loader thread into the views."""
+        batches, done, error = self.loader.poll()
+        for batch in batches:
+            for t in batch:
+                self.tasks.add(t)
+                self.search_index.add(t)
+        if done:
+            self.loader = None
+            if error is not None:
+                print("Failed to load data:", error)
+                self.storage.tasks = TaskStore()
+            # The storage's store is authoritative (journal replayed).
+            self.tasks = self.storage.tasks
+            self.search_index.sync(self.tasks)
+            self.tasks_header.configure(text="All Tasks")
+            self.startup.mark("data loaded")
+            self.report_startup()
+            self.refresh_analytics()
         else:
-            self.tasks = []
-
+            self.tasks_header.configure(text=f"All Tasks · loading {len(self.tasks):,}…")
+            self.after(LOAD_POLL_MS, self.poll_load)
+        if batches or done:
+            self.refresh_all_views()
+
+    def still_loading(self):
+        if self.loader is None:
+            return False
+        messagebox.showinfo("Loading", "Tasks are still loading, please try again in a moment.")
+        return True
+
+    def on_first_paint(self):
+        self.update_idletasks()
+        self.startup.mark("first paint")
+        self.report_startup()
+
+    def report_startup(self):
+        if self.startup.has("first paint", "data loaded"):
+            self.startup.print_report()
+
+    def persist(self):
+        self.autosave.touch()
+        self.poll_autosave(reschedule=False)
+
+    @profiling.profiled("save_data")
     def save_data(self):
-        data = {
-            "tasks": [t.to_dict() for t in self.tasks],
-        }
+        if self.still_loading():
+            return
+        self.autosave.save_now(compact=True)
+
+    def poll_autosave(self, reschedule=True):
+        text = self.autosave.status
+        if text != self.save_status.cget("text"):
+            color = "#dc2626" if self.autosave.state == FAILED else "#6b7280"
+            self.save_status.configure(text=text, text_color=color)
+        if reschedule:
+            self.after(SAVE_STATUS_POLL_MS, self.poll_autosave)
+
+    def on_close(self):
+        if self.loader is not None:
+            # Nothing can have changed yet; don't close files the loader uses.
+            self.destroy()
+            return
+        self.autosave.close()
         try:
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            messagebox.showinfo("Saved", "Tasks and plan saved to dailyflow_data.json")
+            self.storage.close()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to save data:\n{e}")
+            print("Failed to save data:", e)
+        self.destroy()
 
     # ---------------- TASK CRUD ----------------
 
     def add_task_from_form(self):
+        if self.still_loading():
+            return
         title = self.title_entry.get().strip()
         if not title:
             messagebox.showwarning("Missing", "Please enter a title.")
@@ -381,10 +676,8 @@ class DailyFlowApp(ctk.CTk):
         if due_str == "":
             due_str = None
         else:
-            # validate format
-            try:
-                datetime.strptime(due_str, "%Y-%m-%d")
-            except ValueError:
+            # validate format (cached: users repeat the same few dates)
+            if parse_due_ordinal(due_str) is None:
                 messagebox.showerror("Invalid date", "Due date must be YYYY-MM-DD or left blank.")
                 return
 
@@ -399,16 +692,34 @@ class DailyFlowApp(ctk.CTk):
 
         priority = self.priority_option.get()
 
-        task = Task(
-            self.next_task_id,
+        rule = REPEAT_OPTIONS[self.repeat_option.get()]
+        if rule is not None:
+            interval = 1
+            if rule == "every":
+                try:
+                    interval = int(self.repeat_every_entry.get().strip() or "2")
+                    if interval <= 0:
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror("Invalid interval", "N must be a positive number of days.")
+                    return
+            start = date.fromisoformat(due_str) if due_str else date.today()
+            self.add_recurring(title, rule, start, category, duration, priority, interval)
+            self.title_entry.delete(0, "end")
+            self.duration_entry.delete(0, "end")
+            return
+
+        task = self.tasks.create(
             title,
             category,
             due_str,
             duration,
             priority,
         )
-        self.tasks.append(task)
-        self.next_task_id += 1
+        self.storage.add(task)
+        self.search_index.add(task)
+        self.update_plan(lambda p: p.add(task))
+        self.persist()
 
         # Clear fields
         self.title_entry.delete(0, "end")
@@ -417,240 +728,429 @@ class DailyFlowApp(ctk.CTk):
 
         self.refresh_all_views()
 
-    def get_selected_task(self):
-        sel = self.tasks_tree.selection()
-        if not sel:
+    def add_recurring(self, title, rule, start, category, duration, priority, interval):
+        template = new_template(
+            self.storage.templates,
+            title,
+            rule,
+            start,
+            category=category,
+            duration_minutes=duration,
+            priority=priority,
+            interval=interval,
+        )
+        self.storage.put_template(template)  # also adds it to storage.templates
+        self.refresh_occurrences(force=True)
+        for occurrence in self.occurrences:
+            if occurrence.template_id == template.id:
+                self.update_plan(lambda p: p.add(occurrence))
+        self.persist()
+        self.refresh_all_views()
+
+    def refresh_occurrences(self, force=False):
+        """Expand today's occurrences (on a new day, or after a template changed)."""
+        if self.loader is not None:
+            return  # templates arrive with the last batch
+        today = date.today()
+        if today != self.occurrence_day:
+            # Past days are never expanded again, so their state can go.
+            pruned = False
+            for template in self.storage.templates.values():
+                if template.prune(today.toordinal()):
+                    self.storage.put_template(template)
+                    pruned = True
+            if pruned:
+                self.persist()
+        elif not force:
+            return
+        for t in self.occurrences:
+            self.search_index.remove(t.id)
+        self.occurrences = TaskStore(
+            expand(self.storage.templates.values(), today, include_done=True)
+        )
+        for t in self.occurrences:
+            self.search_index.add(t)
+        self.occurrence_day = today
+
+    @property
+    def plannable(self):
+        """Stored tasks plus today's occurrences, for planning and the views."""
+        return PlanningView(self.tasks, self.occurrences)
+
+    def templates_of(self, occurrences):
+        templates = self.storage.templates
+        return {o.template_id: templates[o.template_id] for o in occurrences}
+
+    # Every selected task is changed as one batch: one storage record, one
+    # plan update, one save and one refresh, however many are selected.
+
+    def get_selected_tasks(self):
+        # Tree item ids are task ids; the selection survives scrolling.
+        view = self.plannable
+        tasks = [view.get(i) for i in self.task_list.selected_ids()]
+        return [t for t in tasks if t is not None]
+
+    def selected_for_edit(self):
+        """The selected tasks, or None (after telling the user) if there are none."""
+        if self.still_loading():
             return None
-        item_id = sel[0]
-        try:
-            task_id = int(self.tasks_tree.item(item_id, "values")[0].split(":", 1)[0])
-        except Exception:
-            # fallback: store real id via tags or separate mapping in future
-            # For now, we set first column as "id: title"
-            val = self.tasks_tree.item(item_id, "values")[0]
-            if ":" in val:
-                task_id = int(val.split(":", 1)[0])
-            else:
-                return None
-        for t in self.tasks:
-            if t.id == task_id:
-                return t
-        return None
+        tasks = self.get_selected_tasks()
+        if not tasks:
+            messagebox.showinfo("No selection", "Please select a task first.")
+            return None
+        return tasks
+
+    def select_all_tasks(self, _event=None):
+        self.task_list.select_all()
+        return "break"
 
     def mark_selected_completed(self):
-        task = self.get_selected_task()
-        if not task:
-            messagebox.showinfo("No selection", "Please select a task first.")
+        tasks = self.selected_for_edit()
+        if tasks is None:
             return
-        task.completed = True
-        # Remove schedule info
-        task.start_time = None
-        task.end_time = None
+        tasks = [t for t in tasks if not t.completed]
+        if not tasks:
+            return
+        now = now_minutes()
+        self.storage.history.record(
+            [completion(t, now, self.focus_started.pop(t.id, None)) for t in tasks]
+        )
+        for task in tasks:
+            task.completed = True
+            # Remove schedule info
+            task.start_min = None
+            task.end_min = None
+            self.search_index.update(task)
+        stored = [t for t in tasks if not is_occurrence(t.id)]
+        if stored:
+            self.storage.complete_many(stored)
+        occurrences = [t for t in tasks if is_occurrence(t.id)]
+        for occurrence in occurrences:
+            self.storage.templates[occurrence.template_id].complete(occurrence.ordinal)
+        for template in self.templates_of(occurrences).values():
+            self.storage.put_template(template)
+        self.update_plan(lambda p: p.remove_many([t.id for t in tasks]))
+        self.persist()
         self.refresh_all_views()
+        self.refresh_analytics()
 
-    def delete_selected_task(self):
-        task = self.get_selected_task()
-        if not task:
-            messagebox.showinfo("No selection", "Please select a task first.")
+    def delete_selected_tasks(self):
+        tasks = self.selected_for_edit()
+        if tasks is None:
             return
-        if not messagebox.askyesno("Delete", f"Delete task:\n\n{task.title}?"):
+        if len(tasks) == 1:
+            question = f"Delete task:\n\n{tasks[0].title}?"
+        else:
+            question = f"Delete {len(tasks):,} selected tasks?"
+        occurrences = [t for t in tasks if is_occurrence(t.id)]
+        if occurrences:
+            series = messagebox.askyesnocancel(
+                "Delete",
+                question + "\n\nRepeating tasks: Yes stops them repeating, "
+                "No skips just today's occurrence.",
+            )
+            if series is None:
+                return
+        elif not messagebox.askyesno("Delete", question):
             return
-        self.tasks = [t for t in self.tasks if t.id != task.id]
+        ids = [t.id for t in tasks]
+        stored = [i for i in ids if not is_occurrence(i)]
+        for task_id in stored:
+            self.tasks.remove(task_id)
+            self.score_cache.discard(task_id)
+            self.search_index.remove(task_id)
+            self.storage.dependencies.pop(task_id, None)
+        if stored:
+            self.storage.delete_many(stored)
+        if occurrences:
+            templates = self.templates_of(occurrences)
+            if series:
+                for template_id in templates:
+                    self.storage.delete_template(template_id)
+            else:
+                for occurrence in occurrences:
+                    templates[occurrence.template_id].skip(occurrence.ordinal)
+                for template in templates.values():
+                    self.storage.put_template(template)
+            self.refresh_occurrences(force=True)
+        self.update_plan(lambda p: p.remove_many(ids))
+        self.persist()
         self.refresh_all_views()
 
-    # ---------------- PLANNING ----------------
+    def set_selected_priority(self, priority):
+        self.bulk_priority.set("Set priority…")
+        tasks = self.selected_for_edit()
+        if tasks is None:
+            return
+        self.edit_tasks([t for t in tasks if t.priority != priority], priority=priority)
 
-    def parse_time(self, s: str):
+    def set_selected_category(self):
+        tasks = self.selected_for_edit()
+        if tasks is None:
+            return
+        dialog = ctk.CTkInputDialog(
+            title="Set category",
+            text=f"New category for {len(tasks):,} task(s):",
+        )
+        category = (dialog.get_input() or "").strip()
+        if not category:
+            return
+        self.edit_tasks([t for t in tasks if t.category != category], category=category)
+
+    def set_selected_prerequisites(self):
+        tasks = self.selected_for_edit()
+        if tasks is None:
+            return
+        if any(is_occurrence(t.id) for t in tasks):
+            messagebox.showerror("Depends on", "Repeating tasks cannot have prerequisites.")
+            return
+        links = self.storage.dependencies
+        current = sorted({p for t in tasks for p in links.get(t.id, ())})
+        dialog = ctk.CTkInputDialog(
+            title="Depends on",
+            text=(
+                f"Numbers of the tasks the {len(tasks):,} selected task(s) must wait for, "
+                "comma-separated (blank for none).\n"
+                f"Now: {', '.join(map(str, current)) or 'none'}"
+            ),
+        )
+        text = dialog.get_input()
+        if text is None:
+            return
         try:
-            t = datetime.strptime(s, "%H:%M").time()
-            return t
+            ids = [int(part) for part in text.replace(",", " ").split()]
         except ValueError:
-            return None
+            messagebox.showerror("Depends on", "Enter task numbers, e.g. 12, 40.")
+            return
+        missing = [i for i in ids if i not in self.tasks]
+        if missing:
+            messagebox.showerror("Depends on", f"No task {', '.join(map(str, missing))}.")
+            return
+        try:
+            changed = set_prerequisites_many(links, [t.id for t in tasks], ids)
+        except CycleError as e:
+            self.show_cycle(e)
+            return
+        for task_id, new in changed.items():
+            self.storage.set_prerequisites(task_id, new)
+        # The live planner does not know about links; re-plan to use them.
+        self.planner = None
+        self.persist()
+
+    def show_cycle(self, error):
+        titles = []
+        for task_id in error.chain:
+            task = self.tasks.get(task_id)
+            titles.append(task.title if task is not None else f"#{task_id}")
+        messagebox.showerror(
+            "Dependency cycle",
+            "These tasks would wait for each other:\n\n" + "\n→ ".join(titles),
+        )
+
+    def edit_tasks(self, tasks, **fields):
+        """Set ``fields`` on ``tasks`` and record the change as one batch."""
+        if not tasks:
+            return
+        for task in tasks:
+            for name, value in fields.items():
+                setattr(task, name, value)
+            self.search_index.update(task)
+        stored = [t for t in tasks if not is_occurrence(t.id)]
+        if stored:
+            self.storage.put_many(stored)
+        occurrences = [t for t in tasks if is_occurrence(t.id)]
+        if occurrences:
+            # Editing an occurrence edits its series.
+            for template in self.templates_of(occurrences).values():
+                for name, value in fields.items():
+                    setattr(template, name, value)
+                self.storage.put_template(template)
+            self.refresh_occurrences(force=True)
+            tasks = [self.plannable.get(t.id) for t in tasks]
+        if "priority" in fields:
+            # The score changed (the cache notices via Task.version).
+            self.update_plan(lambda p: p.update_many(tasks))
+        self.persist()
+        self.refresh_all_views()
 
+    # ---------------- PLANNING ----------------
+
+    @profiling.profiled("plan_today")
     def plan_today(self):
-        if not self.tasks:
+        if self.still_loading():
+            return
+        tasks = self.plannable
+        if not len(tasks):
             messagebox.showinfo("No tasks", "You have no tasks to plan yet.")
             return
 
         start_str = self.start_time_entry.get().strip() or "08:00"
         end_str = self.end_time_entry.get().strip() or "22:00"
-        start_t = self.parse_time(start_str)
-        end_t = self.parse_time(end_str)
+        start_t = parse_time(start_str)
+        end_t = parse_time(end_str)
         if not start_t or not end_t:
             messagebox.showerror("Invalid time", "Start/End time must be in HH:MM format.")
             return
 
-        today = date.today()
-        start_dt = datetime.combine(today, start_t)
-        end_dt = datetime.combine(today, end_t)
-        if start_dt >= end_dt:
-            messagebox.showerror("Invalid range", "Start time must be before end time.")
-            return
-
-        # Filter tasks to schedule: incomplete
-        to_schedule = [t for t in self.tasks if not t.completed]
-
-        if not to_schedule:
+        if all(t.completed for t in tasks):
             messagebox.showinfo("Nothing to plan", "All tasks are completed!")
             return
 
-        # Sort by importance (score desc)
-        to_schedule.sort(key=lambda t: t.score_for_today(today), reverse=True)
-
-        current = start_dt
-        for t in to_schedule:
-            if current >= end_dt:
-                # no more time
-                t.start_time = None
-                t.end_time = None
-                continue
-            duration = timedelta(minutes=t.duration_minutes)
-            slot_end = current + duration
-            if slot_end > end_dt:
-                # not enough space; leave unscheduled
-                t.start_time = None
-                t.end_time = None
+        links = self.storage.dependencies
+        estimator = self.storage.history.estimator if self.learned_switch.get() else None
+        try:
+            strategy = PLAN_STRATEGIES[self.strategy_option.get()]
+            if strategy == "greedy" and self.busy is None and not links:
+                self.planner = IncrementalPlanner(
+                    tasks, start_t, end_t, cache=self.score_cache, estimator=estimator
+                )
+                plan = self.planner.plan()
             else:
-                t.start_time = current.isoformat()
-                t.end_time = slot_end.isoformat()
-                current = slot_end + timedelta(minutes=5)  # small break
+                self.planner = None
+                plan = plan_day(
+                    tasks,
+                    start_t,
+                    end_t,
+                    strategy=strategy,
+                    busy=self.busy,
+                    cache=self.score_cache,
+                    dependencies=links,
+                    estimator=estimator,
+                )
+        except CycleError as e:
+            self.show_cycle(e)
+            return
+        except ValueError as e:
+            messagebox.showerror("Invalid range", str(e))
+            return
+        apply_plan(tasks, plan)
+        record_schedule(self.storage, [t for t in tasks if not t.completed])
+        self.persist()
 
         self.refresh_all_views()
 
+    def import_calendar(self):
+        path = filedialog.askopenfilename(
+            title="Import busy time",
+            filetypes=[("iCalendar", "*.ics"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            blocks = load_ics(path, date.today(), 28)
+        except Exception as e:
+            messagebox.showerror("Import failed", f"Could not read calendar:\n{e}")
+            return
+        self.busy = BusyCalendar(blocks)
+        self.busy_btn.configure(text=f"📅 {len(self.busy)} busy")
+
+    def add_routine(self):
+        dialog = ctk.CTkInputDialog(
+            title="Routine busy time",
+            text="Time and days to keep free of tasks, e.g.\n12:00-13:00 mon-fri",
+        )
+        text = dialog.get_input()
+        if not text:
+            return
+        try:
+            start, end, weekdays = parse_weekly(text)
+        except ValueError as e:
+            messagebox.showerror("Routine busy time", str(e))
+            return
+        if self.busy is None:
+            self.busy = BusyCalendar()
+        for block in weekly_blocks(date.today(), 28, start, end, weekdays):
+            self.busy.add(*block)
+        self.busy_btn.configure(text=f"📅 {len(self.busy)} busy")
+
+    def update_plan(self, change):
+        """Apply one task change to the live plan and journal moved slots."""
+        if self.planner is None:
+            return
+        if self.planner.day != date.today():
+            self.planner = None  # yesterday's plan; wait for a re-plan
+            return
+        moved = apply_diff(self.plannable, change(self.planner))
+        if moved:
+            record_schedule(self.storage, moved)
+
     # ---------------- VIEW REFRESH ----------------
 
     def refresh_all_views(self):
+        self.refresh_occurrences()
         self.refresh_task_list()
         self.refresh_today_plan()
 
+    @profiling.profiled("refresh_task_list")
     def refresh_task_list(self):
-        for row in self.tasks_tree.get_children():
-            self.tasks_tree.delete(row)
-
-        for t in self.tasks:
-            status = "Done" if t.completed else "Pending"
-            due = t.due_date or "-"
-            row_title = f"{t.id}: {t.title}"
-            self.tasks_tree.insert(
-                "",
-                "end",
-                values=(
-                    row_title,
-                    t.category,
-                    t.priority,
-                    due,
-                    f"{t.duration_minutes}m",
-                    status,
-                ),
-            )
+        tasks = self.plannable
+        ids = self.search_index.search(**self.search_filters())
+        self.task_list.refresh(tasks, ids)
+        if ids is None:
+            self.search_count.configure(text="")
+        else:
+            self.search_count.configure(text=f"{len(ids):,} of {len(tasks):,} tasks match")
+        categories = self.search_index.categories()
+        if categories != self.filter_categories:
+            self.filter_categories = categories
+            self.category_filter.configure(values=[ANY_CATEGORY] + categories)
+
+    def search_filters(self):
+        """TaskIndex.search arguments from the search box and filters."""
+        category = self.category_filter.get()
+        priority = self.priority_filter.get()
+        return {
+            "text": self.search_entry.get(),
+            "category": None if category == ANY_CATEGORY else category,
+            "priority": None if priority == ANY_PRIORITY else priority,
+            "completed": STATUS_FILTERS[self.status_filter.get()],
+            # Half-typed or invalid dates just don't filter yet.
+            "due_from": parse_due_ordinal(self.due_from_entry.get().strip()),
+            "due_to": parse_due_ordinal(self.due_to_entry.get().strip()),
+        }
+
+    def on_search_changed(self, _event=None):
+        # Only the list depends on the search; the Today view is unaffected.
+        self.refresh_task_list()
 
+    @profiling.profiled("refresh_today_plan")
     def refresh_today_plan(self):
-        # Clear frame
-        for widget in self.today_frame.winfo_children():
-            widget.destroy()
+        # Pending tasks slotted today (by start time), and the rest
+        active, unscheduled = scheduled_today(self.plannable)
+        self.today_view.render(active, unscheduled)
 
-        today = date.today()
-        # Only tasks with schedule and not completed
-        active = []
-        unscheduled = []
-        for t in self.tasks:
-            if t.completed:
-                continue
-            if t.start_time and t.end_time:
-                try:
-                    st = datetime.fromisoformat(t.start_time)
-                    if st.date() == today:
-                        active.append(t)
-                    else:
-                        unscheduled.append(t)
-                except Exception:
-                    unscheduled.append(t)
-            else:
-                unscheduled.append(t)
-
-        # Sort by start time
-        active.sort(key=lambda x: x.start_time or "")
-
-        if not active and not unscheduled:
-            ctk.CTkLabel(
-                self.today_frame,
-                text="No tasks for today.\nAdd tasks on the left and click 'Auto Plan Day'.",
-                font=ctk.CTkFont(size=14),
-            ).pack(pady=40)
-            return
-
-        # Active schedule
-        if active:
-            ctk.CTkLabel(
-                self.today_frame,
-                text="Planned Slots",
-                font=ctk.CTkFont(size=14, weight="bold"),
-            ).pack(anchor="w", padx=6, pady=(4, 2))
-
-            for t in active:
-                st = datetime.fromisoformat(t.start_time)
-                et = datetime.fromisoformat(t.end_time)
-                time_str = f"{st.strftime('%H:%M')}–{et.strftime('%H:%M')}"
-                row = ctk.CTkFrame(self.today_frame)
-                row.pack(fill="x", padx=6, pady=3)
-
-                time_lbl = ctk.CTkLabel(
-                    row,
-                    text=time_str,
-                    width=90,
-                    font=ctk.CTkFont(size=12, weight="bold"),
-                )
-                time_lbl.pack(side="left", padx=(4, 8))
-
-                txt = f"{t.title}  [{t.category}]  ({t.priority})"
-                task_btn = ctk.CTkButton(
-                    row,
-                    text=txt,
-                    anchor="w",
-                    fg_color="#e5e7eb",
-                    hover_color="#d1d5db",
-                    text_color="#111827",
-                    command=lambda task=t: self.set_focus_task(task),
-                )
-                task_btn.pack(side="left", fill="x", expand=True, padx=(0, 4))
-
-        # Unscheduled
-        if unscheduled:
-            ctk.CTkLabel(
-                self.today_frame,
-                text="Unscheduled Tasks",
-                font=ctk.CTkFont(size=14, weight="bold"),
-            ).pack(anchor="w", padx=6, pady=(10, 2))
-
-            for t in unscheduled:
-                row = ctk.CTkFrame(self.today_frame, fg_color="#f5f5f5")
-                row.pack(fill="x", padx=6, pady=3)
-
-                txt = f"{t.title}  [{t.category}]  ({t.priority})"
-                if t.due_date:
-                    txt += f"  • Due: {t.due_date}"
-                ctk.CTkLabel(
-                    row,
-                    text=txt,
-                    anchor="w",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#111827",
-                ).pack(side="left", padx=6, pady=4)
+    def refresh_analytics(self):
+        if self.loader is not None:
+            return
+        text = "\n".join(report(self.storage.history.rollups))
+        self.analytics_text.configure(state="normal")
+        self.analytics_text.delete("1.0", "end")
+        self.analytics_text.insert("1.0", text)
+        self.analytics_text.configure(state="disabled")
+
+    def focus_task_id(self, task_id):
+        task = self.plannable.get(task_id)
+        if task is not None:
+            self.set_focus_task(task)
 
     def set_focus_task(self, task: Task):
         """Update focus mode tab with the selected task."""
+        # Focusing on a task is taken as starting it (see dailyflow.history).
+        started = self.focus_started.setdefault(task.id, now_minutes())
         lines = []
         lines.append("FOCUS MODE")
         lines.append("")
         lines.append(f"Task: {task.title}")
         lines.append(f"Category: {task.category}")
         lines.append(f"Priority: {task.priority}")
+        expected = self.storage.history.estimator.minutes(task)
+        if expected != task.duration_minutes:
+            lines.append(f"Estimate: {task.duration_minutes} min (usually takes ~{expected})")
         if task.due_date:
             lines.append(f"Due date: {task.due_date}")
-        if task.start_time and task.end_time:
-            st = datetime.fromisoformat(task.start_time)
-            et = datetime.fromisoformat(task.end_time)
-            lines.append(f"Slot: {st.strftime('%H:%M')}–{et.strftime('%H:%M')}")
+        if task.start_min is not None and task.end_min is not None:
+            lines.append(f"Slot: {hhmm(task.start_min)}–{hhmm(task.end_min)}")
+        lines.append(f"Started: {hhmm(started)}")
         lines.append("")
         lines.append("Tip: Close other apps and focus only on this task.")
         self.focus_label.configure(text="\n".join(lines))
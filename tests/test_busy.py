@@ -0,0 +1,87 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from dailyflow.busy import BusyCalendar, free_windows, load_ics, parse_weekly, weekly_blocks
+from dailyflow.models import from_minutes, to_minutes
+
+MONDAY = date(2025, 3, 10)
+
+
+def write_ics(tmp_path, *events):
+    lines = ["BEGIN:VCALENDAR"]
+    for event in events:
+        lines += ["BEGIN:VEVENT", *event, "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    path = tmp_path / "cal.ics"
+    path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8")
+    return str(path)
+
+
+def starts(blocks):
+    return [from_minutes(s) for s, _ in blocks]
+
+
+def test_date_only_until_includes_its_day(tmp_path):
+    path = write_ics(
+        tmp_path,
+        [
+            "DTSTART:20250310T090000",
+            "DTEND:20250310T093000",
+            "RRULE:FREQ=DAILY;UNTIL=20250312",
+        ],
+    )
+    assert [d.day for d in starts(load_ics(path, MONDAY, 7))] == [10, 11, 12]
+
+
+def test_weekly_rule_with_interval_count_and_exdate(tmp_path):
+    path = write_ics(
+        tmp_path,
+        [
+            "DTSTART:20250310T100000",
+            "DURATION:PT1H",
+            "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=5",
+            "EXDATE:20250312T100000",
+        ],
+        ["DTSTART:20250311T140000", "DTEND:20250311T150000", "STATUS:CANCELLED"],
+        ["DTSTART;VALUE=DATE:20250311", "DTEND;VALUE=DATE:20250312"],
+    )
+    days = [d.date() for d in starts(load_ics(path, MONDAY, 60))]
+    # Mon/Wed every other week, five occurrences, the first Wednesday excluded.
+    assert days == [date(2025, 3, 10), date(2025, 3, 24), date(2025, 3, 26), date(2025, 4, 7)]
+
+
+def test_weekly_rule_until_with_time(tmp_path):
+    path = write_ics(
+        tmp_path,
+        [
+            "DTSTART:20250310T100000",
+            "DTEND:20250310T110000",
+            "RRULE:FREQ=WEEKLY;UNTIL=20250324T095959",
+        ],
+    )
+    assert [d.date() for d in starts(load_ics(path, MONDAY, 30))] == [
+        date(2025, 3, 10),
+        date(2025, 3, 17),
+    ]
+
+
+def test_calendar_merges_and_splits_windows():
+    def m(hour, minute=0):
+        return to_minutes(datetime.combine(MONDAY, time(hour, minute)))
+
+    busy = BusyCalendar([(m(12), m(13)), (m(12, 30), m(14)), (m(16), m(17))])
+    assert list(busy) == [(m(12), m(14)), (m(16), m(17))]
+    assert busy.overlaps(m(13, 30), m(15)) and not busy.overlaps(m(14), m(16))
+    assert free_windows(busy, [(m(9), m(18))]) == [(m(9), m(12)), (m(14), m(16)), (m(17), m(18))]
+
+
+def test_parse_weekly_routines():
+    start, end, weekdays = parse_weekly("12:00-13:00 mon-fri")
+    assert (start, end, weekdays) == (time(12), time(13), [0, 1, 2, 3, 4])
+    assert parse_weekly("07:30-08:00")[2] == list(range(7))
+    assert parse_weekly("09:00-10:00 sat-mon,wed")[2] == [0, 2, 5, 6]
+    assert len(weekly_blocks(MONDAY, 14, start, end, weekdays)) == 10
+    for bad in ("12-13", "13:00-12:00", "12:00-13:00 someday"):
+        with pytest.raises(ValueError):
+            parse_weekly(bad)
@@ -0,0 +1,17 @@
+import pytest
+
+from dailyflow.cli import build_parser
+
+
+def test_plan_days_defaults_to_one_and_accepts_positive_values():
+    parser = build_parser()
+    assert parser.parse_args(["plan"]).days == 1
+    assert parser.parse_args(["plan", "--days", "7"]).days == 7
+
+
+@pytest.mark.parametrize("days", ["0", "-3", "two"])
+def test_plan_days_rejects_values_below_one(days, capsys):
+    with pytest.raises(SystemExit) as exc:
+        build_parser().parse_args(["plan", "--days", days])
+    assert exc.value.code == 2
+    assert "--days" in capsys.readouterr().err
@@ -0,0 +1,98 @@
+import random
+from datetime import date, time as clock
+
+import pytest
+
+from dailyflow import plan_day
+from dailyflow.dependencies import (
+    CycleError,
+    find_cycle,
+    order_pending,
+    set_prerequisites,
+    set_prerequisites_many,
+)
+from dailyflow.models import Task, TaskStore
+from dailyflow.planner import rank_pending
+
+DAY = date(2025, 3, 10)
+PRIORITIES = ("Low", "Medium", "High", "Critical")
+
+
+def random_dag(rng, n, links):
+    store = TaskStore()
+    for _ in range(n):
+        store.create("t", "Work", None, rng.choice((15, 30, 60)), rng.choice(PRIORITIES))
+    deps = {}
+    for _ in range(links):
+        a, b = rng.sample(range(1, n + 1), 2)
+        if a > b:
+            a, b = b, a
+        deps[b] = tuple(sorted(set(deps.get(b, ())) | {a}))  # only earlier ids: no cycles
+    return store, deps
+
+
+def test_order_is_topological_and_plain_without_links():
+    rng = random.Random(23)
+    for _ in range(50):
+        store, deps = random_dag(rng, 30, 40)
+        ordered = order_pending(store, DAY, deps)
+        position = {t.id: i for i, t in enumerate(ordered.tasks)}
+        assert sorted(position) == [t.id for t in store]
+        for task_id, prereqs in deps.items():
+            assert all(position[p] < position[task_id] for p in prereqs)
+        assert order_pending(store, DAY, {}).tasks == rank_pending(store, DAY)[0]
+
+
+def test_blockers_of_urgent_tasks_go_first():
+    store = TaskStore(
+        [
+            Task(1, "Low blocker", priority="Low", duration_minutes=30),
+            Task(2, "Medium", priority="Medium", duration_minutes=30),
+            Task(3, "Critical", priority="Critical", duration_minutes=30),
+        ]
+    )
+    ordered = order_pending(store, DAY, {3: (1,)})
+    assert [t.id for t in ordered.tasks] == [1, 3, 2]
+    assert ordered.scores[0] == ordered.scores[1]
+
+
+def test_plans_keep_prerequisites_first():
+    rng = random.Random(5)
+    for strategy in ("greedy", "optimal"):
+        for _ in range(30):
+            store, deps = random_dag(rng, 20, 25)
+            plan = plan_day(store, clock(9), clock(13), DAY, strategy=strategy, dependencies=deps)
+            start = {s.task_id: s.start for s in plan.slots}
+            end = {s.task_id: s.end for s in plan.slots}
+            for task_id, prereqs in deps.items():
+                if task_id in start:
+                    assert all(p in end and end[p] <= start[task_id] for p in prereqs)
+
+
+def test_cycles_are_refused_and_named():
+    deps = {}
+    set_prerequisites(deps, 2, [1])
+    set_prerequisites(deps, 3, [2])
+    assert find_cycle(deps, 1, [3]) == [1, 2, 3, 1]
+    with pytest.raises(CycleError) as e:
+        set_prerequisites(deps, 1, [3])
+    assert e.value.chain == [1, 2, 3, 1]
+    assert deps == {2: (1,), 3: (2,)}
+
+    store = TaskStore([Task(i, str(i)) for i in (1, 2, 3)])
+    with pytest.raises(CycleError) as e:
+        order_pending(store, DAY, {1: (3,), 2: (1,), 3: (2,)})
+    chain = e.value.chain
+    assert chain[0] == chain[-1] and sorted(chain[:-1]) == [1, 2, 3]
+
+
+def test_batch_is_all_or_nothing():
+    deps = {3: (1,)}
+    with pytest.raises(CycleError):
+        # 2 waiting for 3 is fine; 1 waiting for 3 closes a loop.
+        set_prerequisites_many(deps, [2, 1], [3])
+    assert deps == {3: (1,)}
+    assert set_prerequisites_many(deps, [2, 4], [3]) == {2: (3,), 4: (3,)}
+    assert deps == {3: (1,), 2: (3,), 4: (3,)}
+    assert set_prerequisites_many(deps, [2, 4], []) == {2: (), 4: ()}
+    assert deps == {3: (1,)}
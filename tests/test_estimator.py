@@ -0,0 +1,66 @@
+import random
+from datetime import date, time as clock
+
+from dailyflow import plan_day
+from dailyflow.estimator import MAX_RATIO, DurationEstimator, title_prefix
+from dailyflow.history import Completion
+from dailyflow.incremental import IncrementalPlanner
+from dailyflow.models import Task, TaskStore
+
+DAY = date(2025, 3, 10)
+
+
+def finished(title, category, estimated, actual):
+    return Completion(1, title, category, "Medium", None, None, 0, actual, estimated)
+
+
+def test_nothing_learned_changes_nothing():
+    estimator = DurationEstimator()
+    task = Task(1, "Write report", "Work", duration_minutes=45)
+    assert estimator.minutes(task) == 45
+    assert estimator.factor("Work", "Write report") == 1.0
+    # Untimed completions teach nothing.
+    estimator.add(Completion(1, "Write", "Work", "Medium", None, None, None, 100, 30))
+    assert estimator.observations == 0
+
+
+def test_learns_per_prefix_then_category():
+    estimator = DurationEstimator()
+    for _ in range(40):
+        estimator.add(finished("Write chapter", "Work", 60, 120))
+        estimator.add(finished("Call Sam", "Work", 30, 30))
+    assert title_prefix("  Write: intro") == "write"
+    assert 55 <= estimator.minutes(Task(1, "write intro", "Work", duration_minutes=30)) <= 60
+    assert estimator.minutes(Task(2, "Call Ann", "Work", duration_minutes=30)) == 30
+    # An unseen kind of task falls back to its category's average.
+    assert 30 < estimator.minutes(Task(3, "Review", "Work", duration_minutes=30)) < 55
+    assert estimator.minutes(Task(4, "Review", "Home", duration_minutes=30)) == 30
+
+
+def test_outliers_are_clipped_and_state_round_trips():
+    estimator = DurationEstimator()
+    for _ in range(200):
+        estimator.add(finished("Fix bug", "Work", 10, 10_000))
+    assert estimator.factor("Work", "Fix bug") <= MAX_RATIO + 1e-9
+    copy = DurationEstimator.from_dict(estimator.to_dict())
+    task = Task(1, "Fix it", "Work", duration_minutes=20)
+    assert copy.minutes(task) == estimator.minutes(task)
+    assert len(copy) == len(estimator) == 2
+
+
+def test_planners_book_learned_lengths():
+    rng = random.Random(25)
+    estimator = DurationEstimator()
+    for _ in range(30):
+        estimator.add(finished("Write", "Work", 30, rng.randint(50, 70)))
+    store = TaskStore()
+    for i in range(12):
+        store.create(("Write", "Read")[i % 2], "Work", None, 30, rng.choice(("Low", "High")))
+    start, end = clock(9), clock(13)
+    plan = plan_day(store, start, end, DAY, estimator=estimator)
+    for slot in plan.slots:
+        minutes = (slot.end - slot.start).total_seconds() / 60
+        assert minutes == estimator.minutes(store.get(slot.task_id))
+    incremental = IncrementalPlanner(store, start, end, DAY, estimator=estimator)
+    assert incremental.plan() == plan
+    assert plan != plan_day(store, start, end, DAY)
@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import date, datetime
+
+from dailyflow.history import Completion, CompletionLog, Rollups, day_of, report
+from dailyflow.models import to_minutes
+
+MONDAY = date(2025, 3, 10)
+
+
+def at(day, hour, minute=0):
+    return to_minutes(datetime(day.year, day.month, day.day, hour, minute))
+
+
+def done(task_id, day, hour, planned=None, started=None, category="Work"):
+    end = at(day, hour)
+    planned_start = planned_end = None
+    if planned is not None:
+        planned_start, planned_end = at(day, planned), at(day, planned + 1)
+    return Completion(
+        task_id, f"Task {task_id}", category, "Medium", planned_start, planned_end, started, end, 60
+    )
+
+
+def test_rollups_match_the_events():
+    completions = [
+        done(1, MONDAY, 11, planned=9),  # late
+        done(2, MONDAY, 11, planned=11, started=at(MONDAY, 10, 30)),  # on time
+        done(3, date(2025, 3, 12), 9, started=at(date(2025, 3, 12), 8)),  # no slot
+        done(4, date(2025, 3, 17), 9, category="Study"),  # next week
+    ]
+    rollups = Rollups()
+    for c in completions:
+        rollups.add(c)
+    assert rollups.days[day_of(completions[0].actual_end)].count == 2
+    week = rollups.total(MONDAY, date(2025, 3, 16))
+    assert (week.count, week.planned, week.on_time) == (3, 2, 1)
+    # Only tasks with both a slot and a start count towards the ratio.
+    assert (week.timed, week.actual_minutes, week.estimated_minutes) == (1, 30, 60)
+    both = rollups.total(MONDAY, date(2025, 3, 17))
+    assert both.categories == {"Work": 3, "Study": 1}
+    assert Rollups.from_dict(json.loads(json.dumps(rollups.to_dict()))).total(
+        MONDAY, date(2025, 3, 17)
+    ).to_list() == both.to_list()
+    lines = report(rollups, date(2025, 3, 16))
+    assert lines[0] == "This week: 3 done (last week 0)"
+    assert "Focused tasks took 50% of their planned time" in lines
+
+
+def test_snapshot_then_tail_equals_rebuild(tmp_path):
+    path = str(tmp_path / "data.json.history")
+    log = CompletionLog(path)
+    log.load()
+    log.record([done(i, MONDAY, 9 + i % 8, planned=9) for i in range(20)])
+    log.snapshot()
+    log.record([done(i, MONDAY, 10, started=at(MONDAY, 9)) for i in range(20, 30)])
+    log.flush()
+
+    loaded = CompletionLog(path)
+    loaded.load()
+    os.remove(log.rollup_path)
+    rebuilt = CompletionLog(path)
+    rebuilt.load()
+    assert loaded.rollups.to_dict() == rebuilt.rollups.to_dict() == log.rollups.to_dict()
+    assert loaded.estimator.to_dict() == rebuilt.estimator.to_dict()
+    assert len(list(rebuilt)) == 30
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    path = str(tmp_path / "data.json.history")
+    log = CompletionLog(path)
+    log.load()
+    log.record([done(1, MONDAY, 9)])
+    log.flush()
+    with open(path, "ab") as f:
+        f.write(b'{"id":2,"tit')
+    log = CompletionLog(path)
+    log.load()
+    assert [c.task_id for c in log] == [1]
+    log.record([done(3, MONDAY, 10)])
+    log.flush()
+    assert [c.task_id for c in CompletionLog(path)] == [1, 3]
+
+
+def test_writing_before_load_keeps_the_log(tmp_path):
+    path = str(tmp_path / "data.json.history")
+    log = CompletionLog(path)
+    log.load()
+    log.record([done(1, MONDAY, 9), done(2, MONDAY, 10)])
+    log.snapshot()
+    with open(path, "ab") as f:
+        f.write(b'{"id":9')  # torn
+
+    unloaded = CompletionLog(path)  # e.g. the background load failed
+    unloaded.record([done(3, MONDAY, 11)])
+    unloaded.snapshot()
+    assert [c.task_id for c in CompletionLog(path)] == [1, 2, 3]
+
+    fresh = CompletionLog(path)
+    fresh.load()
+    assert fresh.rollups.total(MONDAY, MONDAY).count == 3
@@ -0,0 +1,69 @@
+import random
+from datetime import date, time as clock
+
+from dailyflow import plan_day
+from dailyflow.incremental import IncrementalPlanner
+from dailyflow.models import Task, TaskStore
+
+DAY = date(2025, 3, 10)
+PRIORITIES = ("Low", "Medium", "High", "Critical")
+
+
+def assert_same_plan(planner, store, start, end):
+    expected = plan_day(store, start, end, DAY)
+    actual = planner.plan()
+    assert actual.slots == expected.slots
+    assert actual.unscheduled == expected.unscheduled
+
+
+def test_update_keeps_place_in_a_score_tie():
+    store = TaskStore([Task(1, "A", duration_minutes=120), Task(2, "B", duration_minutes=120)])
+    start, end = clock(8), clock(10, 30)
+    planner = IncrementalPlanner(store, start, end, DAY)
+    store.get(1).title = "A, renamed"
+    diff = planner.update(store.get(1))
+    assert diff == ((), (), ())
+    assert_same_plan(planner, store, start, end)
+    assert planner.plan().slots[0].task_id == 1
+
+
+def test_matches_plan_day_through_random_edits():
+    rng = random.Random(7)
+    start, end = clock(8), clock(14)
+    for _ in range(100):
+        store = TaskStore()
+        for _ in range(rng.randint(1, 12)):
+            store.create("t", "Work", None, rng.choice((30, 60, 90)), rng.choice(PRIORITIES))
+        planner = IncrementalPlanner(store, start, end, DAY)
+        for _ in range(10):
+            ids = [t.id for t in store]
+            op = rng.random()
+            if op < 0.2 or not ids:
+                planner.add(store.create("new", "Work", None, rng.choice((30, 60)), "Medium"))
+            elif op < 0.35:
+                task_id = rng.choice(ids)
+                store.remove(task_id)
+                planner.remove(task_id)
+            elif op < 0.75:
+                t = store.get(rng.choice(ids))
+                if rng.random() < 0.5:
+                    t.title += "!"
+                else:
+                    t.priority = rng.choice(PRIORITIES)
+                planner.update(t)
+            else:
+                tasks = [store.get(i) for i in rng.sample(ids, min(3, len(ids)))]
+                for t in tasks:
+                    t.duration_minutes = rng.choice((30, 60, 90))
+                planner.update_many(tasks)
+            assert_same_plan(planner, store, start, end)
+
+
+def test_completed_update_leaves_the_plan():
+    store = TaskStore([Task(1, "A", duration_minutes=60), Task(2, "B", duration_minutes=60)])
+    planner = IncrementalPlanner(store, clock(8), clock(9), DAY)
+    store.get(1).completed = True
+    diff = planner.update(store.get(1))
+    assert diff.removed == (1,)
+    assert [s.task_id for s in diff.added] == [2]
+    assert 1 not in planner
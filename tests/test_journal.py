@@ -0,0 +1,128 @@
+import os
+from datetime import date
+
+from dailyflow.journal import JournalStorage
+from dailyflow.models import Task
+from dailyflow.recurrence import RecurringTask
+
+
+def state(tasks):
+    return [t.to_dict() for t in tasks]
+
+
+def make(path, **kwargs):
+    storage = JournalStorage(str(path), **kwargs)
+    storage.load()
+    return storage
+
+
+def add(storage, task_id, title):
+    t = storage.tasks.add(Task(task_id, title, duration_minutes=30))
+    storage.add(t)
+    return t
+
+
+def reload(path):
+    # A fresh process: only what reached the disk.
+    return make(path).tasks
+
+
+def test_flushed_records_survive_a_crash(tmp_path):
+    path = tmp_path / "data.json"
+    storage = make(path)
+    for i in range(1, 6):
+        add(storage, i, f"Task {i}")
+    t = storage.tasks.get(2)
+    t.completed = True
+    storage.complete(t)
+    storage.tasks.remove(3)
+    storage.delete(3)
+    t = storage.tasks.get(4)
+    t.start_min, t.end_min = 1000, 1030
+    storage.schedule([t])
+    storage.set_prerequisites(5, [4])
+    storage.flush()
+    expected = state(storage.tasks)
+    # No close(): the process dies here, halfway through another record.
+    with open(storage.journal_path, "ab") as f:
+        f.write(b'{"op":"delete","id":1')
+
+    loaded = make(path)
+    assert state(loaded.tasks) == expected
+    assert loaded.dependencies == {5: (4,)}
+    # New records start on a clean line after the torn one.
+    add(loaded, 6, "After the crash")
+    loaded.close()
+    assert [t.id for t in reload(path)] == [1, 2, 4, 5, 6]
+
+
+def test_unflushed_records_are_lost_but_nothing_else(tmp_path):
+    path = tmp_path / "data.json"
+    storage = make(path, batch_size=1000)
+    add(storage, 1, "Saved")
+    storage.flush()
+    add(storage, 2, "Still buffered")
+    assert [t.id for t in reload(path)] == [1]
+
+
+def test_crash_during_compaction(tmp_path):
+    path = tmp_path / "data.json"
+    storage = make(path)
+    add(storage, 1, "One")
+    add(storage, 2, "Two")
+    storage.flush()
+    storage.compact()
+    assert not os.path.exists(storage.old_journal_path)
+    add(storage, 3, "Three")
+    storage.flush()
+
+    # Rotated, but the new snapshot never landed.
+    with storage.lock:
+        storage._rotate_journal()
+    t = storage.tasks.get(1)
+    t.title = "One, edited"
+    storage.put(t)
+    storage.flush()
+    expected = state(storage.tasks)
+    assert os.path.exists(storage.old_journal_path)
+    assert state(reload(path)) == expected
+
+    # The next compaction folds both journals in.
+    resumed = make(path)
+    resumed.compact()
+    assert not os.path.exists(resumed.old_journal_path)
+    resumed.close()
+    assert state(reload(path)) == expected
+
+
+def test_long_journal_is_compacted_on_flush(tmp_path):
+    path = tmp_path / "data.json"
+    storage = make(path, compact_every=10)
+    for i in range(1, 13):
+        add(storage, i, f"Task {i}")
+    storage.flush()
+    assert os.path.getsize(storage.journal_path) == 0
+    storage.close()
+    assert len(reload(path)) == 12
+
+
+def test_templates_are_kept_by_put_and_delete(tmp_path):
+    path = tmp_path / "data.json"
+    storage = make(path)
+    template = RecurringTask(1, "Stand-up", "daily", date(2025, 3, 10))
+    storage.put_template(template)
+    storage.put_template(RecurringTask(2, "Gym", "weekdays", date(2025, 3, 10)))
+    assert sorted(storage.templates) == [1, 2]
+    storage.delete_template(2)
+    assert list(storage.templates) == [1]
+
+    # An in-place edit not yet recorded is not half-saved by a compaction.
+    template.complete(date(2025, 3, 10).toordinal())
+    storage.compact()
+    assert make(path).templates[1].done == set()
+    storage.put_template(template)
+    storage.compact()
+    storage.close()
+    loaded = make(path)
+    assert list(loaded.templates) == [1]
+    assert loaded.templates[1].done == {date(2025, 3, 10).toordinal()}
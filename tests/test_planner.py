@@ -0,0 +1,63 @@
+import random
+from datetime import date, time as clock
+from itertools import combinations
+
+from dailyflow import plan_day
+from dailyflow.models import Task, TaskStore
+from dailyflow.planner import BREAK_MINUTES
+
+DAY = date(2025, 3, 10)
+PRIORITIES = ("Low", "Medium", "High", "Critical")
+
+
+def total(plan, store):
+    return sum(store.get(s.task_id).score_for_today(DAY) for s in plan.slots)
+
+
+def used(plan, store):
+    return sum(store.get(s.task_id).duration_minutes for s in plan.slots)
+
+
+def random_store(rng, n):
+    store = TaskStore()
+    for _ in range(n):
+        minutes = rng.choice((15, 30, 60, 90, 240, 300))
+        store.create("t", "Work", None, minutes, rng.choice(PRIORITIES))
+    return store
+
+
+def best_subset_score(store, window):
+    tasks = list(store)
+    best = 0.0
+    for k in range(len(tasks) + 1):
+        for subset in combinations(tasks, k):
+            if sum(t.duration_minutes + BREAK_MINUTES for t in subset) <= window + BREAK_MINUTES:
+                best = max(best, sum(t.score_for_today(DAY) for t in subset))
+    return best
+
+
+def test_optimal_is_exact_and_never_worse_than_greedy():
+    rng = random.Random(6)
+    start, end = clock(9), clock(15)
+    for _ in range(60):
+        store = random_store(rng, rng.randint(1, 8))
+        greedy = plan_day(store, start, end, DAY)
+        optimal = plan_day(store, start, end, DAY, strategy="optimal", time_budget=10)
+        assert total(optimal, store) >= total(greedy, store) - 1e-9
+        assert abs(total(optimal, store) - best_subset_score(store, 360)) < 1e-9
+        # Slots stay inside the window, in order, with breaks between them.
+        for a, b in zip(optimal.slots, optimal.slots[1:]):
+            assert (b.start - a.end).total_seconds() >= BREAK_MINUTES * 60
+        assert not optimal.slots or optimal.slots[-1].end.time() <= end
+
+
+def test_optimal_fills_idle_time_with_zero_score_tasks():
+    store = TaskStore([Task(1, "Sort the attic", duration_minutes=300, priority="Low")])
+    assert store.get(1).score_for_today(DAY) == 0
+    optimal = plan_day(store, clock(9), clock(15), DAY, strategy="optimal")
+    assert [s.task_id for s in optimal.slots] == [1]
+
+    store.create("Reply to email", "Work", None, 30, "High")
+    greedy = plan_day(store, clock(9), clock(15), DAY)
+    optimal = plan_day(store, clock(9), clock(15), DAY, strategy="optimal")
+    assert used(optimal, store) == used(greedy, store) == 330
@@ -0,0 +1,151 @@
+import asyncio
+import json
+from datetime import date
+
+from dailyflow.models import Task
+from dailyflow.recurrence import RecurringTask, is_occurrence
+from dailyflow.server import start_server
+from dailyflow.storage import open_storage
+
+
+async def exchange(port, raw):
+    """Send raw request bytes; return (status, payload) of the response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(raw)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await reader.readexactly(length))
+    finally:
+        writer.close()
+
+
+def request(method, path, body=None, length=None):
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    if length is None:
+        length = len(data)
+    head = f"{method} {path} HTTP/1.1\r\nContent-Length: {length}\r\nConnection: close\r\n\r\n"
+    return head.encode("latin-1") + data
+
+
+def run_server(tmp_path, scenario, **kwargs):
+    async def main():
+        server, app = await start_server(str(tmp_path), port=0, flush_interval=0.05, **kwargs)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port, app)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await app.pool.close()
+
+    return asyncio.run(main())
+
+
+def test_bad_requests_get_error_responses(tmp_path):
+    async def scenario(port, app):
+        return [
+            await exchange(port, request("GET", "/users/ann/tasks", length="abc")),
+            await exchange(port, request("GET", "/users/ann/tasks", length="-5")),
+            await exchange(port, request("GET", "/users/ann/tasks", length=str(2 << 20))),
+            await exchange(port, b"NONSENSE\r\n\r\n"),
+            await exchange(port, request("GET", "/nowhere")),
+            await exchange(port, request("PUT", "/users/ann/tasks")),
+            await exchange(port, request("POST", "/users/ann/tasks", body=[1])),
+            await exchange(port, request("POST", "/users/ann/tasks", {"priority": "High"})),
+            await exchange(port, request("GET", "/users/ann/tasks/99")),
+            await exchange(port, request("POST", "/users/ann/plan", {"start": "9am"})),
+        ]
+
+    statuses = [status for status, _ in run_server(tmp_path, scenario)]
+    assert statuses == [400, 400, 413, 400, 404, 405, 400, 400, 404, 400]
+
+
+def test_plan_complete_and_save(tmp_path):
+    async def scenario(port, app):
+        for title, minutes in (("Write", 60), ("Call", 30)):
+            status, _ = await exchange(
+                port,
+                request("POST", "/users/ann/tasks", {"title": title, "duration_minutes": minutes}),
+            )
+            assert status == 201
+        status, plan = await exchange(
+            port, request("POST", "/users/ann/plan", {"start": "09:00", "end": "10:00"})
+        )
+        assert status == 200
+        await exchange(port, request("POST", "/users/ann/tasks/2/complete"))
+        await asyncio.sleep(0.2)  # let the background flusher run
+        return plan
+
+    plan = run_server(tmp_path, scenario)
+    assert [s["task_id"] for s in plan["slots"]] == [2]
+    assert plan["unscheduled"] == [1]
+    storage = open_storage(str(tmp_path / "ann.json"))
+    tasks = storage.load()
+    assert [t.id for t in tasks] == [1, 2]
+    assert tasks.get(2).completed
+    assert [c.task_id for c in storage.history] == [2]
+    storage.close()
+
+
+def test_plan_keeps_prerequisites_and_refuses_cycles(tmp_path):
+    storage = open_storage(str(tmp_path / "ann.json"))
+    storage.load()
+    for task in (
+        Task(1, "Draft", priority="Low", duration_minutes=30),
+        Task(2, "Send", priority="Critical", duration_minutes=30),
+    ):
+        storage.tasks.add(task)
+        storage.add(task)
+    storage.set_prerequisites(2, [1])
+    storage.close()
+    storage = open_storage(str(tmp_path / "bob.json"))
+    storage.load()
+    for task in (Task(1, "A"), Task(2, "B")):
+        storage.tasks.add(task)
+        storage.add(task)
+    storage.set_prerequisites(1, [2])
+    storage.set_prerequisites(2, [1])  # a loop, as a hand-edited file might have
+    storage.close()
+
+    async def scenario(port, app):
+        body = {"start": "09:00", "end": "12:00"}
+        return (
+            await exchange(port, request("POST", "/users/ann/plan", body)),
+            await exchange(port, request("POST", "/users/bob/plan", body)),
+        )
+
+    (status, plan), (cycle_status, error) = run_server(tmp_path, scenario)
+    assert status == 200
+    assert [s["task_id"] for s in plan["slots"]] == [1, 2]
+    assert cycle_status == 400 and "cycle" in error["error"].lower()
+
+
+def test_plan_includes_recurring_tasks(tmp_path):
+    storage = open_storage(str(tmp_path / "ann.json"))
+    storage.load()
+    task = storage.tasks.add(Task(1, "Report", priority="Low", duration_minutes=60))
+    storage.add(task)
+    storage.put_template(RecurringTask(1, "Stand-up", "daily", date.today(), duration_minutes=15))
+    storage.close()
+
+    async def scenario(port, app):
+        body = {"start": "09:00", "end": "12:00", "days": 2}
+        return await exchange(port, request("POST", "/users/ann/plan", body))
+
+    status, plan = run_server(tmp_path, scenario)
+    assert status == 200
+    ids = [s["task_id"] for s in plan["slots"]]
+    assert 1 in ids and sum(map(is_occurrence, ids)) == 2
+    storage = open_storage(str(tmp_path / "ann.json"))
+    storage.load()
+    assert len(storage.templates[1].slots) == 2  # booked slots were saved
+    storage.close()
@@ -0,0 +1,100 @@
+import os
+
+from dailyflow.history import completion
+from dailyflow.journal import JournalStorage
+from dailyflow.models import Task
+from dailyflow.sqlite_store import SqliteStorage, migrate_json
+
+
+def read_all(directory):
+    out = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), "rb") as f:
+            out[name] = f.read()
+    return out
+
+
+def test_migrate_copies_tasks_and_leaves_the_source_alone(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    json_path = str(src / "data.json")
+    source = JournalStorage(json_path, compact_every=3)
+    source.load()
+    for i in range(1, 6):
+        t = Task(i, f"Task {i}", duration_minutes=30)
+        source.tasks.add(t)
+        source.add(t)
+    source.flush()  # past compact_every: folded into the snapshot
+    done = source.tasks.get(2)
+    done.completed = True
+    source.complete(done)
+    source.history.record([completion(done, now=1000, started=970)])
+    source.set_prerequisites(4, [3])
+    source.flush()
+    with open(source.journal_path, "ab") as f:
+        f.write(b'{"op":"delete","id":1')  # torn
+    before = read_all(src)
+
+    db_path = str(tmp_path / "tasks.db")
+    assert migrate_json(json_path, db_path) == 5
+    assert read_all(src) == before
+
+    target = SqliteStorage(db_path)
+    tasks = target.load()
+    assert [t.id for t in tasks] == [1, 2, 3, 4, 5]
+    assert tasks.get(2).completed
+    assert target.dependencies == {4: (3,)}
+    assert [c.task_id for c in target.history] == [2]
+    assert target.history.estimator.observations == 1
+    target.close()
+
+    # A re-run replaces the rows but does not count completions again.
+    assert migrate_json(json_path, db_path) == 5
+    target = SqliteStorage(db_path)
+    target.load()
+    assert [c.task_id for c in target.history] == [2]
+    target.close()
+
+
+class HeldLock:
+    """A lock that counts how deep it is held."""
+
+    def __init__(self):
+        self.depth = 0
+
+    def __enter__(self):
+        self.depth += 1
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+
+
+class LockCheckedConnection:
+    """Fails any statement run while ``lock`` is not held."""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def execute(self, *args):
+        assert self.lock.depth, "statement run without the storage lock"
+        return self.conn.execute(*args)
+
+
+def test_iter_tasks_locks_each_batch_and_releases_between(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "tasks.db"))
+    for i in range(1, 8):
+        storage.add(Task(i, f"Task {i}"))
+    storage.flush()
+    conn = storage.conn
+    storage.lock = HeldLock()
+    storage.conn = LockCheckedConnection(conn, storage.lock)
+
+    seen = []
+    for t in storage.iter_tasks(batch_size=3):
+        seen.append(t.id)
+        assert storage.lock.depth == 0
+        # Other calls share the connection while the iterator is paused.
+        assert storage.get(t.id).title == f"Task {t.id}"
+    assert seen == list(range(1, 8))
+    conn.close()
@@ -0,0 +1,79 @@
+import io
+import json
+
+import pytest
+
+from dailyflow.journal import JournalStorage
+from dailyflow.models import Task
+from dailyflow.transfer import iter_json, read_records, transfer, write_json
+
+
+def make_data_file(path):
+    """A data file whose journal holds changes made after the last compaction."""
+    storage = JournalStorage(str(path))
+    storage.load()
+    for i in (1, 2, 3):
+        storage.tasks.add(Task(i, f"Task {i}", "Work" if i % 2 else "Home"))
+    storage.compact()
+    t = storage.tasks.add(Task(4, "Task 4"))
+    storage.add(t)
+    t = storage.tasks.get(1)
+    t.completed = True
+    storage.complete(t)
+    storage.tasks.remove(2)
+    storage.delete(2)
+    storage.flush()  # no close: the journal is left un-compacted
+    return storage
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export_replays_the_journal(tmp_path):
+    data = tmp_path / "data.json"
+    make_data_file(data)
+    backup = str(tmp_path / "backup.ndjson")
+    assert transfer(str(data), backup) == 3
+    rows = read_ndjson(backup)
+    assert [(d["id"], d["completed"]) for d in rows] == [(1, True), (3, False), (4, False)]
+    assert transfer(str(data), backup, pending=True) == 2
+    assert [d["id"] for d in read_ndjson(backup)] == [3, 4]
+
+
+def test_import_into_a_journaled_file_replaces_its_tasks(tmp_path):
+    data = tmp_path / "data.json"
+    storage = make_data_file(data)
+    storage.set_prerequisites(4, [3])
+    storage.flush()
+    backup = tmp_path / "backup.ndjson"
+    backup.write_text('{"id":3,"title":"Restored"}\n{"id":7,"title":"New"}\n', encoding="utf-8")
+
+    assert transfer(str(backup), str(data)) == 2
+    loaded = JournalStorage(str(data))
+    tasks = loaded.load()
+    assert [(t.id, t.title) for t in tasks] == [(3, "Restored"), (7, "New")]
+    assert loaded.dependencies == {}  # task 4 is gone
+    assert list(read_records(str(data))) == [t.to_dict() for t in tasks]
+
+
+def test_bad_import_leaves_the_journaled_file_alone(tmp_path):
+    data = tmp_path / "data.json"
+    make_data_file(data)
+    before = list(read_records(str(data)))
+    backup = tmp_path / "backup.ndjson"
+    backup.write_text('{"id":9,"title":"ok"}\n{"id":\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        transfer(str(backup), str(data))
+    assert list(read_records(str(data))) == before
+
+
+def test_snapshot_streams_in_small_chunks():
+    f = io.StringIO()
+    rows = [{"id": i, "title": "x" * i} for i in range(1, 50)]
+    write_json(rows, f, {"templates": []})
+    f.seek(0)
+    extra = {}
+    assert list(iter_json(f, chunk_size=7, extra=extra)) == rows
+    assert extra == {"templates": []}